@@ -0,0 +1,77 @@
+"""
+Answer Formatting Helpers
+Parses structured LLM answers into cards and finds legal jargon to explain
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+from .keyword_matcher import KeywordMatcher, BOUNDARY_WORD
+
+# Legal Jargon Glossary (Unique Feature #4 - Jargon Explainer)
+LEGAL_GLOSSARY = {
+    "IPC": "Indian Penal Code - Main criminal code of India",
+    "BNS": "Bharatiya Nyaya Sanhita - New criminal code replacing IPC (2023)",
+    "CrPC": "Code of Criminal Procedure - Procedure for criminal cases",
+    "cognizable": "Offense where police can arrest without warrant",
+    "non-cognizable": "Offense where police need warrant to arrest",
+    "bail": "Release of accused before trial on security/surety",
+    "anticipatory bail": "Bail sought before arrest in anticipation",
+    "FIR": "First Information Report - Initial complaint to police",
+    "bailable": "Offense where bail is a right",
+    "non-bailable": "Offense where bail is at court's discretion",
+    "compoundable": "Offense that can be settled between parties",
+    "cognizance": "Court taking notice of an offense to start proceedings",
+    "magistrate": "Judicial officer with limited jurisdiction",
+    "summons": "Legal order to appear in court",
+    "warrant": "Court order for arrest or search",
+}
+
+
+def parse_answer_cards(answer_text: str) -> List[Dict[str, str]]:
+    """Parse answer into structured cards (SUMMARY, KEY POINTS, LEGAL PROVISION, NEXT STEPS)"""
+    cards = []
+    text = answer_text.strip()
+    # Flexible patterns - match **Section:** or Section: or ## Section
+    patterns = [
+        (r"\*\*SUMMARY:?\*\*\s*(.+?)(?=\*\*[A-Z\s]|\n\*\*|$)", "summary", "📌 Summary"),
+        (r"\*\*KEY POINTS?:?\*\*\s*([\s\S]+?)(?=\*\*[A-Z\s]|\n\*\*[A-Z]|$)", "points", "🔑 Key Points"),
+        (r"\*\*LEGAL PROVISION[S]?:?\*\*\s*([\s\S]+?)(?=\*\*[A-Z\s]|\n\*\*[A-Z]|$)", "law", "📜 Legal Provision"),
+        (r"\*\*NEXT STEPS?:?\*\*\s*([\s\S]+?)(?=\*\*|$)", "steps", "✅ Next Steps"),
+    ]
+    for regex, card_type, title in patterns:
+        m = re.search(regex, text, re.IGNORECASE | re.DOTALL)
+        if m:
+            content = m.group(1).strip()
+            if content and len(content) > 3:
+                # Truncate very long content for cards
+                if len(content) > 600:
+                    content = content[:600] + "..."
+                cards.append({"type": card_type, "title": title, "content": content})
+    if not cards:
+        # Fallback: split by double newline or bullets into chunks
+        parts = re.split(r'\n\n+', text)
+        if len(parts) > 1:
+            cards.append({"type": "summary", "title": "📌 Summary", "content": parts[0][:500]})
+            for p in parts[1:3]:
+                if p.strip() and len(p) > 20:
+                    cards.append({"type": "points", "title": "📋 Details", "content": p[:400]})
+        else:
+            cards.append({"type": "summary", "title": "📌 Answer", "content": text[:800]})
+    return cards
+
+
+@lru_cache(maxsize=1)
+def _glossary_matcher() -> KeywordMatcher:
+    """Whole-word matcher over LEGAL_GLOSSARY terms ("FIR" must not match "first")"""
+    return KeywordMatcher(((term, term) for term in LEGAL_GLOSSARY), boundary=BOUNDARY_WORD)
+
+
+def find_legal_terms(answer_text: str) -> List[Tuple[str, str]]:
+    """Find LEGAL_GLOSSARY terms mentioned in an answer, as (term, explanation) pairs"""
+    found = _glossary_matcher().find_values(answer_text)
+    return [(term, explanation) for term, explanation in LEGAL_GLOSSARY.items() if term in found]
+
+
+__all__ = ['LEGAL_GLOSSARY', 'parse_answer_cards', 'find_legal_terms']
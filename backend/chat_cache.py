@@ -0,0 +1,432 @@
+"""
+Write-Behind Chat Cache
+Keeps a user's chat sessions in memory: reads never touch the store, writes are
+journaled (one file append each) and flushed to the store in batches
+"""
+
+import os
+import json
+import atexit
+import logging
+import bisect
+import functools
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from . import config
+from .chat_history import _answer_in, serialize_sources, deserialize_sources
+from .chat_store import apply_ops_to_sessions, session_cursor, _new_session_id, _title_for
+
+logger = logging.getLogger(__name__)
+
+
+def _live(method):
+    """Run method on this cache, or on the user's current cache once this one was evicted and closed"""
+    @functools.wraps(method)
+    def run(self, *args, **kwargs):
+        with self._lock:
+            if not self._closed:
+                return method(self, *args, **kwargs)
+        return getattr(get_write_behind_store(self.store, self.user_id), method.__name__)(*args, **kwargs)
+    return run
+
+
+class WriteBehindChatStore:
+    """
+    One user's chat sessions served from memory, with UserChatStore's interface.
+
+    Every write is applied in memory, appended to the user's journal file (the one
+    durable write of a chat turn) and queued. flush() applies the queue to the
+    backing store in one batch and truncates the journal; a journal left behind by
+    a crash is replayed into the store on the next start. Operations carry message
+    positions, so replaying ones that already reached the store is harmless.
+
+    Meant for a single process: another process writing the same user's history
+    is not seen until this cache is dropped. A cache evicted from the registry is
+    closed; calls made on it afterwards (by a thread still holding it) go to the
+    user's current cache.
+    """
+
+    def __init__(self, store, user_id: str, journal_dir: Optional[Path] = None,
+                 fsync: Optional[bool] = None, open_journal: bool = True):
+        """
+        Args:
+            store: Backing SQLiteChatStore or JSONChatStore
+            user_id: Owner of the cached sessions
+            journal_dir: Folder for <user_id>.jsonl journals (default: config.CHAT_JOURNAL_DIR)
+            fsync: Sync each journal append to disk (default: config.CHAT_JOURNAL_FSYNC).
+                Without it a journaled write survives the process crashing but not
+                the machine losing power, like the sqlite store's synchronous=NORMAL.
+            open_journal: Replay and open the journal now; otherwise call open() before use.
+                Only one open cache per journal may exist (get_write_behind_store ensures it).
+        """
+        self.store = store
+        self.user_id = str(user_id or '')
+        journal_dir = Path(journal_dir or config.CHAT_JOURNAL_DIR)
+        journal_dir.mkdir(parents=True, exist_ok=True)
+        safe_id = "".join(c if c.isalnum() or c in "-_" else "_" for c in self.user_id) or "_shared"
+        self.journal_path = journal_dir / f"{safe_id}.jsonl"
+        self.fsync = config.CHAT_JOURNAL_FSYNC if fsync is None else fsync
+
+        self._lock = threading.RLock()
+        self._pending: List[Dict] = []
+        self._summaries: Optional[Dict[str, Dict]] = None  # id -> summary, loaded on first read
+        self._order: List[Tuple[str, str]] = []             # session_cursor of every summary, ascending
+        self._sessions: "OrderedDict[str, Dict]" = OrderedDict()  # id -> session with messages, recently opened last
+
+        self.flushes = 0
+        self.flushed_ops = 0
+        self.journal_writes = 0
+        self.replayed_ops = 0
+
+        self._journal = None
+        self._closed = False
+        if open_journal:
+            self.open()
+
+    @property
+    def backend(self) -> str:
+        return self.store.backend
+
+    # ---------------- journal ----------------
+
+    def open(self):
+        """Replay a leftover journal into the store and start a new one (no-op once open or closed)"""
+        with self._lock:
+            if self._journal is None and not self._closed:
+                self._recover()
+                self._journal = open(self.journal_path, "a", encoding="utf-8")
+
+    def close(self):
+        """
+        Flush and close the journal for good; ops a failed flush keeps stay in the
+        journal file for the next cache of this user to replay
+        """
+        with self._lock:
+            self.flush()
+            self._closed = True
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+
+    def _recover(self):
+        """
+        Replay a journal left by a process that stopped before flushing
+
+        Lines that do not parse (a torn final line from a crash mid-append) are
+        skipped. If the store rejects the replay, the journal is renamed to
+        <name>.failed-<timestamp> (and logged) so the user's history still opens.
+        """
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return
+        ops, skipped = [], 0
+        for line in lines:
+            try:
+                op = json.loads(line)
+            except ValueError:
+                skipped += 1
+                continue
+            if isinstance(op, dict) and "op" in op and "sid" in op:
+                ops.append(op)
+            else:
+                skipped += 1
+        if skipped:
+            logger.warning(f"Skipped {skipped} unreadable journal lines in {self.journal_path}")
+        if ops:
+            try:
+                self.store.apply_ops(self.user_id, ops)
+            except Exception as e:
+                backup = self.journal_path.with_name(f"{self.journal_path.name}.failed-{datetime.now():%Y%m%d%H%M%S}")
+                os.replace(self.journal_path, backup)
+                logger.error(f"Could not replay {len(ops)} journaled chat writes ({e}); moved to {backup}")
+                return
+            self.replayed_ops = len(ops)
+            logger.info(f"Replayed {len(ops)} journaled chat writes for user {self.user_id or '(shared)'}")
+        os.remove(self.journal_path)
+
+    def _write(self, op: Dict):
+        """Journal the operation durably, then apply it in memory and queue it (lock held)"""
+        self._journal.write(json.dumps(op, ensure_ascii=False) + "\n")
+        self._journal.flush()
+        if self.fsync:
+            os.fsync(self._journal.fileno())
+        self.journal_writes += 1
+        self._pending.append(op)
+        session = self._sessions.get(op["sid"])
+        if session is not None:
+            apply_ops_to_sessions([session], [op])
+            self._sessions.move_to_end(op["sid"])
+        self._apply_to_summary(op)
+        _register_dirty(self)
+
+    def _apply_to_summary(self, op: Dict):
+        if self._summaries is None:
+            return
+        sid = op["sid"]
+        if op["op"] == "create":
+            if sid not in self._summaries:
+                self._summaries[sid] = {"id": sid, "title": "New Chat", "created": op["created"], "message_count": 0}
+                bisect.insort(self._order, session_cursor(self._summaries[sid]))
+            return
+        summary = self._summaries.get(sid)
+        if summary is None:
+            return
+        if op["op"] == "append" and op["pos"] == summary["message_count"]:
+            summary["message_count"] += 1
+            if summary["title"] == "New Chat":
+                summary["title"] = _title_for(op["q"])
+        elif op["op"] == "clear":
+            summary["message_count"] = 0
+            summary["title"] = "New Chat"
+
+    def flush(self) -> int:
+        """
+        Apply queued writes to the store in one batch and truncate the journal
+
+        Returns:
+            Number of operations flushed (0 if nothing was queued or the store failed)
+        """
+        with self._lock:
+            if not self._pending:
+                return 0
+            ops = self._pending
+            try:
+                self.store.apply_ops(self.user_id, ops)
+            except Exception as e:
+                # Kept queued and journaled; the next flush retries
+                logger.error(f"Chat history flush failed, will retry: {e}")
+                return 0
+            self._pending = []
+            if self._journal is not None:
+                self._journal.truncate(0)
+            self.flushes += 1
+            self.flushed_ops += len(ops)
+            return len(ops)
+
+    # ---------------- reads ----------------
+
+    def _all_summaries(self) -> Dict[str, Dict]:
+        if self._summaries is None:
+            self._summaries = {s["id"]: s for s in self.store.list_sessions(self.user_id)}
+            self._order = sorted(session_cursor(s) for s in self._summaries.values())
+            for op in self._pending:
+                self._apply_to_summary(op)
+        return self._summaries
+
+    def _keep_session(self, session: Dict):
+        """Cache a session with messages, dropping the least recently opened past CHAT_CACHE_MAX_SESSIONS"""
+        self._sessions[session["id"]] = session
+        self._sessions.move_to_end(session["id"])
+        while len(self._sessions) > max(1, config.CHAT_CACHE_MAX_SESSIONS):
+            # Queued writes stay in _pending and are reapplied when it is loaded again
+            self._sessions.popitem(last=False)
+
+    def _session(self, session_id: str) -> Optional[Dict]:
+        """Session with messages, loaded from the store when not cached"""
+        session = self._sessions.get(session_id)
+        if session is not None:
+            self._sessions.move_to_end(session_id)
+        elif session_id in self._all_summaries():
+            session = self.store.load_session(self.user_id, session_id) or {
+                "id": session_id, "title": "New Chat", "created": self._summaries[session_id]["created"],
+                "messages": [],
+            }
+            apply_ops_to_sessions([session], [op for op in self._pending if op["sid"] == session_id])
+            self._keep_session(session)
+        return session
+
+    @_live
+    def list_sessions(self, limit: Optional[int] = None, after: Optional[Tuple[str, str]] = None) -> List[Dict]:
+        with self._lock:
+            summaries = self._all_summaries()
+            end = len(self._order) if after is None else bisect.bisect_left(self._order, tuple(after))
+            start = 0 if limit is None else max(0, end - limit)
+            return [dict(summaries[sid]) for _, sid in reversed(self._order[start:end])]
+
+    @_live
+    def get_session(self, session_id: str) -> Optional[Dict]:
+        with self._lock:
+            summary = self._all_summaries().get(session_id)
+            return dict(summary) if summary else None
+
+    @_live
+    def get_messages(self, session_id: str, language: Optional[str] = None) -> List[Tuple]:
+        with self._lock:
+            session = self._session(session_id)
+            messages = list(session["messages"]) if session else []
+        return [
+            (m["q"], _answer_in(m, language) or m["a"], deserialize_sources(m.get("sources", [])))
+            for m in messages
+        ]
+
+    @_live
+    def get_untranslated_answer(self, session_id: str, language: str) -> Optional[Tuple[int, str, str]]:
+        with self._lock:
+            session = self._session(session_id)
+            if not session or not session["messages"]:
+                return None
+            message = session["messages"][-1]
+            if _answer_in(message, language) is None:
+                return len(session["messages"]) - 1, message["a"], message.get("lang", "en")
+        return None
+
+    # ---------------- writes ----------------
+
+    @_live
+    def create_session(self) -> str:
+        sid = _new_session_id()
+        with self._lock:
+            self._all_summaries()
+            self._write({"op": "create", "sid": sid, "created": datetime.now().isoformat()})
+            self._keep_session({"id": sid, "title": "New Chat",
+                                "created": self._summaries[sid]["created"], "messages": []})
+        return sid
+
+    @_live
+    def append_message(self, session_id: str, query: str, answer: str, sources, language: str = 'en') -> int:
+        with self._lock:
+            summary = self._all_summaries().get(session_id)
+            if summary is None:
+                return -1
+            position = summary["message_count"]
+            self._write({
+                "op": "append", "sid": session_id, "pos": position,
+                "q": query, "a": answer, "lang": language, "sources": serialize_sources(sources),
+            })
+            return position
+
+    @_live
+    def store_translations(self, session_id: str, translations: List[Tuple[int, str, str]]) -> bool:
+        with self._lock:
+            summary = self._all_summaries().get(session_id)
+            if summary is None:
+                return False
+            stored = False
+            for index, language, text in translations:
+                if 0 <= index < summary["message_count"]:
+                    self._write({"op": "translate", "sid": session_id, "pos": index, "lang": language, "text": text})
+                    stored = True
+            return stored
+
+    @_live
+    def clear_session(self, session_id: str) -> None:
+        with self._lock:
+            if session_id in self._all_summaries():
+                self._write({"op": "clear", "sid": session_id})
+
+    @_live
+    def reload(self) -> None:
+        """Flush, then forget what was read from the store (after the store changed underneath)"""
+        self.flush()
+        self._summaries = None
+        self._order = []
+        self._sessions.clear()
+
+    def search(self, text: str, limit: int = 20, marks: Tuple[str, str] = ("**", "**")) -> List[Dict]:
+        """Search the store's index after flushing, so queued messages are found too"""
+        self.flush()
+        return self.store.search(self.user_id, text, limit=limit, marks=marks)
+
+    def stats(self) -> Dict:
+        """Journal writes, flushes and queue depth"""
+        with self._lock:
+            return {
+                "pending": len(self._pending),
+                "journal_writes": self.journal_writes,
+                "flushes": self.flushes,
+                "flushed_ops": self.flushed_ops,
+                "replayed_ops": self.replayed_ops,
+                "cached_sessions": len(self._summaries or {}),
+                "loaded_sessions": len(self._sessions),
+            }
+
+
+# ---------------- per-user registry and background flusher ----------------
+
+_caches: "OrderedDict[Tuple[int, str], WriteBehindChatStore]" = OrderedDict()
+_closing: Dict[Tuple[int, str], WriteBehindChatStore] = {}  # evicted, final flush in progress
+_dirty = set()
+_registry_lock = threading.Lock()
+_flush_wakeup = threading.Event()
+_flusher = None
+
+
+def _register_dirty(cache: WriteBehindChatStore):
+    with _registry_lock:
+        _dirty.add(cache)
+    _ensure_flusher()
+
+
+def _ensure_flusher():
+    global _flusher
+    with _registry_lock:
+        if _flusher is None or not _flusher.is_alive():
+            _flusher = threading.Thread(target=_flush_loop, name="chat-flush", daemon=True)
+            _flusher.start()
+
+
+def _flush_loop():
+    while True:
+        _flush_wakeup.wait(config.CHAT_FLUSH_INTERVAL)
+        _flush_wakeup.clear()
+        flush_all()
+
+
+def flush_all() -> int:
+    """Flush every cache with queued writes; returns operations flushed"""
+    with _registry_lock:
+        dirty = list(_dirty)
+        _dirty.clear()
+    flushed = 0
+    for cache in dirty:
+        flushed += cache.flush()
+        if cache.stats()["pending"]:
+            with _registry_lock:
+                _dirty.add(cache)
+    return flushed
+
+
+atexit.register(flush_all)
+
+
+def get_write_behind_store(store, user_id: str) -> WriteBehindChatStore:
+    """
+    The cache of user_id's sessions over store
+
+    Exactly one open cache per user exists at a time, so only one replays and owns
+    the user's journal. Least recently used users beyond CHAT_CACHE_MAX_USERS are
+    flushed and closed; a closed cache passes later calls on to the user's new one.
+    """
+    key = (id(store), str(user_id or ''))
+    evicted = []
+    with _registry_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            # Cheap and side-effect free; the journal is opened below by whoever wins
+            cache = _caches.setdefault(key, WriteBehindChatStore(store, user_id, open_journal=False))
+        _caches.move_to_end(key)
+        while len(_caches) > config.CHAT_CACHE_MAX_USERS:
+            old_key, old = _caches.popitem(last=False)
+            _closing[old_key] = old
+            evicted.append((old_key, old))
+        closing = _closing.get(key)
+    for old_key, old in evicted:
+        old.close()
+        with _registry_lock:
+            if _closing.get(old_key) is old:
+                del _closing[old_key]
+    if closing is not None:
+        # This user was just evicted: wait for that cache's final flush before replaying its journal
+        closing.close()
+    # Under the cache's own lock: concurrent callers for this user wait for one replay
+    cache.open()
+    return cache
+
+
+__all__ = ['WriteBehindChatStore', 'get_write_behind_store', 'flush_all']
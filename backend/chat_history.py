@@ -0,0 +1,350 @@
+"""
+Chat History Persistence
+Loads and saves chat sessions stored as JSON on disk. Every change is a locked
+read-modify-write (a lock file shared across threads and processes) ending in an
+atomic write-and-rename, so concurrent writers neither lose updates nor leave a
+truncated file behind.
+"""
+
+import os
+import json
+import uuid
+import logging
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .source_refs import SourceRef, compact_sources, rehydrate_sources
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers are serialized within this process only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+parent_dir = Path(__file__).parent.parent
+
+# Chat persistence path
+CHAT_STORAGE_PATH = parent_dir / "chat_history.json"
+
+_thread_locks: Dict[str, threading.Lock] = {}
+_thread_locks_guard = threading.Lock()
+_held = threading.local()
+
+
+@contextmanager
+def chat_history_lock(path: Optional[Path] = None):
+    """
+    Exclusive lock on a history file, across threads and (with fcntl) processes
+
+    Re-entrant within a thread. Held for a whole read-modify-write, so no other
+    writer can save between this writer's load and save.
+    """
+    path = Path(path or CHAT_STORAGE_PATH)
+    key = str(path.resolve())
+    held = _held.__dict__.setdefault("paths", set())
+    if key in held:
+        yield
+        return
+    with _thread_locks_guard:
+        thread_lock = _thread_locks.setdefault(key, threading.Lock())
+    with thread_lock:
+        held.add(key)
+        try:
+            if fcntl is None:
+                yield
+                return
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(f"{path}.lock", "a") as lock_file:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+        finally:
+            held.discard(key)
+
+
+def _read_sessions(path: Path) -> List[Dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_chat_sessions(path: Optional[Path] = None, strict: bool = False) -> List[Dict]:
+    """
+    Load saved chat sessions from disk
+
+    A file that does not parse is renamed to <name>.corrupt-<timestamp> (and logged)
+    instead of being overwritten by the next save. It is parsed again under the
+    history lock first, so a file a writer has just replaced is read, not moved.
+
+    Args:
+        strict: Raise OSError when the file exists but cannot be read, instead of
+            returning [] (for callers that write the result back over the file)
+    """
+    path = Path(path or CHAT_STORAGE_PATH)
+    try:
+        try:
+            return _read_sessions(path)
+        except ValueError:
+            # Parse again under the lock: a writer may have replaced the file since
+            with chat_history_lock(path):
+                try:
+                    return _read_sessions(path)
+                except ValueError as e:
+                    backup = path.with_name(f"{path.name}.corrupt-{datetime.now():%Y%m%d%H%M%S}")
+                    os.replace(path, backup)
+                    logger.error(f"Chat history {path} is not valid JSON ({e}); moved to {backup}")
+                    return []
+    except FileNotFoundError:
+        return []
+    except OSError as e:
+        if strict:
+            raise
+        logger.error(f"Could not read chat history {path}: {e}")
+        return []
+
+
+def _write_atomic(sessions: List[Dict], path: Path) -> None:
+    """Write to a temporary file beside path, sync it, then rename it over path"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(sessions, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def update_chat_sessions(mutate: Callable[[List[Dict]], object], path: Optional[Path] = None):
+    """
+    Apply mutate to the saved sessions under the history lock and save the result
+
+    Args:
+        mutate: Changes the session list in place; its return value is passed back
+
+    Returns:
+        (sessions as saved, mutate's return value)
+
+    Raises:
+        OSError: The file could not be read or written; it is left as it was
+    """
+    path = Path(path or CHAT_STORAGE_PATH)
+    with chat_history_lock(path):
+        sessions = load_chat_sessions(path, strict=True)
+        result = mutate(sessions)
+        _write_atomic(sessions, path)
+    return sessions, result
+
+
+def _same_message(a: Dict, b: Dict) -> bool:
+    return a.get("q") == b.get("q") and a.get("a") == b.get("a")
+
+
+def merge_chat_sessions(ours: List[Dict], theirs: List[Dict]) -> List[Dict]:
+    """
+    Combine sessions a caller loaded and changed with what other writers saved since
+
+    Sessions are united by id, new ones from theirs first. Within a session the
+    messages both sides share (same question and answer at the same position) are
+    kept once with their translations united; after them come messages only theirs
+    has, then messages only ours has. Nothing either side appended is lost, but
+    a cleared session cannot be told from a stale one: clear through
+    clear_chat_session, which holds the lock for its whole read-modify-write.
+    """
+    theirs_by_id = {s["id"]: s for s in theirs}
+    ours_ids = {s["id"] for s in ours}
+    merged = [s for s in theirs if s["id"] not in ours_ids]
+    for session in ours:
+        other = theirs_by_id.get(session["id"])
+        if other is None:
+            merged.append(session)
+            continue
+        mine, their_messages = session.get("messages", []), other.get("messages", [])
+        shared = 0
+        while shared < min(len(mine), len(their_messages)) and _same_message(mine[shared], their_messages[shared]):
+            shared += 1
+        messages = []
+        for m, t in zip(mine[:shared], their_messages[:shared]):
+            translations = {**t.get("translations", {}), **m.get("translations", {})}
+            messages.append({**m, "translations": translations} if translations else m)
+        messages += their_messages[shared:] + mine[shared:]
+        title = session.get("title", "New Chat")
+        if title == "New Chat":
+            title = other.get("title", title)
+        merged.append({**session, "title": title, "messages": messages})
+    return merged
+
+
+def save_chat_sessions(sessions: List[Dict], path: Optional[Path] = None, merge: bool = True) -> bool:
+    """
+    Save chat sessions to disk atomically
+
+    Args:
+        sessions: All sessions, typically as loaded earlier and changed since
+        merge: Fold in what other writers saved after sessions was loaded
+            (see merge_chat_sessions) instead of overwriting it
+
+    Returns:
+        True if saved; failures are logged and leave the file as it was
+    """
+    path = Path(path or CHAT_STORAGE_PATH)
+    try:
+        with chat_history_lock(path):
+            if merge:
+                sessions = merge_chat_sessions(sessions, load_chat_sessions(path, strict=True))
+            _write_atomic(sessions, path)
+        return True
+    except OSError as e:
+        logger.error(f"Could not save chat history {path}: {e}")
+        return False
+
+
+def serialize_sources(sources) -> List[Dict]:
+    """References to up to four source chunks: {"source", "chunk", "hash", "score", "content"} (see SourceRef.to_dict)"""
+    return compact_sources(sources, limit=4)
+
+
+def deserialize_sources(sources_data) -> List[SourceRef]:
+    """Stored references as Document-like records for render_source_cards (texts load on first read)"""
+    return rehydrate_sources(sources_data)
+
+
+def _update_or_log(mutate: Callable[[List[Dict]], object], path: Optional[Path], failed=None):
+    """update_chat_sessions for the helpers below: a failed save is logged, not raised"""
+    try:
+        return update_chat_sessions(mutate, path)
+    except OSError as e:
+        logger.error(f"Could not save chat history {path or CHAT_STORAGE_PATH}: {e}")
+        return load_chat_sessions(path), failed
+
+
+def create_chat_session(path: Optional[Path] = None) -> Tuple[List[Dict], str]:
+    """Create a new empty chat session; returns (all sessions, new session id)"""
+    sid = str(uuid.uuid4())[:8]
+    new_session = {
+        "id": sid,
+        "title": "New Chat",
+        "created": datetime.now().isoformat(),
+        "messages": []
+    }
+    sessions, _ = _update_or_log(lambda sessions: sessions.insert(0, new_session), path)
+    return sessions, sid
+
+
+def append_chat_message(session_id: str, query: str, answer: str, sources,
+                        path: Optional[Path] = None, language: str = 'en') -> List[Dict]:
+    """
+    Add a message to a session and update title if first message; returns all sessions
+
+    Args:
+        language: Language code the answer is written in
+    """
+    message = {"q": query, "a": answer, "lang": language, "sources": serialize_sources(sources)}
+
+    def append(sessions):
+        for s in sessions:
+            if s["id"] == session_id:
+                s["messages"].append(message)
+                if s["title"] == "New Chat":
+                    s["title"] = (query[:40] + "…") if len(query) > 40 else query
+                break
+
+    return _update_or_log(append, path)[0]
+
+
+def _answer_in(message: Dict, language: Optional[str]) -> Optional[str]:
+    """Message's answer in language (None if that translation is not stored)"""
+    if language is None or message.get("lang", "en") == language:
+        return message["a"]
+    return message.get("translations", {}).get(language)
+
+
+def get_chat_messages(session_id: str, path: Optional[Path] = None,
+                      language: Optional[str] = None) -> List[Tuple]:
+    """
+    Get (question, answer, sources) tuples for a session
+
+    Args:
+        language: Prefer stored translations of answers into this language code
+    """
+    for s in load_chat_sessions(path):
+        if s["id"] == session_id:
+            return [
+                (m["q"], _answer_in(m, language) or m["a"], deserialize_sources(m.get("sources", [])))
+                for m in s["messages"]
+            ]
+    return []
+
+
+def get_untranslated_answer(session_id: str, language: str,
+                            path: Optional[Path] = None) -> Optional[Tuple[int, str, str]]:
+    """
+    Latest answer of a session when it is not yet available in language
+
+    Returns:
+        (message index, answer, answer language) or None
+    """
+    for s in load_chat_sessions(path):
+        if s["id"] == session_id and s["messages"]:
+            message = s["messages"][-1]
+            if _answer_in(message, language) is None:
+                return len(s["messages"]) - 1, message["a"], message.get("lang", "en")
+    return None
+
+
+def store_message_translations(session_id: str, translations: List[Tuple[int, str, str]],
+                               path: Optional[Path] = None) -> bool:
+    """
+    Store answer translations alongside their messages
+
+    Args:
+        translations: (message index, language code, translated answer) triples
+
+    Returns:
+        True if anything was stored
+    """
+    def store(sessions):
+        stored = False
+        for s in sessions:
+            if s["id"] == session_id:
+                for index, language, text in translations:
+                    if 0 <= index < len(s["messages"]):
+                        s["messages"][index].setdefault("translations", {})[language] = text
+                        stored = True
+                break
+        return stored
+
+    return bool(_update_or_log(store, path, failed=False)[1])
+
+
+def clear_chat_session(session_id: str, path: Optional[Path] = None) -> List[Dict]:
+    """Remove all messages from a session; returns all sessions"""
+    def clear(sessions):
+        for s in sessions:
+            if s["id"] == session_id:
+                s["messages"] = []
+                s["title"] = "New Chat"
+                break
+
+    return _update_or_log(clear, path)[0]
+
+
+__all__ = [
+    'CHAT_STORAGE_PATH', 'chat_history_lock', 'load_chat_sessions', 'save_chat_sessions',
+    'update_chat_sessions', 'merge_chat_sessions',
+    'serialize_sources', 'deserialize_sources', 'create_chat_session',
+    'append_chat_message', 'get_chat_messages', 'get_untranslated_answer',
+    'store_message_translations', 'clear_chat_session',
+]
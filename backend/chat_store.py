@@ -0,0 +1,846 @@
+"""
+Chat Store
+Per-user chat sessions behind one interface, kept either in SQLite (WAL, append-only
+message inserts, keyset-paginated recent-sessions query, FTS5 message search) or in
+per-user JSON files
+"""
+
+import os
+import re
+import json
+import uuid
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from . import config
+from .chat_history import (
+    CHAT_STORAGE_PATH,
+    chat_history_lock,
+    load_chat_sessions,
+    update_chat_sessions,
+    create_chat_session,
+    append_chat_message,
+    get_chat_messages,
+    get_untranslated_answer,
+    store_message_translations,
+    clear_chat_session,
+    serialize_sources,
+    deserialize_sources,
+)
+
+logger = logging.getLogger(__name__)
+
+_TABLES = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL DEFAULT '',
+    title TEXT NOT NULL,
+    created TEXT NOT NULL,
+    message_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    session_id TEXT NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    query TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    lang TEXT NOT NULL DEFAULT 'en',
+    sources TEXT NOT NULL DEFAULT '[]',
+    UNIQUE (session_id, position)
+);
+CREATE TABLE IF NOT EXISTS message_translations (
+    message_id INTEGER NOT NULL REFERENCES messages(id) ON DELETE CASCADE,
+    lang TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    PRIMARY KEY (message_id, lang)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Created after _upgrade_schema() so stores from before per-user partitioning get user_id first
+_INDEXES = """
+DROP INDEX IF EXISTS idx_sessions_created;
+CREATE INDEX IF NOT EXISTS idx_sessions_user_recent ON sessions(user_id, created DESC, id DESC);
+"""
+
+# Full-text index over questions and answers, kept in step with messages by triggers.
+# unicode61 normally splits Indic words at every vowel sign and virama; counting the
+# mark categories as word characters keeps them whole. remove_diacritics folds Latin accents.
+_FTS = """
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+    query, answer, content='messages', content_rowid='id',
+    tokenize="unicode61 remove_diacritics 2 categories 'L* N* Co M*'"
+);
+CREATE TRIGGER IF NOT EXISTS messages_fts_insert AFTER INSERT ON messages BEGIN
+    INSERT INTO messages_fts (rowid, query, answer) VALUES (new.id, new.query, new.answer);
+END;
+CREATE TRIGGER IF NOT EXISTS messages_fts_delete AFTER DELETE ON messages BEGIN
+    INSERT INTO messages_fts (messages_fts, rowid, query, answer) VALUES ('delete', old.id, old.query, old.answer);
+END;
+CREATE TRIGGER IF NOT EXISTS messages_fts_update AFTER UPDATE OF query, answer ON messages BEGIN
+    INSERT INTO messages_fts (messages_fts, rowid, query, answer) VALUES ('delete', old.id, old.query, old.answer);
+    INSERT INTO messages_fts (rowid, query, answer) VALUES (new.id, new.query, new.answer);
+END;
+"""
+
+# Question matches outrank answer matches
+_FTS_WEIGHTS = "2.0, 1.0"
+
+_SESSION_COLUMNS = "id, title, created, message_count"
+
+# meta key recording that chat_history.json has been imported
+_JSON_MIGRATED = "json_migrated"
+# meta key recording who received the sessions imported without an owner
+_LEGACY_ASSIGNED = "legacy_assigned"
+
+
+def _new_session_id() -> str:
+    return str(uuid.uuid4())[:8]
+
+
+def _title_for(query: str) -> str:
+    """Session title taken from its first question"""
+    return (query[:40] + "…") if len(query) > 40 else query
+
+
+def session_cursor(session: Dict) -> Tuple[str, str]:
+    """Keyset cursor of a session summary: pass the last one shown to list_sessions(after=...)"""
+    return session["created"] or "", session["id"]
+
+
+# Words of a search (\w misses Indic vowel signs and viramas)
+_SEARCH_TERM = re.compile(r"[\w\u0600-\u06ff\u0900-\u0dff]+")
+
+
+def search_terms(text: str) -> List[str]:
+    """Lowercased words of a search box entry; punctuation and FTS5 syntax are dropped"""
+    return [term.lower() for term in _SEARCH_TERM.findall(text or "")][:16]
+
+
+def _fts_query(terms: List[str]) -> str:
+    """FTS5 query matching messages that contain every term as a word prefix"""
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def _highlight(text: str, terms: List[str], marks: Tuple[str, str], width: int = 80) -> str:
+    """Snippet of text around the first term, with every term occurrence wrapped in marks"""
+    pattern = re.compile("|".join(re.escape(term) for term in terms), re.IGNORECASE)
+    first = pattern.search(text)
+    start = max(0, first.start() - width // 3) if first else 0
+    window = pattern.sub(lambda m: f"{marks[0]}{m.group(0)}{marks[1]}", text[start:start + width])
+    return ("…" if start else "") + window + ("…" if start + width < len(text) else "")
+
+
+def scan_messages(rows, terms: List[str], limit: int, marks: Tuple[str, str]) -> List[Dict]:
+    """
+    Search without an index: the JSON store, or SQLite built without FTS5
+
+    Args:
+        rows: (session summary, position, question, answer) for every message of a user
+        terms: search_terms() of the search; a message must contain all of them
+
+    Returns:
+        Results shaped like SQLiteChatStore.search(), most term occurrences first
+    """
+    found = []
+    for summary, position, query, answer in rows:
+        folded = (query.lower(), answer.lower())
+        if not all(term in folded[0] or term in folded[1] for term in terms):
+            continue
+        score = sum(f.count(term) * weight for f, weight in zip(folded, (2, 1)) for term in terms)
+        text = query if any(term in folded[0] for term in terms) else answer
+        found.append((score, summary["created"] or "", summary, position, text))
+    found.sort(key=lambda r: (r[0], r[1]), reverse=True)
+    return [
+        {"session_id": summary["id"], "title": summary["title"], "created": summary["created"],
+         "position": position, "snippet": _highlight(text, terms, marks), "score": float(score)}
+        for score, _, summary, position, text in found[:limit]
+    ]
+
+
+def _summary(session: Dict) -> Dict:
+    return {
+        "id": session["id"],
+        "title": session.get("title", "New Chat"),
+        "created": session.get("created"),
+        "message_count": len(session.get("messages", [])),
+    }
+
+
+def apply_ops_to_sessions(sessions: List[Dict], ops: List[Dict]) -> List[Dict]:
+    """
+    Apply write operations to sessions shaped like chat_history.json entries (in place)
+
+    Ops are dicts with an "op" of create, append, translate or clear (see
+    WriteBehindChatStore). Each is idempotent: messages carry their position, so
+    replaying ops that were already applied changes nothing.
+    """
+    by_id = {s["id"]: s for s in sessions}
+    for op in ops:
+        kind, sid = op["op"], op["sid"]
+        session = by_id.get(sid)
+        if kind == "create":
+            if session is None:
+                session = {"id": sid, "title": "New Chat", "created": op["created"], "messages": []}
+                sessions.insert(0, session)
+                by_id[sid] = session
+            continue
+        if session is None:
+            continue
+        messages = session.setdefault("messages", [])
+        if kind == "append" and op["pos"] == len(messages):
+            messages.append({"q": op["q"], "a": op["a"], "lang": op["lang"], "sources": op["sources"]})
+            if session.get("title", "New Chat") == "New Chat":
+                session["title"] = _title_for(op["q"])
+        elif kind == "translate" and 0 <= op["pos"] < len(messages):
+            messages[op["pos"]].setdefault("translations", {})[op["lang"]] = op["text"]
+        elif kind == "clear":
+            session["messages"] = []
+            session["title"] = "New Chat"
+    return sessions
+
+
+class JSONChatStore:
+    """
+    One JSON file per user (the legacy shared chat_history.json for user_id ''),
+    read and rewritten whole on every call
+    """
+
+    backend = "json"
+
+    def __init__(self, directory: Optional[Path] = None, legacy_path: Optional[Path] = None):
+        """
+        Args:
+            directory: Folder holding <user_id>.json files (default: config.CHAT_HISTORY_DIR)
+            legacy_path: File used for user_id '' (default: CHAT_STORAGE_PATH)
+        """
+        self.directory = Path(directory or config.CHAT_HISTORY_DIR)
+        self.legacy_path = Path(legacy_path or CHAT_STORAGE_PATH)
+
+    def path_for(self, user_id: str) -> Path:
+        if not user_id:
+            return self.legacy_path
+        self.directory.mkdir(parents=True, exist_ok=True)
+        safe_id = "".join(c if c.isalnum() or c in "-_" else "_" for c in str(user_id))
+        return self.directory / f"{safe_id}.json"
+
+    def list_sessions(self, user_id: str, limit: Optional[int] = None,
+                      after: Optional[Tuple[str, str]] = None) -> List[Dict]:
+        sessions = [_summary(s) for s in load_chat_sessions(self.path_for(user_id))]
+        sessions.sort(key=session_cursor, reverse=True)
+        if after is not None:
+            sessions = [s for s in sessions if session_cursor(s) < tuple(after)]
+        return sessions[:limit]
+
+    def get_session(self, user_id: str, session_id: str) -> Optional[Dict]:
+        return next(
+            (_summary(s) for s in load_chat_sessions(self.path_for(user_id)) if s["id"] == session_id), None
+        )
+
+    def create_session(self, user_id: str) -> str:
+        return create_chat_session(self.path_for(user_id))[1]
+
+    def append_message(self, user_id: str, session_id: str, query: str, answer: str, sources,
+                       language: str = 'en') -> int:
+        sessions = append_chat_message(session_id, query, answer, sources, self.path_for(user_id), language=language)
+        session = next((s for s in sessions if s["id"] == session_id), None)
+        return len(session["messages"]) - 1 if session else -1
+
+    def get_messages(self, user_id: str, session_id: str, language: Optional[str] = None) -> List[Tuple]:
+        return get_chat_messages(session_id, self.path_for(user_id), language=language)
+
+    def get_untranslated_answer(self, user_id: str, session_id: str,
+                                language: str) -> Optional[Tuple[int, str, str]]:
+        return get_untranslated_answer(session_id, language, self.path_for(user_id))
+
+    def store_translations(self, user_id: str, session_id: str, translations: List[Tuple[int, str, str]]) -> bool:
+        return store_message_translations(session_id, translations, self.path_for(user_id))
+
+    def clear_session(self, user_id: str, session_id: str) -> None:
+        clear_chat_session(session_id, self.path_for(user_id))
+
+    def load_session(self, user_id: str, session_id: str) -> Optional[Dict]:
+        """A session with its raw messages, as stored in chat_history.json"""
+        return next((s for s in load_chat_sessions(self.path_for(user_id)) if s["id"] == session_id), None)
+
+    def apply_ops(self, user_id: str, ops: List[Dict]) -> None:
+        """
+        Apply a batch of write operations with one locked read and rewrite of the user's file
+
+        Raises:
+            OSError: Nothing was applied; the caller keeps the batch and retries
+        """
+        update_chat_sessions(lambda sessions: apply_ops_to_sessions(sessions, ops), self.path_for(user_id))
+
+    def assign_unowned_sessions(self, user_id: str) -> int:
+        """
+        Move the shared legacy file's sessions into user_id's file, once
+
+        The legacy file is renamed to <name>.assigned-<timestamp> afterwards.
+
+        Returns:
+            Number of sessions moved (0 once assigned)
+        """
+        if not user_id or not self.legacy_path.exists():
+            return 0
+        with chat_history_lock(self.legacy_path):
+            legacy = load_chat_sessions(self.legacy_path, strict=True)
+
+            def add(sessions: List[Dict]) -> int:
+                known = {s["id"] for s in sessions}
+                moved = [s for s in legacy if s["id"] not in known]
+                sessions.extend(moved)
+                return len(moved)
+
+            _, moved = update_chat_sessions(add, self.path_for(user_id))
+            os.replace(self.legacy_path,
+                       self.legacy_path.with_name(f"{self.legacy_path.name}.assigned-{datetime.now():%Y%m%d%H%M%S}"))
+        return moved
+
+    def search(self, user_id: str, text: str, limit: int = 20,
+               marks: Tuple[str, str] = ("**", "**")) -> List[Dict]:
+        """Messages matching every word of text, found by reading the user's whole file"""
+        terms = search_terms(text)
+        if not terms:
+            return []
+        rows = (
+            (_summary(s), position, m.get("q", ""), m.get("a", ""))
+            for s in load_chat_sessions(self.path_for(user_id))
+            for position, m in enumerate(s.get("messages", []))
+        )
+        return scan_messages(rows, terms, limit, marks)
+
+
+class SQLiteChatStore:
+    """
+    Sessions and messages in SQLite, partitioned by user. A chat turn inserts one
+    message row and updates one session row; the sidebar reads one page of the
+    user's session rows through the (user_id, created, id) index, so cost no longer
+    grows with the history other users, or the user, ever wrote.
+    """
+
+    backend = "sqlite"
+
+    def __init__(self, path: str, json_path: Optional[Path] = None):
+        """
+        Args:
+            path: sqlite file
+            json_path: chat_history.json imported once into an empty store (None skips);
+                its sessions have no owner and are kept under user_id ''
+        """
+        self.path = str(path)
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        conn = self._connection()
+        conn.executescript(_TABLES)
+        self._upgrade_schema(conn)
+        conn.executescript(_INDEXES)
+        self.fts = self._create_search_index(conn)
+        if json_path is not None:
+            self.migrate_json(json_path)
+
+    # ---------------- connections ----------------
+
+    def _connection(self) -> sqlite3.Connection:
+        """Per-thread connection in autocommit mode; writes use _transaction()"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        """Write transaction taking the lock up front, so concurrent writers queue instead of failing"""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    @staticmethod
+    def _upgrade_schema(conn: sqlite3.Connection):
+        """Add columns introduced after a store was created"""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(sessions)")}
+        if "user_id" not in columns:
+            conn.execute("ALTER TABLE sessions ADD COLUMN user_id TEXT NOT NULL DEFAULT ''")
+
+    @staticmethod
+    def _create_search_index(conn: sqlite3.Connection) -> bool:
+        """Create the FTS5 index, filling it from existing messages; False if SQLite lacks FTS5"""
+        existed = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'messages_fts'").fetchone()
+        try:
+            conn.executescript(_FTS)
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Chat search without an index (SQLite FTS5 unavailable: {e})")
+            return False
+        if not existed:
+            conn.execute("INSERT INTO messages_fts (messages_fts) VALUES ('rebuild')")
+        return True
+
+    # ---------------- migration ----------------
+
+    def migrate_json(self, json_path: Path, user_id: str = '') -> int:
+        """
+        Import a chat_history.json once (the file is left in place)
+
+        Args:
+            user_id: Owner of the imported sessions ('' for the shared legacy file)
+
+        Returns:
+            Number of sessions imported
+        """
+        marker = f"{_JSON_MIGRATED}:{json_path}"
+        conn = self._connection()
+        if conn.execute("SELECT 1 FROM meta WHERE key IN (?, ?)", (_JSON_MIGRATED, marker)).fetchone():
+            return 0
+        try:
+            sessions = load_chat_sessions(json_path, strict=True) if Path(json_path).exists() else []
+        except OSError as e:
+            # Not marked as migrated, so the next start tries again
+            logger.error(f"Chat history migration from {json_path} failed: {e}")
+            return 0
+        try:
+            with self._transaction() as conn:
+                if conn.execute("SELECT 1 FROM meta WHERE key IN (?, ?)", (_JSON_MIGRATED, marker)).fetchone():
+                    return 0
+                imported = 0
+                for s in sessions:
+                    messages = s.get("messages", [])
+                    cursor = conn.execute(
+                        "INSERT OR IGNORE INTO sessions (id, user_id, title, created, message_count) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (s["id"], user_id, s.get("title", "New Chat"),
+                         s.get("created") or datetime.now().isoformat(), len(messages))
+                    )
+                    if not cursor.rowcount:
+                        continue
+                    imported += 1
+                    for position, m in enumerate(messages):
+                        message_id = conn.execute(
+                            "INSERT INTO messages (session_id, position, query, answer, lang, sources) "
+                            "VALUES (?, ?, ?, ?, ?, ?)",
+                            (s["id"], position, m.get("q", ""), m.get("a", ""), m.get("lang", "en"),
+                             json.dumps(m.get("sources", []), ensure_ascii=False))
+                        ).lastrowid
+                        conn.executemany(
+                            "INSERT INTO message_translations (message_id, lang, answer) VALUES (?, ?, ?)",
+                            [(message_id, lang, text) for lang, text in m.get("translations", {}).items()]
+                        )
+                conn.execute(
+                    "INSERT INTO meta (key, value) VALUES (?, ?)",
+                    (marker, json.dumps({"user_id": user_id, "sessions": imported,
+                                         "at": datetime.now().isoformat()}))
+                )
+        except sqlite3.Error as e:
+            logger.error(f"Chat history migration from {json_path} failed: {e}")
+            return 0
+        if imported:
+            logger.info(f"Imported {imported} chat sessions from {json_path}")
+        return imported
+
+    def assign_unowned_sessions(self, user_id: str) -> int:
+        """
+        Give the sessions kept under user_id '' (the imported shared history) to user_id, once
+
+        Returns:
+            Number of sessions reassigned (0 once assigned)
+        """
+        if not user_id:
+            return 0
+        conn = self._connection()
+        if conn.execute("SELECT 1 FROM meta WHERE key = ?", (_LEGACY_ASSIGNED,)).fetchone():
+            return 0
+        with self._transaction() as conn:
+            if conn.execute("SELECT 1 FROM meta WHERE key = ?", (_LEGACY_ASSIGNED,)).fetchone():
+                return 0
+            moved = conn.execute("UPDATE sessions SET user_id = ? WHERE user_id = ''", (user_id,)).rowcount
+            conn.execute(
+                "INSERT INTO meta (key, value) VALUES (?, ?)",
+                (_LEGACY_ASSIGNED, json.dumps({"user_id": user_id, "sessions": moved,
+                                               "at": datetime.now().isoformat()}))
+            )
+        return moved
+
+    # ---------------- sessions ----------------
+
+    def list_sessions(self, user_id: str, limit: Optional[int] = None,
+                      after: Optional[Tuple[str, str]] = None) -> List[Dict]:
+        """
+        A user's session summaries, newest first
+
+        Args:
+            limit: Page size (None = all)
+            after: session_cursor() of the last session on the previous page
+        """
+        sql = f"SELECT {_SESSION_COLUMNS} FROM sessions WHERE user_id = ?"
+        params = [user_id]
+        if after is not None:
+            sql += " AND (created, id) < (?, ?)"
+            params.extend(after)
+        sql += " ORDER BY created DESC, id DESC LIMIT ?"
+        params.append(-1 if limit is None else limit)
+        try:
+            rows = self._connection().execute(sql, params).fetchall()
+        except sqlite3.Error as e:
+            logger.error(f"Could not list chat sessions: {e}")
+            return []
+        return [{"id": r[0], "title": r[1], "created": r[2], "message_count": r[3]} for r in rows]
+
+    def get_session(self, user_id: str, session_id: str) -> Optional[Dict]:
+        row = self._connection().execute(
+            f"SELECT {_SESSION_COLUMNS} FROM sessions WHERE id = ? AND user_id = ?", (session_id, user_id)
+        ).fetchone()
+        return {"id": row[0], "title": row[1], "created": row[2], "message_count": row[3]} if row else None
+
+    def create_session(self, user_id: str) -> str:
+        sid = _new_session_id()
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO sessions (id, user_id, title, created) VALUES (?, ?, 'New Chat', ?)",
+                (sid, user_id, datetime.now().isoformat())
+            )
+        return sid
+
+    def clear_session(self, user_id: str, session_id: str) -> None:
+        """Remove all messages from a session"""
+        try:
+            with self._transaction() as conn:
+                cursor = conn.execute(
+                    "UPDATE sessions SET message_count = 0, title = 'New Chat' WHERE id = ? AND user_id = ?",
+                    (session_id, user_id)
+                )
+                if cursor.rowcount:
+                    conn.execute("DELETE FROM messages WHERE session_id = ?", (session_id,))
+        except sqlite3.Error as e:
+            logger.error(f"Could not clear chat session {session_id}: {e}")
+
+    # ---------------- messages ----------------
+
+    def append_message(self, user_id: str, session_id: str, query: str, answer: str, sources,
+                       language: str = 'en') -> int:
+        """
+        Add a message and set the title from the first question
+
+        Returns:
+            Index of the message in its session (-1 if the user has no such session)
+        """
+        try:
+            with self._transaction() as conn:
+                row = conn.execute(
+                    "SELECT message_count, title FROM sessions WHERE id = ? AND user_id = ?", (session_id, user_id)
+                ).fetchone()
+                if row is None:
+                    return -1
+                position, title = row
+                conn.execute(
+                    "INSERT INTO messages (session_id, position, query, answer, lang, sources) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (session_id, position, query, answer, language,
+                     json.dumps(serialize_sources(sources), ensure_ascii=False))
+                )
+                conn.execute(
+                    "UPDATE sessions SET message_count = ?, title = ? WHERE id = ?",
+                    (position + 1, _title_for(query) if title == "New Chat" else title, session_id)
+                )
+            return position
+        except sqlite3.Error as e:
+            logger.error(f"Could not save chat message: {e}")
+            return -1
+
+    def get_messages(self, user_id: str, session_id: str, language: Optional[str] = None) -> List[Tuple]:
+        """(question, answer, sources) tuples, answers in language where a translation is stored"""
+        rows = self._connection().execute(
+            "SELECT m.query, m.answer, m.sources, t.answer FROM sessions s "
+            "JOIN messages m ON m.session_id = s.id "
+            "LEFT JOIN message_translations t ON t.message_id = m.id AND t.lang = ? "
+            "WHERE s.id = ? AND s.user_id = ? ORDER BY m.position",
+            (language, session_id, user_id)
+        ).fetchall()
+        return [
+            (query, translated or answer, deserialize_sources(json.loads(sources)))
+            for query, answer, sources, translated in rows
+        ]
+
+    def get_untranslated_answer(self, user_id: str, session_id: str,
+                                language: str) -> Optional[Tuple[int, str, str]]:
+        """Latest answer when it is not yet available in language: (index, answer, answer language)"""
+        row = self._connection().execute(
+            "SELECT m.position, m.answer, m.lang, t.answer FROM sessions s "
+            "JOIN messages m ON m.session_id = s.id AND m.position = s.message_count - 1 "
+            "LEFT JOIN message_translations t ON t.message_id = m.id AND t.lang = ? "
+            "WHERE s.id = ? AND s.user_id = ?",
+            (language, session_id, user_id)
+        ).fetchone()
+        if row is None or row[2] == language or row[3] is not None:
+            return None
+        return row[0], row[1], row[2]
+
+    def store_translations(self, user_id: str, session_id: str, translations: List[Tuple[int, str, str]]) -> bool:
+        """Store (message index, language, translated answer) triples; True if anything was stored"""
+        stored = 0
+        try:
+            with self._transaction() as conn:
+                for index, language, text in translations:
+                    row = conn.execute(
+                        "SELECT m.id FROM sessions s JOIN messages m ON m.session_id = s.id "
+                        "WHERE s.id = ? AND s.user_id = ? AND m.position = ?",
+                        (session_id, user_id, index)
+                    ).fetchone()
+                    if row is not None:
+                        conn.execute(
+                            "INSERT OR REPLACE INTO message_translations (message_id, lang, answer) "
+                            "VALUES (?, ?, ?)",
+                            (row[0], language, text)
+                        )
+                        stored += 1
+        except sqlite3.Error as e:
+            logger.error(f"Could not store answer translations: {e}")
+            return False
+        return stored > 0
+
+    def load_session(self, user_id: str, session_id: str) -> Optional[Dict]:
+        """A session with its raw messages, in the chat_history.json shape"""
+        conn = self._connection()
+        summary = self.get_session(user_id, session_id)
+        if summary is None:
+            return None
+        messages = []
+        for message_id, query, answer, lang, sources in conn.execute(
+            "SELECT id, query, answer, lang, sources FROM messages WHERE session_id = ? ORDER BY position",
+            (session_id,)
+        ):
+            message = {"q": query, "a": answer, "lang": lang, "sources": json.loads(sources)}
+            translations = dict(conn.execute(
+                "SELECT lang, answer FROM message_translations WHERE message_id = ?", (message_id,)
+            ).fetchall())
+            if translations:
+                message["translations"] = translations
+            messages.append(message)
+        return {"id": summary["id"], "title": summary["title"], "created": summary["created"], "messages": messages}
+
+    def apply_ops(self, user_id: str, ops: List[Dict]) -> None:
+        """
+        Apply a batch of write operations in one transaction (see apply_ops_to_sessions)
+
+        Raises:
+            sqlite3.Error: Nothing was applied; the caller keeps the batch and retries
+        """
+        with self._transaction() as conn:
+            for op in ops:
+                kind, sid = op["op"], op["sid"]
+                if kind == "create":
+                    conn.execute(
+                        "INSERT OR IGNORE INTO sessions (id, user_id, title, created) VALUES (?, ?, 'New Chat', ?)",
+                        (sid, user_id, op["created"])
+                    )
+                    continue
+                row = conn.execute(
+                    "SELECT message_count, title FROM sessions WHERE id = ? AND user_id = ?", (sid, user_id)
+                ).fetchone()
+                if row is None:
+                    continue
+                count, title = row
+                if kind == "append" and op["pos"] == count:
+                    conn.execute(
+                        "INSERT INTO messages (session_id, position, query, answer, lang, sources) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (sid, op["pos"], op["q"], op["a"], op["lang"], json.dumps(op["sources"], ensure_ascii=False))
+                    )
+                    conn.execute(
+                        "UPDATE sessions SET message_count = ?, title = ? WHERE id = ?",
+                        (count + 1, _title_for(op["q"]) if title == "New Chat" else title, sid)
+                    )
+                elif kind == "translate":
+                    conn.execute(
+                        "INSERT OR REPLACE INTO message_translations (message_id, lang, answer) "
+                        "SELECT id, ?, ? FROM messages WHERE session_id = ? AND position = ?",
+                        (op["lang"], op["text"], sid, op["pos"])
+                    )
+                elif kind == "clear":
+                    conn.execute("DELETE FROM messages WHERE session_id = ?", (sid,))
+                    conn.execute("UPDATE sessions SET message_count = 0, title = 'New Chat' WHERE id = ?", (sid,))
+
+    # ---------------- search ----------------
+
+    def search(self, user_id: str, text: str, limit: int = 20,
+               marks: Tuple[str, str] = ("**", "**")) -> List[Dict]:
+        """
+        The user's messages matching every word of text (as word prefixes), best first
+
+        Args:
+            text: Search box entry in any script; FTS5 syntax in it is treated as plain words
+            limit: Maximum results
+            marks: Strings placed around matched words in the snippet
+
+        Returns:
+            [{"session_id", "title", "created", "position", "snippet", "score"}], where
+            position is the message's index in the session and higher scores rank first
+        """
+        terms = search_terms(text)
+        if not terms:
+            return []
+        conn = self._connection()
+        if not self.fts:
+            rows = (
+                ({"id": sid, "title": title, "created": created}, position, query, answer)
+                for sid, title, created, position, query, answer in conn.execute(
+                    "SELECT s.id, s.title, s.created, m.position, m.query, m.answer "
+                    "FROM messages m JOIN sessions s ON s.id = m.session_id WHERE s.user_id = ?", (user_id,)
+                )
+            )
+            return scan_messages(rows, terms, limit, marks)
+        rows = conn.execute(
+            f"SELECT s.id, s.title, s.created, m.position, "
+            f"snippet(messages_fts, -1, ?, ?, '…', 12), bm25(messages_fts, {_FTS_WEIGHTS}) AS rank "
+            f"FROM messages_fts "
+            f"JOIN messages m ON m.id = messages_fts.rowid "
+            f"JOIN sessions s ON s.id = m.session_id "
+            f"WHERE messages_fts MATCH ? AND s.user_id = ? "
+            f"ORDER BY rank LIMIT ?",
+            (marks[0], marks[1], _fts_query(terms), user_id, limit)
+        ).fetchall()
+        return [
+            {"session_id": sid, "title": title, "created": created, "position": position,
+             "snippet": snippet, "score": -rank}
+            for sid, title, created, position, snippet, rank in rows
+        ]
+
+    def count_messages(self) -> int:
+        """Messages across all users' sessions"""
+        return self._connection().execute("SELECT COALESCE(SUM(message_count), 0) FROM sessions").fetchone()[0]
+
+
+class UserChatStore:
+    """A chat store bound to one user: the same calls without the user_id argument"""
+
+    def __init__(self, store, user_id: str):
+        self.store = store
+        self.user_id = str(user_id or '')
+
+    @property
+    def backend(self) -> str:
+        return self.store.backend
+
+    def list_sessions(self, limit: Optional[int] = None, after: Optional[Tuple[str, str]] = None) -> List[Dict]:
+        return self.store.list_sessions(self.user_id, limit=limit, after=after)
+
+    def get_session(self, session_id: str) -> Optional[Dict]:
+        return self.store.get_session(self.user_id, session_id)
+
+    def create_session(self) -> str:
+        return self.store.create_session(self.user_id)
+
+    def append_message(self, session_id: str, query: str, answer: str, sources, language: str = 'en') -> int:
+        return self.store.append_message(self.user_id, session_id, query, answer, sources, language=language)
+
+    def get_messages(self, session_id: str, language: Optional[str] = None) -> List[Tuple]:
+        return self.store.get_messages(self.user_id, session_id, language=language)
+
+    def get_untranslated_answer(self, session_id: str, language: str) -> Optional[Tuple[int, str, str]]:
+        return self.store.get_untranslated_answer(self.user_id, session_id, language)
+
+    def store_translations(self, session_id: str, translations: List[Tuple[int, str, str]]) -> bool:
+        return self.store.store_translations(self.user_id, session_id, translations)
+
+    def clear_session(self, session_id: str) -> None:
+        self.store.clear_session(self.user_id, session_id)
+
+    def search(self, text: str, limit: int = 20, marks: Tuple[str, str] = ("**", "**")) -> List[Dict]:
+        return self.store.search(self.user_id, text, limit=limit, marks=marks)
+
+    def flush(self) -> int:
+        """Nothing to flush: every call already reached the store"""
+        return 0
+
+
+def create_chat_store(backend: Optional[str] = None, path: Optional[str] = None,
+                      json_path: Optional[Path] = None):
+    """
+    Chat store for a backend (serves every user; see UserChatStore)
+
+    Args:
+        backend: 'sqlite' or 'json' (default: config.CHAT_STORE_BACKEND)
+        path: sqlite file or per-user JSON folder (default: config.CHAT_STORE_PATH / CHAT_HISTORY_DIR)
+        json_path: Shared legacy JSON history imported into a new sqlite store (default: CHAT_STORAGE_PATH)
+    """
+    backend = (backend or config.CHAT_STORE_BACKEND).lower()
+    if backend == "json":
+        return JSONChatStore(path)
+    if backend != "sqlite":
+        raise ValueError(f"Unknown chat store backend: {backend}")
+    return SQLiteChatStore(path or config.CHAT_STORE_PATH, json_path=json_path or CHAT_STORAGE_PATH)
+
+
+# Singleton instance
+_store_instance = None
+_store_lock = threading.Lock()
+
+
+def _shared_store():
+    global _store_instance
+    if _store_instance is None:
+        with _store_lock:
+            if _store_instance is None:
+                _store_instance = create_chat_store()
+    return _store_instance
+
+
+def get_chat_store(user_id: str = ''):
+    """
+    The shared chat store (configured from config) bound to user_id
+
+    Returns:
+        The user's in-memory WriteBehindChatStore when config.CHAT_WRITE_BEHIND is
+        on, otherwise a UserChatStore that goes to the store on every call
+    """
+    store = _shared_store()
+    if config.CHAT_WRITE_BEHIND:
+        from .chat_cache import get_write_behind_store
+        return get_write_behind_store(store, user_id)
+    return UserChatStore(store, user_id)
+
+
+def assign_legacy_history(email: str, user_id: str) -> int:
+    """
+    Give the sessions imported from the shared chat_history.json to the account
+    named by config.CHAT_LEGACY_OWNER (called on sign-in; a no-op for everyone else)
+
+    Returns:
+        Number of sessions assigned (0 once assigned)
+    """
+    owner = config.CHAT_LEGACY_OWNER
+    if not owner or not user_id or (email or '').strip().lower() != owner:
+        return 0
+    try:
+        moved = _shared_store().assign_unowned_sessions(str(user_id))
+    except (OSError, sqlite3.Error) as e:
+        logger.error(f"Could not assign the legacy chat history to {owner}: {e}")
+        return 0
+    if moved:
+        logger.info(f"Assigned {moved} legacy chat sessions to {owner}")
+        if config.CHAT_WRITE_BEHIND:
+            from .chat_cache import get_write_behind_store
+            get_write_behind_store(_store_instance, str(user_id)).reload()
+    return moved
+
+
+__all__ = [
+    'JSONChatStore', 'SQLiteChatStore', 'UserChatStore',
+    'create_chat_store', 'get_chat_store', 'assign_legacy_history', 'session_cursor', 'apply_ops_to_sessions',
+    'search_terms',
+]
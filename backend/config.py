@@ -9,33 +9,57 @@ sys.path.insert(0, str(parent_dir))
 
 load_dotenv()
 
+
+def _env_float(name: str, default: float) -> float:
+    """Read a float from the environment, falling back to default on bad values"""
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
 # API Configuration
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY", "")
 
 # PDF Configuration - PDFs are in project root
 PDF_DIRECTORY = "data"
 # PDF file paths (relative to project root - auto-discovers)
-PDF_FILES = [
+_PDF_CANDIDATES = [
     os.path.join(parent_dir, "250883_english_01042024.pdf"),  # BNS/Bharatiya Nyaya Sanhita
     os.path.join(parent_dir, "BNS2023.pdf"),
 ]
-# Convert relative paths to absolute paths and verify files exist
-valid_pdf_files = []
-for pdf_path in PDF_FILES:
-    if os.path.isabs(pdf_path):
-        abs_path = pdf_path
-    else:
-        abs_path = os.path.join(parent_dir, pdf_path)
-    
-    if os.path.exists(abs_path):
-        valid_pdf_files.append(abs_path)
-    else:
-        print(f"Warning: PDF file not found: {abs_path}")
-
-PDF_FILES = valid_pdf_files
+_valid_pdf_files = None
+
+
+def get_pdf_files() -> list:
+    """Resolve PDF paths and keep the ones that exist (checked once, on first use)"""
+    global _valid_pdf_files
+    if _valid_pdf_files is None:
+        valid_pdf_files = []
+        for pdf_path in _PDF_CANDIDATES:
+            if os.path.isabs(pdf_path):
+                abs_path = pdf_path
+            else:
+                abs_path = os.path.join(parent_dir, pdf_path)
+
+            if os.path.exists(abs_path):
+                valid_pdf_files.append(abs_path)
+            else:
+                print(f"Warning: PDF file not found: {abs_path}")
+        _valid_pdf_files = valid_pdf_files
+    return _valid_pdf_files
+
+
+def __getattr__(name):
+    # PDF_FILES is resolved lazily so importing config never touches the filesystem
+    if name == "PDF_FILES":
+        return get_pdf_files()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # Vector Store Configuration
 VECTOR_STORE_PATH = os.path.join(parent_dir, "vector_store")
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
 CHUNK_SIZE = 1000
 CHUNK_OVERLAP = 200
 
@@ -47,3 +71,121 @@ MAX_TOKENS = 2048
 # RAG Configuration
 TOP_K_RESULTS = 5
 
+# Session Memory Configuration
+# Budget for per-session user data (excludes the shared RAG chain/models)
+SESSION_MEMORY_BUDGET_BYTES = int(_env_float("SESSION_MEMORY_BUDGET_BYTES", 2 * 1024 * 1024))
+# Seconds between budget checks of one session (each check walks the whole session state)
+SESSION_MEMORY_CHECK_INTERVAL = _env_float("SESSION_MEMORY_CHECK_INTERVAL", 30.0)
+
+# Profiling Configuration
+# Fraction of requests profiled (0.01 = 1%); 0 disables sampling
+PROFILE_SAMPLE_RATE = _env_float("PROFILE_SAMPLE_RATE", 0.0)
+PROFILE_INTERVAL_MS = _env_float("PROFILE_INTERVAL_MS", 5.0)
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(parent_dir, "profiles"))
+# Comma-separated emails that get a "profile my requests" toggle in the sidebar
+PROFILE_ADMIN_EMAILS = [
+    email.strip().lower()
+    for email in os.getenv("PROFILE_ADMIN_EMAILS", "").split(",")
+    if email.strip()
+]
+
+# Translation Cache Configuration
+TRANSLATION_CACHE_MAX_ENTRIES = int(_env_float("TRANSLATION_CACHE_MAX_ENTRIES", 2048))
+TRANSLATION_CACHE_MAX_BYTES = int(_env_float("TRANSLATION_CACHE_MAX_BYTES", 16 * 1024 * 1024))
+# sqlite file shared by all workers; set to an empty string to keep the cache in memory only
+TRANSLATION_CACHE_PATH = os.getenv(
+    "TRANSLATION_CACHE_PATH", os.path.join(parent_dir, "legal_db", "translation_cache.db")
+)
+
+# Translation HTTP Configuration
+TRANSLATION_HTTP_POOL_SIZE = int(_env_float("TRANSLATION_HTTP_POOL_SIZE", 8))
+TRANSLATION_HTTP_TIMEOUT = _env_float("TRANSLATION_HTTP_TIMEOUT", 5.0)
+TRANSLATION_MAX_RETRIES = int(_env_float("TRANSLATION_MAX_RETRIES", 2))
+# Requests per second sent to each translation host (0 disables limiting)
+TRANSLATION_RATE_PER_HOST = _env_float("TRANSLATION_RATE_PER_HOST", 5.0)
+# Parallel translations in batch_translate
+TRANSLATION_MAX_WORKERS = int(_env_float("TRANSLATION_MAX_WORKERS", 4))
+
+# Translation Engine Configuration
+# CPU seq2seq model for offline translation, e.g. facebook/nllb-200-distilled-600M (empty disables)
+LOCAL_TRANSLATION_MODEL = os.getenv("LOCAL_TRANSLATION_MODEL", "")
+# Set to 0 to never call the remote MyMemory API
+TRANSLATION_REMOTE_ENABLED = os.getenv("TRANSLATION_REMOTE_ENABLED", "1").strip().lower() not in ("0", "false", "no")
+
+# Translation Memory Configuration
+# Lowest trigram similarity (0-1) at which a known translation is reused for new text
+TRANSLATION_MEMORY_MIN_SIMILARITY = _env_float("TRANSLATION_MEMORY_MIN_SIMILARITY", 0.9)
+
+# Language Detection Configuration
+# Characters examined by detect_language; 0 scans the whole text
+DETECT_LANGUAGE_MAX_CHARS = int(_env_float("DETECT_LANGUAGE_MAX_CHARS", 4000))
+
+# Cross-Lingual Retrieval Configuration
+# Multilingual embedding model that maps queries in all 12 Indian languages and English
+# statute chunks into one space; e5 models expect "query: " / "passage: " prefixes
+MULTILINGUAL_EMBEDDING_MODEL = os.getenv("MULTILINGUAL_EMBEDDING_MODEL", "intfloat/multilingual-e5-small")
+MULTILINGUAL_QUERY_PREFIX = os.getenv("MULTILINGUAL_QUERY_PREFIX", "query: ")
+MULTILINGUAL_PASSAGE_PREFIX = os.getenv("MULTILINGUAL_PASSAGE_PREFIX", "passage: ")
+MULTILINGUAL_VECTOR_STORE_PATH = os.getenv(
+    "MULTILINGUAL_VECTOR_STORE_PATH", os.path.join(parent_dir, "vector_store_multilingual")
+)
+# Set to 1 to retrieve with the multilingual index (build it with build_multilingual_index.py)
+CROSS_LINGUAL_RETRIEVAL = os.getenv("CROSS_LINGUAL_RETRIEVAL", "0").strip().lower() in ("1", "true", "yes")
+
+# Response Language Routing
+# Languages Gemini answers in directly (comma-separated codes); others are answered in
+# English and translated afterwards. Empty disables native generation.
+NATIVE_GENERATION_LANGUAGES = [
+    code.strip()
+    for code in os.getenv("NATIVE_GENERATION_LANGUAGES", "hi,bn,ta,te,mr,gu,kn,ml,pa,ur,or").split(",")
+    if code.strip()
+]
+# Threads running query pipeline stages, shared by every RAG chain in the process
+PIPELINE_MAX_WORKERS = int(_env_float("PIPELINE_MAX_WORKERS", 16))
+
+# Background Pre-translation
+# Translate each answer into the user's other recently used response languages
+PRETRANSLATE_ENABLED = os.getenv("PRETRANSLATE_ENABLED", "1").strip().lower() not in ("0", "false", "no")
+# Most recent response languages (besides the answer's own) pre-translated per answer
+PRETRANSLATE_MAX_LANGUAGES = int(_env_float("PRETRANSLATE_MAX_LANGUAGES", 2))
+# Queued jobs across all users; the oldest are dropped past this
+PRETRANSLATE_MAX_PENDING = int(_env_float("PRETRANSLATE_MAX_PENDING", 24))
+# Seconds a background job yields to other users' requests in flight before it runs anyway
+PRETRANSLATE_MAX_DEFER = _env_float("PRETRANSLATE_MAX_DEFER", 1.0)
+
+# Canonical Query Caches (keys normalized with multilingual.canonicalize_query)
+# Answers kept per (question, response language, route); 0 disables the answer cache
+ANSWER_CACHE_MAX_ENTRIES = int(_env_float("ANSWER_CACHE_MAX_ENTRIES", 256))
+# Seconds a cached answer is reused (0 = until evicted)
+ANSWER_CACHE_TTL = _env_float("ANSWER_CACHE_TTL", 3600)
+# Query embeddings kept per index; 0 disables the embedding cache
+QUERY_EMBEDDING_CACHE_MAX_ENTRIES = int(_env_float("QUERY_EMBEDDING_CACHE_MAX_ENTRIES", 1024))
+
+# Chat History Storage
+# 'sqlite' (default) or 'json' (the legacy chat_history.json, rewritten on every change)
+CHAT_STORE_BACKEND = os.getenv("CHAT_STORE_BACKEND", "sqlite").strip().lower()
+# SQLite chat store; chat_history.json is imported into it once when it is first created
+CHAT_STORE_PATH = os.getenv("CHAT_STORE_PATH", os.path.join(parent_dir, "legal_db", "chat_history.db"))
+# Email of the account given the sessions of the shared chat_history.json, which are
+# imported without an owner; assigned once, when that account next signs in
+CHAT_LEGACY_OWNER = os.getenv("CHAT_LEGACY_OWNER", "").strip().lower()
+# Per-user chat_history files for the json backend (<user_id>.json)
+CHAT_HISTORY_DIR = os.getenv("CHAT_HISTORY_DIR", os.path.join(parent_dir, "chat_history"))
+# Sessions per page in the sidebar's history list
+CHAT_HISTORY_PAGE_SIZE = int(_env_float("CHAT_HISTORY_PAGE_SIZE", 8))
+# Chunk texts kept for rendering sources of stored chat messages (looked up by chunk id)
+SOURCE_CHUNK_CACHE_SIZE = int(_env_float("SOURCE_CHUNK_CACHE_SIZE", 256))
+# Matching messages listed under the sidebar's chat search box
+CHAT_SEARCH_MAX_RESULTS = int(_env_float("CHAT_SEARCH_MAX_RESULTS", 10))
+# Serve the signed-in user's sessions from memory and write changes behind (1) or go to the store on every call (0)
+CHAT_WRITE_BEHIND = os.getenv("CHAT_WRITE_BEHIND", "1").strip().lower() in ("1", "true", "yes")
+# Seconds between background flushes of journaled chat writes to the store
+CHAT_FLUSH_INTERVAL = _env_float("CHAT_FLUSH_INTERVAL", 2.0)
+# Write-ahead journals of unflushed chat writes, replayed on start after a crash
+CHAT_JOURNAL_DIR = os.getenv("CHAT_JOURNAL_DIR", os.path.join(parent_dir, "legal_db", "chat_journal"))
+# fsync every journal append (survives power loss, costs a disk sync per chat write)
+CHAT_JOURNAL_FSYNC = os.getenv("CHAT_JOURNAL_FSYNC", "0").strip().lower() in ("1", "true", "yes")
+# Users whose sessions stay cached; the least recently active are flushed and dropped
+CHAT_CACHE_MAX_USERS = int(_env_float("CHAT_CACHE_MAX_USERS", 256))
+# Sessions with messages kept in memory per cached user; the least recently opened are dropped
+CHAT_CACHE_MAX_SESSIONS = int(_env_float("CHAT_CACHE_MAX_SESSIONS", 16))
@@ -3,7 +3,8 @@ Language-Specific Prompts and Context Management
 Provides RAG system prompts tailored for different languages
 """
 
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
+from functools import lru_cache
 import sys
 from pathlib import Path
 
@@ -11,6 +12,7 @@ parent_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(parent_dir))
 
 from backend.multilingual import INDIAN_LANGUAGES
+from backend.keyword_matcher import KeywordMatcher, BOUNDARY_PREFIX
 
 
 # System prompts for RAG in different languages
@@ -120,6 +122,37 @@ LEGAL_CONTEXT_MAPPINGS: Dict[str, Dict[str, List[str]]] = {
     },
 }
 
+
+def _build_term_positions() -> Dict[str, Dict[str, Tuple[str, int]]]:
+    """language → lower-cased keyword → (context_type, index) of its first occurrence"""
+    positions = {}
+    for language, contexts in LEGAL_CONTEXT_MAPPINGS.items():
+        lookup = positions.setdefault(language, {})
+        for context_type, keywords in contexts.items():
+            for idx, keyword in enumerate(keywords):
+                lookup.setdefault(keyword.lower(), (context_type, idx))
+    return positions
+
+
+_TERM_POSITIONS = _build_term_positions()
+
+
+@lru_cache(maxsize=None)
+def _context_matcher(language_code: str) -> Tuple[KeywordMatcher, List[Tuple[str, str]]]:
+    """Compiled matcher over one language's context keywords, plus its (context_type, keyword) entries"""
+    entries = [
+        (context_type, keyword)
+        for context_type, keywords in LEGAL_CONTEXT_MAPPINGS[language_code].items()
+        for keyword in keywords
+    ]
+    # Prefix boundaries keep plurals/inflections ("thefts", "अपराधी") but drop "grape"/"discharge"
+    matcher = KeywordMatcher(
+        ((keyword, index) for index, (_, keyword) in enumerate(entries)),
+        boundary=BOUNDARY_PREFIX,
+    )
+    return matcher, entries
+
+
 # Response formatting templates
 RESPONSE_FORMAT_TEMPLATES: Dict[str, Dict[str, str]] = {
     'en': {
@@ -199,16 +232,15 @@ class LanguageSpecificPromptManager:
         Returns:
             Dictionary with identified legal contexts
         """
-        contexts = self.context_mappings.get(language_code, self.context_mappings['en'])
-        query_lower = query.lower()
+        if language_code not in self.context_mappings:
+            language_code = 'en'
+        matcher, entries = _context_matcher(language_code)
 
+        # Matched entry indexes sort back into mapping order
         identified_contexts = {}
-        for context_type, keywords in contexts.items():
-            for keyword in keywords:
-                if keyword.lower() in query_lower:
-                    if context_type not in identified_contexts:
-                        identified_contexts[context_type] = []
-                    identified_contexts[context_type].append(keyword)
+        for index in sorted(matcher.find_values(query)):
+            context_type, keyword = entries[index]
+            identified_contexts.setdefault(context_type, []).append(keyword)
 
         return identified_contexts
 
@@ -255,16 +287,16 @@ class LanguageSpecificPromptManager:
             Translated term or None
         """
         # Try to find in context mappings
-        if from_language in LEGAL_CONTEXT_MAPPINGS:
-            for context_type, keywords in LEGAL_CONTEXT_MAPPINGS[from_language].items():
-                if term.lower() in [k.lower() for k in keywords]:
-                    idx = [k.lower() for k in keywords].index(term.lower())
-                    target_keywords = LEGAL_CONTEXT_MAPPINGS.get(
-                        to_language,
-                        LEGAL_CONTEXT_MAPPINGS['en']
-                    )[context_type]
-                    if idx < len(target_keywords):
-                        return target_keywords[idx]
+        position = _TERM_POSITIONS.get(from_language, {}).get(term.lower())
+        if position is None:
+            return None
+        context_type, idx = position
+        target_keywords = LEGAL_CONTEXT_MAPPINGS.get(
+            to_language,
+            LEGAL_CONTEXT_MAPPINGS['en']
+        )[context_type]
+        if idx < len(target_keywords):
+            return target_keywords[idx]
         return None
 
     def get_language_specific_tips(self, language_code: str) -> List[str]:
@@ -3,7 +3,8 @@ Language Strings and UI Translations
 Provides internationalized strings for the LegalAI application
 """
 
-from typing import Dict, Optional
+from types import MappingProxyType
+from typing import Dict, Iterable, Mapping, Optional
 
 # UI Translation Strings for all supported languages
 LANGUAGE_STRINGS: Dict[str, Dict[str, str]] = {
@@ -340,6 +341,66 @@ HELP_MESSAGES: Dict[str, Dict[str, str]] = {
 }
 
 
+# Category name -> per-language string tables (English is the fallback for every key)
+STRING_CATEGORIES: Dict[str, Dict[str, Dict[str, str]]] = {
+    'general': LANGUAGE_STRINGS,
+    'legal': LEGAL_TERMS,
+    'help': HELP_MESSAGES,
+}
+
+
+def _build_bundles() -> Dict[str, Dict[str, Dict[str, str]]]:
+    """
+    {category: {language: strings}} with English fallbacks already filled in, plus an
+    'all' category merging general, legal and help as get_all_strings always has
+    """
+    languages = list(dict.fromkeys(lang for table in STRING_CATEGORIES.values() for lang in table))
+    bundles = {
+        category: {lang: {**table['en'], **table.get(lang, {})} for lang in languages}
+        for category, table in STRING_CATEGORIES.items()
+    }
+    bundles['all'] = {
+        lang: {key: value for category in STRING_CATEGORIES for key, value in bundles[category][lang].items()}
+        for lang in languages
+    }
+    return bundles
+
+
+# Built once at import and never mutated; callers only ever see read-only views
+_BUNDLES = _build_bundles()
+_BUNDLE_VIEWS: Dict[str, Dict[str, Mapping[str, str]]] = {
+    category: {lang: MappingProxyType(strings) for lang, strings in by_language.items()}
+    for category, by_language in _BUNDLES.items()
+}
+
+
+def get_bundle(language: str = 'en', category: str = 'general') -> Mapping[str, str]:
+    """
+    Read-only strings for a language with English fallbacks resolved
+
+    Args:
+        language: Language code (unknown codes get the English bundle)
+        category: 'general', 'legal', 'help' or 'all' (the three merged)
+
+    Returns:
+        Immutable key -> string mapping, shared between callers
+    """
+    views = _BUNDLE_VIEWS.get(category, _BUNDLE_VIEWS['general'])
+    return views.get(language) or views['en']
+
+
+def get_strings(keys: Iterable[str], language: str = 'en', category: str = 'general') -> Dict[str, str]:
+    """
+    Fetch several strings in one call, e.g. every label a page renders
+
+    Returns:
+        {key: translated string}, with the key itself for unknown keys
+    """
+    bundles = _BUNDLES.get(category, _BUNDLES['general'])
+    bundle = bundles.get(language) or bundles['en']
+    return {key: bundle.get(key, key) for key in keys}
+
+
 def get_string(key: str, language: str = 'en', category: str = 'general') -> str:
     """
     Get translated string for a given key
@@ -352,25 +413,16 @@ def get_string(key: str, language: str = 'en', category: str = 'general') -> str
     Returns:
         Translated string or original key if not found
     """
-    if category == 'general':
-        strings = LANGUAGE_STRINGS.get(language, LANGUAGE_STRINGS['en'])
-        return strings.get(key, LANGUAGE_STRINGS['en'].get(key, key))
-    elif category == 'legal':
-        terms = LEGAL_TERMS.get(language, LEGAL_TERMS['en'])
-        return terms.get(key, LEGAL_TERMS['en'].get(key, key))
-    elif category == 'help':
-        messages = HELP_MESSAGES.get(language, HELP_MESSAGES['en'])
-        return messages.get(key, HELP_MESSAGES['en'].get(key, key))
-    return key
+    bundles = _BUNDLES.get(category)
+    if bundles is None:
+        return key
+    return (bundles.get(language) or bundles['en']).get(key, key)
 
 
 def get_all_strings(language: str = 'en') -> Dict[str, str]:
-    """Get all strings for a language"""
-    strings = LANGUAGE_STRINGS.get(language, LANGUAGE_STRINGS['en'])
-    legal_terms = LEGAL_TERMS.get(language, LEGAL_TERMS['en'])
-    help_messages = HELP_MESSAGES.get(language, HELP_MESSAGES['en'])
-    
-    return {**strings, **legal_terms, **help_messages}
+    """Get all strings for a language (a fresh copy the caller may modify)"""
+    bundles = _BUNDLES['all']
+    return (bundles.get(language) or bundles['en']).copy()
 
 
 def get_supported_languages_list() -> list:
@@ -0,0 +1,189 @@
+"""
+Markdown Segmentation for Translation
+Splits answer markdown into translatable text and protected pieces (answer headings,
+bullets, section numbers, act names) and reassembles translated segments
+"""
+
+import re
+from typing import Callable, Dict, List, NamedTuple
+
+# MyMemory rejects queries longer than 500 bytes; stay under it for UTF-8 text
+MAX_SEGMENT_CHARS = 450
+
+# Bullet / numbering / heading prefix at the start of a line
+_LINE_PREFIX_RE = re.compile(r"^(\s*(?:[-*•]|\d+[.)]|#{1,6})\s+)")
+
+# Acts answers cite by name; left untranslated so they stay searchable and unambiguous
+KNOWN_ACTS = (
+    "Bharatiya Nyaya Sanhita",
+    "Bharatiya Nagarik Suraksha Sanhita",
+    "Bharatiya Sakshya Adhiniyam",
+    "Indian Penal Code",
+    "Code of Criminal Procedure",
+    "Code of Civil Procedure",
+    "Indian Evidence Act",
+    "Constitution of India",
+    "Protection of Women from Domestic Violence Act",
+    "Domestic Violence Act",
+    "Dowry Prohibition Act",
+    "Consumer Protection Act",
+    "Information Technology Act",
+    "Protection of Children from Sexual Offences Act",
+    "Scheduled Castes and the Scheduled Tribes (Prevention of Atrocities) Act",
+    "Narcotic Drugs and Psychotropic Substances Act",
+    "Juvenile Justice (Care and Protection of Children) Act",
+    "Prevention of Corruption Act",
+    "Right to Information Act",
+    "Motor Vehicles Act",
+    "Arms Act",
+    "Hindu Marriage Act",
+    "Special Marriage Act",
+    "Indian Divorce Act",
+    "Hindu Succession Act",
+    "Hindu Adoptions and Maintenance Act",
+    "Maintenance and Welfare of Parents and Senior Citizens Act",
+    "Transfer of Property Act",
+    "Registration Act",
+    "Limitation Act",
+    "Indian Contract Act",
+    "Specific Relief Act",
+    "Negotiable Instruments Act",
+    "Industrial Disputes Act",
+    "Minimum Wages Act",
+    "Payment of Wages Act",
+)
+# Short forms: POCSO Act, IT Act, SC/ST Act ...
+_ACT_ABBREVIATIONS = ("POCSO", "NDPS", "SC/ST", "DV", "IT", "RTI", "MV")
+
+# Answer layout headings that parse_answer_cards relies on: **SUMMARY:**, **KEY POINTS:** ...
+_HEADING_RE = r"\*\*(?:SUMMARY|KEY POINTS?|LEGAL PROVISIONS?|NEXT STEPS?):?\*\*:?"
+# Act names: Bharatiya Nyaya Sanhita, 2023 / Protection of Women from Domestic Violence Act, 2005
+_ACT_RE = (
+    r"\b(?:" + "|".join(re.escape(act) for act in sorted(KNOWN_ACTS, key=len, reverse=True))
+    + r"|(?:" + "|".join(re.escape(abbr) for abbr in _ACT_ABBREVIATIONS) + r")\s+Act)"
+    r"(?:,?\s+\d{4})?\b"
+)
+# Bold spans citing a section, article or act: **Section 318 BNS**, **IPC 420**, **Arms Act**
+_BOLD_CITATION_RE = (
+    r"\*\*[^*\n]*?(?:\b(?:Section|Sections|Sec\.|Article|IPC|BNS|BNSS|BSA|CrPC|CPC)\b"
+    r"|" + _ACT_RE + r")[^*\n]*\*\*:?"
+)
+# Plain-text citations: Section 318(4), Sec. 41A CrPC, IPC 420
+_SECTION_RE = (
+    r"\b(?:Sections?|Sec\.|Article|धारा)\s+\d+[A-Z]?(?:\(\d+\))*"
+    r"(?:\s+(?:of\s+(?:the\s+)?)?(?:IPC|BNS|BNSS|BSA|CrPC|CPC))?"
+    r"|\b(?:IPC|BNS|BNSS|BSA|CrPC|CPC)\s+\d+[A-Z]?(?:\(\d+\))*"
+)
+_PROTECTED_RE = re.compile("|".join([_HEADING_RE, _BOLD_CITATION_RE, _SECTION_RE, _ACT_RE]))
+
+# Sentence boundaries used to split long segments (Latin and Devanagari full stops)
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?।])\s+")
+_HAS_LETTER_RE = re.compile(r"[^\W\d_]", re.UNICODE)
+
+
+class Segment(NamedTuple):
+    """A piece of the document; only translatable segments are sent to the translator"""
+    text: str
+    translatable: bool
+
+
+def _split_long(text: str, max_chars: int) -> List[str]:
+    """Split text into pieces of at most max_chars, preferring sentence then word boundaries"""
+    if len(text) <= max_chars:
+        return [text]
+    pieces = []
+    current = ""
+    for sentence in _SENTENCE_END_RE.split(text):
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(" ", 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(sentence[:cut])
+            sentence = sentence[cut:].lstrip()
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            pieces.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def _add_text(segments: List[Segment], text: str, max_chars: int):
+    """Append free text, keeping surrounding whitespace and letterless runs untranslated"""
+    if not text:
+        return
+    core = text.strip()
+    if not core or not _HAS_LETTER_RE.search(core):
+        segments.append(Segment(text, False))
+        return
+    start = text.index(core)
+    if start:
+        segments.append(Segment(text[:start], False))
+    pieces = _split_long(core, max_chars)
+    for i, piece in enumerate(pieces):
+        if i:
+            segments.append(Segment(" ", False))
+        segments.append(Segment(piece, True))
+    if start + len(core) < len(text):
+        segments.append(Segment(text[start + len(core):], False))
+
+
+def segment_markdown(markdown: str, max_chars: int = MAX_SEGMENT_CHARS) -> List[Segment]:
+    """
+    Split markdown into translatable and protected segments
+
+    Args:
+        markdown: Answer text in the SUMMARY / KEY POINTS / LEGAL PROVISION / NEXT STEPS layout
+        max_chars: Longest translatable segment (longer text is split at sentences)
+
+    Returns:
+        Segments whose concatenated text equals the input
+    """
+    segments: List[Segment] = []
+    for line in markdown.splitlines(keepends=True):
+        body = line.rstrip("\r\n")
+        newline = line[len(body):]
+
+        prefix = _LINE_PREFIX_RE.match(body)
+        if prefix:
+            segments.append(Segment(prefix.group(1), False))
+            body = body[prefix.end():]
+
+        position = 0
+        for match in _PROTECTED_RE.finditer(body):
+            _add_text(segments, body[position:match.start()], max_chars)
+            segments.append(Segment(match.group(0), False))
+            position = match.end()
+        _add_text(segments, body[position:], max_chars)
+
+        if newline:
+            segments.append(Segment(newline, False))
+    return segments
+
+
+def translate_segments(
+    segments: List[Segment],
+    translate_batch: Callable[[List[str]], List[str]]
+) -> str:
+    """
+    Translate translatable segments and reassemble the document
+
+    Args:
+        segments: Output of segment_markdown
+        translate_batch: Translates a list of distinct texts, preserving order
+
+    Returns:
+        Reassembled markdown
+    """
+    unique_texts = list(dict.fromkeys(s.text for s in segments if s.translatable))
+    translations: Dict[str, str] = {}
+    if unique_texts:
+        translations = dict(zip(unique_texts, translate_batch(unique_texts)))
+    return "".join(translations.get(s.text, s.text) if s.translatable else s.text for s in segments)
+
+
+__all__ = ['MAX_SEGMENT_CHARS', 'KNOWN_ACTS', 'Segment', 'segment_markdown', 'translate_segments']
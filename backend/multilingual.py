@@ -4,13 +4,33 @@ Handles speech-to-text, text-to-speech, and translation for Indian languages
 """
 
 import os
+import re
 import sys
 import tempfile
+import unicodedata
+import time
 import logging
+import importlib.util
 from typing import Optional, Dict, List, Tuple
 from enum import Enum
+from types import MappingProxyType
 from functools import lru_cache
 
+from . import config
+from .translation_cache import TranslationCache, get_translation_cache
+from .translation_client import get_translation_client
+from .markdown_segments import segment_markdown, translate_segments
+from .translation_memory import TranslationMemory, get_translation_memory
+from .translation_engines import (
+    TranslationEngine,
+    LocalModelEngine,
+    MyMemoryEngine,
+    DictionaryEngine,
+    EngineStats,
+)
+from .pipeline import get_shared_executor
+from .profiling import with_request_profile
+
 # Setup logging
 logger = logging.getLogger(__name__)
 
@@ -20,12 +40,12 @@ Translator = None
 LANGUAGES = {}
 
 # Try MyMemory API (free, no key needed)
-try:
-    import requests
+# Only check availability here; requests is imported on first translation
+if importlib.util.find_spec("requests") is not None:
     requests_available = True
     translator_available = True
     logger.info("✓ Using MyMemory Translation API (Free)")
-except ImportError:
+else:
     requests_available = False
     logger.warning("requests library not available - translation limited to dictionary")
 
@@ -179,31 +199,220 @@ INDIAN_LANGUAGES = {
 }
 
 
+# Read-only lookup indexes over INDIAN_LANGUAGES, built once at import
+def _build_language_indexes():
+    by_code = {}
+    code_by_name = {}
+    voice_by_key = {}
+    options = []
+    for key, info in INDIAN_LANGUAGES.items():
+        by_code.setdefault(info['code'], MappingProxyType(dict(info)))
+        for name in (key, info['name'], info['native_name']):
+            code_by_name.setdefault(name.lower(), info['code'])
+        voice_by_key[key] = info.get('voice_code', 'en-IN')
+        if info.get('supported'):
+            options.append((f"{info['flag']} {info['name']}", key))
+    return (
+        MappingProxyType(by_code),
+        MappingProxyType(code_by_name),
+        MappingProxyType(voice_by_key),
+        tuple(sorted(options, key=lambda x: x[1])),
+    )
+
+
+# code → language info, any key/name/native name (lower-cased) → code,
+# language key → voice code, and (display_name, key) selector options sorted by key
+LANGUAGES_BY_CODE, LANGUAGE_CODE_BY_NAME, VOICE_CODE_BY_KEY, LANGUAGE_SELECTOR_OPTIONS = _build_language_indexes()
+
+
+# Unicode blocks used for script detection: (first, last) code point → language
+SCRIPT_RANGES: List[Tuple[Tuple[int, int], str, str]] = [
+    ((0x0900, 0x097F), 'hi', 'Hindi'),      # Devanagari: Hindi, Marathi, Sanskrit
+    ((0x0980, 0x09FF), 'bn', 'Bengali'),    # Bengali, Assamese
+    ((0x0A00, 0x0A7F), 'pa', 'Punjabi'),    # Gurmukhi
+    ((0x0A80, 0x0AFF), 'gu', 'Gujarati'),
+    ((0x0B00, 0x0B7F), 'or', 'Odia'),
+    ((0x0B80, 0x0BFF), 'ta', 'Tamil'),
+    ((0x0C00, 0x0C7F), 'te', 'Telugu'),
+    ((0x0C80, 0x0CFF), 'kn', 'Kannada'),
+    ((0x0D00, 0x0D7F), 'ml', 'Malayalam'),
+    ((0x0600, 0x06FF), 'ur', 'Urdu'),       # Arabic script
+    ((0x0021, 0x007E), 'en', 'English'),    # Printable ASCII
+]
+
+
+def _build_script_table() -> Tuple[Dict[int, Optional[str]], Tuple[str, ...]]:
+    """
+    str.translate table mapping each script's code points to a one-character marker.
+    Markers are control characters, which the table itself deletes from the input,
+    so a marker in the output always comes from a mapped script.
+    """
+    markers = tuple(chr(1 + i) for i in range(len(SCRIPT_RANGES)))
+    table: Dict[int, Optional[str]] = {code: None for code in range(0x21)}
+    table[0x7F] = None
+    for marker, ((first, last), _, _) in zip(markers, SCRIPT_RANGES):
+        for code in range(first, last + 1):
+            table[code] = marker
+    return table, markers
+
+
+_SCRIPT_TABLE, _SCRIPT_MARKERS = _build_script_table()
+
+
+# ---------------- query canonicalization ----------------
+
+# First code point of each script's 0-9 digit run (Devanagari ० … Urdu ۰, fullwidth ０)
+_DIGIT_ZEROS = (0x0660, 0x06F0, 0x0966, 0x09E6, 0x0A66, 0x0AE6, 0x0B66, 0x0BE6, 0x0C66,
+                0x0CE6, 0x0D66, 0xFF10)
+# Zero-width characters that change the bytes of a query but not its meaning
+_ZERO_WIDTH = "\u200b\u200c\u200d\u2060\ufeff\u00ad"
+# Typographic punctuation folded to ASCII
+_PUNCT_FOLD = {"\u2018": "'", "\u2019": "'", "\u201c": '"', "\u201d": '"', "\u2013": "-",
+               "\u2014": "-", "\u00a0": " ", "\u0964": ".", "\u0965": ".", "\u06d4": ".", "\u061f": "?"}
+
+
+def _build_canonical_table() -> Dict[int, Optional[str]]:
+    table: Dict[int, Optional[str]] = {ord(char): None for char in _ZERO_WIDTH}
+    for zero in _DIGIT_ZEROS:
+        for digit in range(10):
+            table[zero + digit] = str(digit)
+    table.update({ord(char): value for char, value in _PUNCT_FOLD.items()})
+    return table
+
+
+_CANONICAL_TABLE = _build_canonical_table()
+
+# Word characters including Indic/Arabic-script letters and combining marks
+_W = r"[\w\u0600-\u06ff\u0900-\u0dff]"
+
+
+def _term(pattern: str) -> str:
+    return rf"(?<!{_W})(?:{pattern})(?!{_W})"
+
+
+# (pattern, canonical) applied to the case-folded, digit-folded query, in order
+_ACT_ALIASES = [
+    (r"indian penal code|i\.?\s?p\.?\s?c\.?|आईपीसी|भारतीय दंड संहिता", "ipc"),
+    (r"code of criminal procedure|cr\.?\s?p\.?\s?c\.?|सीआरपीसी|दंड प्रक्रिया संहिता", "crpc"),
+    (r"bharatiya nagarik suraksha sanhita|b\.?\s?n\.?\s?s\.?\s?s\.?|बीएनएसएस", "bnss"),
+    (r"bharatiya nyaya sanhita|b\.?\s?n\.?\s?s\.?|बीएनएस|भारतीय न्याय संहिता", "bns"),
+    (r"bharatiya sakshya adhiniyam|b\.?\s?s\.?\s?a\.?", "bsa"),
+]
+_ACT_ALIASES = [(re.compile(_term(pattern)), canonical) for pattern, canonical in _ACT_ALIASES]
+_ACTS = "ipc|crpc|bnss|bns|bsa"
+
+# "Section" in English abbreviations and the Indian languages
+_SECTION_RE = re.compile(_term(
+    r"under\s+section|u/s\.?|sections?|sec\.|sec|s\.(?=\s*\d)"
+    r"|धारा|दफा|कलम|ধারা|ਧਾਰਾ|કલમ|ଧାରା|பிரிவு|సెక్షన్|ವಿಭಾಗ|വകുപ്പ്|دفعہ"
+))
+_SECTION_NUMBER = r"\d+[a-z]?(?:\(\d+\))*"
+# Without the word "section" a 4-digit 18xx-20xx number next to an act is its year ("IPC 1860")
+_BARE_SECTION_NUMBER = rf"(?!(?:18|19|20)\d\d\b){_SECTION_NUMBER}"
+# Every spelling of a section citation → "section 420 ipc"
+_CITATION_RES = [
+    # section 420 of (the) ipc / section 420 ipc
+    (re.compile(rf"section\s*({_SECTION_NUMBER})\s+(?:of\s+(?:the\s+)?)?({_ACTS})\b"), r"section \1 \2"),
+    # ipc (की/के/का) section 420 / ipc section 420
+    (re.compile(rf"\b({_ACTS})\s+(?:(?:की|के|का)\s+)?section\s*({_SECTION_NUMBER})"), r"section \2 \1"),
+    # ipc 420 / 420 ipc
+    (re.compile(rf"\b({_ACTS})\s+({_BARE_SECTION_NUMBER})(?!\w)"), r"section \2 \1"),
+    (re.compile(rf"(?<![\w(])(?<!section )({_BARE_SECTION_NUMBER})\s+({_ACTS})\b"), r"section \1 \2"),
+]
+_CITATION_SPACE_RE = re.compile(r"section\s*(\d)")
+# Sentence punctuation (but not a dot inside a number), collapsed to one space
+_PUNCT_RE = re.compile(r"[?!,;:\"'`]+|\.(?!\d)")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def canonicalize_query(text: str) -> str:
+    """
+    Canonical form of a query or text used as a cache key
+
+    NFC-normalizes (so precomposed and decomposed nukta forms agree), drops zero-width
+    joiners, folds Indic/Arabic/fullwidth digits to ASCII, case-folds, maps act and
+    section spellings to one form ("IPC 420", "धारा 420 आईपीसी", "u/s 420 I.P.C." →
+    "section 420 ipc") and collapses punctuation and whitespace.
+
+    Only used for keys: the text that is translated or embedded is left as typed.
+    """
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFC", text).translate(_CANONICAL_TABLE).casefold()
+    for pattern, canonical in _ACT_ALIASES:
+        text = pattern.sub(canonical, text)
+    text = _SECTION_RE.sub("section", text)
+    text = _CITATION_SPACE_RE.sub(r"section \1", text)
+    for pattern, replacement in _CITATION_RES:
+        text = pattern.sub(replacement, text)
+    text = _PUNCT_RE.sub(" ", text)
+    return _SPACE_RE.sub(" ", text).strip()
+
+
 class MultilingualProcessor:
     """
     Main class for handling multilingual operations
     Supports translation, language detection, and formatting
     """
 
-    def __init__(self):
-        """Initialize the multilingual processor"""
+    def __init__(
+        self,
+        translation_cache: Optional[TranslationCache] = None,
+        engines: Optional[List[TranslationEngine]] = None,
+        translation_memory: Optional[TranslationMemory] = None
+    ):
+        """
+        Initialize the multilingual processor
+
+        Args:
+            translation_cache: Cache to use (default: the shared, persistent cache)
+            engines: Translation engines in priority order (default: local → MyMemory → dictionary)
+            translation_memory: Memory of known translations (default: shared, seeded from curated strings)
+        """
         self.translator = None
-        self.cache_size = 128
-        self.translation_cache = {}
+        if translation_cache is None:
+            translation_cache = get_translation_cache()
+        self.translation_cache = translation_cache
+        if translation_memory is None:
+            translation_memory = get_translation_memory()
+        self.translation_memory = translation_memory
+        self.engines = engines if engines is not None else self._default_engines()
+        self.engine_stats = EngineStats()
+
+    def _default_engines(self) -> List[TranslationEngine]:
+        """Local offline model first (if configured), then the remote API, then the dictionary"""
+        engines = []
+        if config.LOCAL_TRANSLATION_MODEL:
+            engines.append(LocalModelEngine(config.LOCAL_TRANSLATION_MODEL))
+        if config.TRANSLATION_REMOTE_ENABLED:
+            # Late-bound so _translate_mymemory can be swapped on an instance
+            engines.append(MyMemoryEngine(
+                lambda text, source, target: self._translate_mymemory(text, source, target),
+                is_available=lambda: requests_available
+            ))
+        engines.append(DictionaryEngine(self._translate_dictionary))
+        return engines
 
     def translate_text(
         self,
         text: str,
         source_lang: str = 'auto',
-        target_lang: str = 'en'
+        target_lang: str = 'en',
+        canonical: bool = False,
+        allow_fallback: bool = True
     ) -> Tuple[str, bool]:
         """
-        Translate text using MyMemory API or dictionary fallback
+        Translate text: cache, then translation memory, then each engine in priority order
         
         Args:
             text: Text to translate
             source_lang: Source language code (default: 'auto' for auto-detect)
             target_lang: Target language code (default: 'en')
+            canonical: Cache under canonicalize_query(text), so differently written forms
+                of the same question share a translation (for queries, not answer text)
+            allow_fallback: Count a last-resort engine's result (persist_results False,
+                e.g. word-by-word dictionary) as a success; otherwise it is still
+                returned, but with success False
             
         Returns:
             Tuple of (translated_text, success_flag)
@@ -216,53 +425,57 @@ class MultilingualProcessor:
         target_code = self._get_lang_code(target_lang)
 
         # Check cache first
-        cache_key = f"{source_code}_{target_code}_{text[:50]}"
-        if cache_key in self.translation_cache:
-            return self.translation_cache[cache_key], True
+        key_text = canonicalize_query(text) if canonical else None
+        start = time.perf_counter()
+        cached = self.translation_cache.lookup(text, source_code, target_code, key_text=key_text)
+        self.engine_stats.record("cache", time.perf_counter() - start, cached is not None)
+        if cached is not None:
+            translated, fallback = cached
+            return translated, allow_fallback or not fallback
 
         # If source and target are same, return original
         if source_code == target_code:
             return text, True
 
-        # Try MyMemory API first (free, no key needed)
-        if requests_available:
+        # Curated and previously verified translations, exact or near-identical
+        start = time.perf_counter()
+        match = self.translation_memory.lookup(text, source_code, target_code)
+        self.engine_stats.record("memory", time.perf_counter() - start, match is not None)
+        if match is not None:
+            self.translation_cache.put(text, source_code, target_code, match[0], persist=False, key_text=key_text)
+            return match[0], True
+
+        for engine in self.engines:
+            if not engine.available():
+                continue
+            start = time.perf_counter()
             try:
-                translated = self._translate_mymemory(text, source_code, target_code)
-                if translated and translated != text:
-                    self.translation_cache[cache_key] = translated
-                    logger.info(f"✓ Translated {source_code}→{target_code} via MyMemory API")
-                    return translated, True
+                translated = engine.translate(text, source_code, target_code)
             except Exception as e:
-                logger.debug(f"MyMemory API failed: {e}")
-
-        # Fallback to dictionary-based translation
-        try:
-            translated = self._translate_dictionary(text, source_code, target_code)
-            self.translation_cache[cache_key] = translated
-            logger.info(f"✓ Translated {source_code}→{target_code} via dictionary fallback")
-            return translated, True
-        except Exception as e:
-            logger.warning(f"Translation fallback failed: {e}")
-            return text, False
+                logger.debug(f"{engine.name} translation failed: {e}")
+                translated = None
+            self.engine_stats.record(engine.name, time.perf_counter() - start, translated is not None)
+            if translated is not None:
+                # Low-quality engines stay out of the shared file so a better result can replace them
+                self.translation_cache.put(
+                    text, source_code, target_code, translated,
+                    key_text=key_text, fallback=not engine.persist_results
+                )
+                if engine.persist_results:
+                    self.translation_memory.add(text, translated, source_code, target_code)
+                logger.info(f"✓ Translated {source_code}→{target_code} via {engine.name}")
+                return translated, allow_fallback or engine.persist_results
+
+        logger.warning(f"No translation engine could translate {source_code}→{target_code}")
+        return text, False
+
+    def get_engine_report(self) -> List[Dict]:
+        """Per-engine latency and share of translations served (cache included)"""
+        return self.engine_stats.report()
 
     def _translate_mymemory(self, text: str, source_lang: str, target_lang: str) -> str:
-        """Translate using free MyMemory API"""
-        try:
-            import requests
-            url = "https://api.mymemory.translated.net/get"
-            params = {
-                'q': text,
-                'langpair': f'{source_lang}|{target_lang}'
-            }
-            response = requests.get(url, params=params, timeout=5)
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('responseStatus') == 200:
-                    translated = data['responseData'].get('translatedText', text)
-                    return translated
-        except Exception as e:
-            logger.debug(f"MyMemory API error: {e}")
-        return text
+        """Translate using free MyMemory API over the shared pooled client"""
+        return get_translation_client().translate_mymemory(text, source_lang, target_lang)
 
     def _translate_dictionary(self, text: str, source_lang: str, target_lang: str) -> str:
         """Fallback dictionary-based translation"""
@@ -282,12 +495,13 @@ class MultilingualProcessor:
         # For other cases, return original text
         return text
 
-    def detect_language(self, text: str) -> Tuple[str, str, float]:
+    def detect_language(self, text: str, max_chars: Optional[int] = None) -> Tuple[str, str, float]:
         """
         Detect the language of the input text using character patterns
         
         Args:
             text: Text to detect language for
+            max_chars: Only look at the first N characters (None: config default, 0: whole text)
             
         Returns:
             Tuple of (language_code, language_name, confidence)
@@ -295,78 +509,33 @@ class MultilingualProcessor:
         if not text or text.strip() == '':
             return 'en', 'English', 0.0
 
-        # Character ranges for different scripts
-        devanagari_range = range(0x0900, 0x097F)  # Hindi, Marathi, Sanskrit
-        bengali_range = range(0x0980, 0x09FF)     # Bengali, Assamese, Odia
-        gurmukhi_range = range(0x0A00, 0x0A7F)   # Punjabi
-        gujarati_range = range(0x0A80, 0x0AFF)   # Gujarati
-        oriya_range = range(0x0B00, 0x0B7F)      # Odia
-        tamil_range = range(0x0B80, 0x0BFF)      # Tamil
-        telugu_range = range(0x0C60, 0x0C7F)     # Telugu
-        kannada_range = range(0x0C80, 0x0CFF)    # Kannada
-        malayalam_range = range(0x0D00, 0x0D7F)  # Malayalam
-        arabic_range = range(0x0600, 0x06FF)     # Urdu, Arabic
-
-        # Count characters in each script
-        char_counts = {
-            'devanagari': 0, 'bengali': 0, 'gurmukhi': 0, 'gujarati': 0,
-            'oriya': 0, 'tamil': 0, 'telugu': 0, 'kannada': 0, 'malayalam': 0,
-            'arabic': 0, 'latin': 0
-        }
-
-        for char in text:
-            code = ord(char)
-            if code in devanagari_range:
-                char_counts['devanagari'] += 1
-            elif code in bengali_range:
-                char_counts['bengali'] += 1
-            elif code in gurmukhi_range:
-                char_counts['gurmukhi'] += 1
-            elif code in gujarati_range:
-                char_counts['gujarati'] += 1
-            elif code in oriya_range:
-                char_counts['oriya'] += 1
-            elif code in tamil_range:
-                char_counts['tamil'] += 1
-            elif code in telugu_range:
-                char_counts['telugu'] += 1
-            elif code in kannada_range:
-                char_counts['kannada'] += 1
-            elif code in malayalam_range:
-                char_counts['malayalam'] += 1
-            elif code in arabic_range:
-                char_counts['arabic'] += 1
-            elif 32 <= code <= 126:  # ASCII letters
-                char_counts['latin'] += 1
-
-        # Map script to language
-        script_to_lang = {
-            'devanagari': ('hi', 'Hindi'),
-            'bengali': ('bn', 'Bengali'),
-            'gurmukhi': ('pa', 'Punjabi'),
-            'gujarati': ('gu', 'Gujarati'),
-            'oriya': ('or', 'Odia'),
-            'tamil': ('ta', 'Tamil'),
-            'telugu': ('te', 'Telugu'),
-            'kannada': ('kn', 'Kannada'),
-            'malayalam': ('ml', 'Malayalam'),
-            'arabic': ('ur', 'Urdu'),
-            'latin': ('en', 'English'),
-        }
-
-        # Find the script with most characters
-        max_script = max(char_counts, key=char_counts.get)
-        max_count = char_counts[max_script]
+        if max_chars is None:
+            max_chars = config.DETECT_LANGUAGE_MAX_CHARS
+        if max_chars and len(text) > max_chars:
+            # The script of a long paste is settled well within its first few KB
+            text = text[:max_chars]
+
+        # One C-level pass maps every character to its script marker (whitespace/controls dropped)
+        mapped = text.translate(_SCRIPT_TABLE)
+        total_chars = len(mapped)
+        if total_chars == 0:
+            return 'en', 'English', 0.0
+
+        # Find the script with most characters (ties go to the earlier script)
+        max_index, max_count = 0, 0
+        for index, marker in enumerate(_SCRIPT_MARKERS):
+            count = mapped.count(marker)
+            if count > max_count:
+                max_index, max_count = index, count
 
         if max_count == 0:
             # No characters detected, assume English
             return 'en', 'English', 0.0
 
         # Calculate confidence
-        total_chars = len([c for c in text if ord(c) > 32])
-        confidence = max_count / total_chars if total_chars > 0 else 0.0
+        confidence = max_count / total_chars
 
-        lang_code, lang_name = script_to_lang[max_script]
+        _, lang_code, lang_name = SCRIPT_RANGES[max_index]
         logger.info(f"✓ Detected language: {lang_name} ({lang_code}) with confidence {confidence:.2f}")
         
         return lang_code, lang_name, confidence
@@ -402,12 +571,7 @@ class MultilingualProcessor:
         Returns:
             Formatted text
         """
-        lang_info = None
-        for key, info in INDIAN_LANGUAGES.items():
-            if info['code'] == lang_code:
-                lang_info = info
-                break
-
+        lang_info = LANGUAGES_BY_CODE.get(lang_code)
         if not lang_info:
             return text
 
@@ -430,21 +594,15 @@ class MultilingualProcessor:
         if len(lang_identifier) == 2:
             return lang_identifier.lower()
 
-        # Check if it's a language name
-        for key, info in INDIAN_LANGUAGES.items():
-            if lang_identifier.lower() == key or \
-               lang_identifier.lower() == info['name'].lower() or \
-               lang_identifier.lower() == info['native_name'].lower():
-                return info['code']
-
-        # Default to English
-        return 'en'
+        # Check if it's a language name, default to English
+        return LANGUAGE_CODE_BY_NAME.get(lang_identifier.lower(), 'en')
 
     def batch_translate(
         self,
         texts: List[str],
         source_lang: str = 'auto',
-        target_lang: str = 'en'
+        target_lang: str = 'en',
+        allow_fallback: bool = True
     ) -> Tuple[List[str], bool]:
         """
         Translate multiple texts at once
@@ -453,20 +611,79 @@ class MultilingualProcessor:
             texts: List of texts to translate
             source_lang: Source language code
             target_lang: Target language code
+            allow_fallback: See translate_text
             
         Returns:
-            Tuple of (translated_texts, success_flag)
+            Tuple of (translated_texts, success_flag), success only if every text succeeded
         """
         try:
-            translated_texts = []
-            for text in texts:
-                translated, _ = self.translate_text(text, source_lang, target_lang)
-                translated_texts.append(translated)
-            return translated_texts, True
+            if not texts:
+                return [], True
+            # Translate each distinct text once; cached ones inline, the rest in parallel
+            unique_texts = list(dict.fromkeys(texts))
+            source_code = self._get_lang_code(source_lang)
+            target_code = self._get_lang_code(target_lang)
+            pending = [
+                text for text in unique_texts
+                if not self.translation_cache.contains(text, source_code, target_code)
+            ]
+            translated = {}
+            if len(pending) > 1:
+                # Process-wide pool, separate from "answer-translate" whose tasks call this
+                executor = get_shared_executor("translate", config.TRANSLATION_MAX_WORKERS)
+                translate = with_request_profile(
+                    lambda text: self.translate_text(text, source_lang, target_lang, allow_fallback=allow_fallback)
+                )
+                translated = dict(zip(pending, executor.map(translate, pending)))
+            for text in unique_texts:
+                if text not in translated:
+                    translated[text] = self.translate_text(
+                        text, source_lang, target_lang, allow_fallback=allow_fallback
+                    )
+            success = all(ok for _, ok in translated.values())
+            return [translated[text][0] for text in texts], success
         except Exception as e:
             logger.error(f"Batch translation error: {e}")
             return texts, False
 
+    def translate_markdown(
+        self,
+        text: str,
+        source_lang: str = 'en',
+        target_lang: str = 'en',
+        allow_fallback: bool = True
+    ) -> Tuple[str, bool]:
+        """
+        Translate markdown segment by segment, keeping its structure
+
+        Answer headings, bullets, section numbers and act names are left as-is;
+        each text segment is cached on its own, so repeated boilerplate is only
+        translated once.
+
+        Args:
+            text: Markdown to translate
+            source_lang: Source language code
+            target_lang: Target language code
+            allow_fallback: See translate_text; pass False before storing the result
+
+        Returns:
+            Tuple of (translated_markdown, success_flag), success only if every segment succeeded
+        """
+        if not text or text.strip() == '':
+            return text, True
+        if self._get_lang_code(source_lang) == self._get_lang_code(target_lang):
+            return text, True
+
+        success = True
+
+        def translate_batch(texts: List[str]) -> List[str]:
+            nonlocal success
+            translated, ok = self.batch_translate(texts, source_lang, target_lang, allow_fallback=allow_fallback)
+            success = success and ok
+            return translated
+
+        return translate_segments(segment_markdown(text), translate_batch), success
+
     def get_language_selector_options(self) -> List[Tuple[str, str]]:
         """
         Get formatted options for language selector UI
@@ -474,26 +691,15 @@ class MultilingualProcessor:
         Returns:
             List of (display_name, language_key) tuples
         """
-        options = []
-        for key, info in INDIAN_LANGUAGES.items():
-            if info.get('supported'):
-                display_name = f"{info['flag']} {info['name']}"
-                options.append((display_name, key))
-        return sorted(options, key=lambda x: x[1])
+        return list(LANGUAGE_SELECTOR_OPTIONS)
 
     def get_voice_code_for_language(self, lang_key: str) -> str:
         """Get the voice code for a language"""
-        lang_info = self.get_language_info(lang_key)
-        if lang_info:
-            return lang_info.get('voice_code', 'en-IN')
-        return 'en-IN'
+        return VOICE_CODE_BY_KEY.get(lang_key.lower(), 'en-IN')
 
     def validate_language_code(self, lang_code: str) -> bool:
         """Check if a language code is supported"""
-        for info in INDIAN_LANGUAGES.values():
-            if info['code'] == lang_code:
-                return True
-        return False
+        return lang_code in LANGUAGES_BY_CODE
 
 
 # Singleton instance
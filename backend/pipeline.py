@@ -0,0 +1,423 @@
+"""
+Pipeline Executor
+Small dependency-graph executor with per-stage timing, and the multilingual query
+pipeline built on it (detect → translate query → search → generate → translate answer)
+"""
+
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from . import config
+from .profiling import with_request_profile
+
+logger = logging.getLogger(__name__)
+
+
+class Stage(NamedTuple):
+    """A unit of work; fn receives the results of deps (stages or run inputs) as keyword arguments"""
+    name: str
+    fn: Callable[..., Any]
+    deps: Sequence[str] = ()
+    optional: bool = False  # a failure yields None instead of failing the run
+
+
+class PipelineError(RuntimeError):
+    """A required stage raised; the original exception is chained"""
+
+    def __init__(self, stage: str, error: BaseException):
+        super().__init__(f"Pipeline stage '{stage}' failed: {error}")
+        self.stage = stage
+        self.error = error
+
+
+class PipelineRun(NamedTuple):
+    """Stage results plus timings: {stage: {"start_ms", "end_ms", "ms"}} relative to run start"""
+    results: Dict[str, Any]
+    timings: Dict[str, Dict[str, float]]
+    total_ms: float
+
+
+class Pipeline:
+    """
+    Runs stages as soon as their dependencies are done, independent stages in parallel.
+
+    The executor is created once and reused across runs; run() may be called from
+    several threads at once. With parallel=False the same graph runs in the calling
+    thread in declaration order, which is the baseline the parallel run is measured against.
+    """
+
+    def __init__(
+        self,
+        stages: Iterable[Stage],
+        max_workers: int = 4,
+        parallel: bool = True,
+        executor: Optional[ThreadPoolExecutor] = None
+    ):
+        """
+        Args:
+            stages: Stages in a valid topological order (deps declared before use)
+            max_workers: Threads shared by all runs
+            parallel: Overlap independent stages (False runs them one by one)
+            executor: Pool shared with other pipelines (e.g. get_shared_executor()),
+                used instead of one of its own and left running by shutdown()
+        """
+        self.stages = list(stages)
+        self.parallel = parallel
+        self.max_workers = max_workers
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._executor_lock = threading.Lock()
+
+        names = set()
+        for stage in self.stages:
+            if stage.name in names:
+                raise ValueError(f"Duplicate stage: {stage.name}")
+            names.add(stage.name)
+        self._names = names
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="pipeline"
+                    )
+        return self._executor
+
+    def _call(self, stage: Stage, values: Dict[str, Any], origin: float, timings: Dict):
+        start = time.perf_counter()
+        try:
+            return stage.fn(**{dep: values[dep] for dep in stage.deps})
+        finally:
+            end = time.perf_counter()
+            timings[stage.name] = {
+                "start_ms": (start - origin) * 1000,
+                "end_ms": (end - origin) * 1000,
+                "ms": (end - start) * 1000,
+            }
+
+    def _finish(self, stage: Stage, error: BaseException, values: Dict[str, Any]):
+        if not stage.optional:
+            raise PipelineError(stage.name, error) from error
+        logger.debug(f"Optional stage {stage.name} failed: {error}")
+        values[stage.name] = None
+
+    def run(self, **inputs) -> PipelineRun:
+        """
+        Execute the graph
+
+        Args:
+            **inputs: Values that stages may list as dependencies
+
+        Returns:
+            PipelineRun with every stage's result
+
+        Raises:
+            PipelineError: A required stage raised (running stages are left to finish)
+        """
+        for stage in self.stages:
+            missing = [dep for dep in stage.deps if dep not in self._names and dep not in inputs]
+            if missing:
+                raise ValueError(f"Stage {stage.name} depends on unknown {missing}")
+
+        values: Dict[str, Any] = dict(inputs)
+        timings: Dict[str, Dict[str, float]] = {}
+        origin = time.perf_counter()
+
+        if not self.parallel:
+            for stage in self.stages:
+                try:
+                    values[stage.name] = self._call(stage, values, origin, timings)
+                except Exception as e:
+                    self._finish(stage, e, values)
+            return PipelineRun(values, timings, (time.perf_counter() - origin) * 1000)
+
+        executor = self._get_executor()
+        remaining = list(self.stages)
+        running = {}
+        while remaining or running:
+            for stage in [s for s in remaining if all(dep in values for dep in s.deps)]:
+                remaining.remove(stage)
+                running[executor.submit(with_request_profile(self._call), stage, values, origin, timings)] = stage
+            if not running:
+                raise ValueError(f"Unsatisfiable dependencies: {[s.name for s in remaining]}")
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                try:
+                    values[stage.name] = future.result()
+                except Exception as e:
+                    self._finish(stage, e, values)
+        return PipelineRun(values, timings, (time.perf_counter() - origin) * 1000)
+
+    def shutdown(self):
+        if self._executor is not None and self._owns_executor:
+            self._executor.shutdown(wait=False)
+
+
+_shared_executors: Dict[str, ThreadPoolExecutor] = {}
+_shared_executors_lock = threading.Lock()
+
+
+def get_shared_executor(name: str, max_workers: int) -> ThreadPoolExecutor:
+    """
+    Get or create the process-wide thread pool called name
+
+    Pipelines built per RAG chain share these instead of each starting threads
+    that are never shut down. The first caller sets the pool's size.
+    """
+    executor = _shared_executors.get(name)
+    if executor is None:
+        with _shared_executors_lock:
+            executor = _shared_executors.get(name)
+            if executor is None:
+                executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix=name)
+                _shared_executors[name] = executor
+    return executor
+
+
+# ---------------- multilingual query pipeline ----------------
+
+# How the answer reached the response language
+ROUTE_ENGLISH = "english"        # English requested, English generated
+ROUTE_NATIVE = "native"          # generated directly in the response language
+ROUTE_TRANSLATED = "translated"  # generated in English, translated afterwards
+
+
+def _source_key(doc) -> Any:
+    metadata = getattr(doc, "metadata", {}) or {}
+    if metadata.get("chunk_index") is not None:
+        return metadata.get("source"), metadata.get("chunk_index")
+    return getattr(doc, "page_content", "")
+
+
+def merge_sources(*result_lists: Optional[List], k: int) -> List:
+    """First k distinct documents across result lists, earlier lists first"""
+    merged, seen = [], set()
+    for docs in result_lists:
+        for doc in docs or ():
+            key = _source_key(doc)
+            if key not in seen:
+                seen.add(key)
+                merged.append(doc)
+    return merged[:k]
+
+
+def iter_complete_lines(chunks: Iterable[str]) -> Iterator[str]:
+    """Regroup streamed text chunks into complete lines (newline kept), flushing the tail"""
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        while "\n" in buffer:
+            line, buffer = buffer.split("\n", 1)
+            yield line + "\n"
+    if buffer:
+        yield buffer
+
+
+class QueryPipeline:
+    """
+    The per-question flow as a dependency graph:
+
+        detect ──► translate_query ──► search_translated ─┐
+        warm ─────► search_original ──────────────────────┴► sources ──► answer
+
+    The question is searched as typed while it is being translated, and the
+    embedding model is warmed while detection runs. On the translated route the
+    English answer is streamed and each finished line is translated while the
+    rest is still being generated.
+    """
+
+    def __init__(
+        self,
+        retrieve: Callable[[str], List],
+        generate: Callable[[Dict[str, str], str], str],
+        processor,
+        stream: Optional[Callable[[Dict[str, str]], Iterable[str]]] = None,
+        warm: Optional[Callable[[], Any]] = None,
+        translate_queries: bool = True,
+        native_languages: Optional[Sequence[str]] = None,
+        k: int = 5,
+        parallel: bool = True,
+        verify_language: bool = True,
+        answer_cache=None
+    ):
+        """
+        Args:
+            retrieve: question -> documents
+            generate: ({"context", "question"}, language code) -> answer
+            processor: MultilingualProcessor used for detection and translation
+            stream: English answer as text chunks (enables streamed answer translation)
+            warm: Loads models ahead of the first search (e.g. the embedding model)
+            translate_queries: Also search with the English translation of the question
+                (off for a cross-lingual index, which understands the question as typed)
+            native_languages: Languages answered natively (default: config.NATIVE_GENERATION_LANGUAGES)
+            k: Documents passed to the LLM
+            parallel: Overlap independent stages (False: run them one after another)
+            verify_language: Translate native answers that come back in English
+            answer_cache: CanonicalCache of finished results per (question, language, route)
+        """
+        self.retrieve = retrieve
+        self.generate = generate
+        self.processor = processor
+        self.stream = stream
+        self.warm = warm
+        self.translate_queries = translate_queries
+        self.native_languages = native_languages
+        self.k = k
+        self.parallel = parallel
+        self.verify_language = verify_language
+        self.answer_cache = answer_cache
+        self._segment_pool = get_shared_executor("answer-translate", config.TRANSLATION_MAX_WORKERS)
+        self.pipeline = Pipeline([
+            Stage("detect", self._detect, ("question",), optional=True),
+            Stage("warm", self._warm, (), optional=True),
+            Stage("search_original", self._search_original, ("question", "warm")),
+            Stage("translate_query", self._translate_query, ("question", "detect"), optional=True),
+            Stage("search_translated", self._search_translated, ("translate_query", "warm"), optional=True),
+            Stage("sources", self._merge, ("search_translated", "search_original")),
+            Stage("answer", self._answer, ("question", "sources", "language", "route")),
+        ], parallel=parallel, executor=get_shared_executor("pipeline", config.PIPELINE_MAX_WORKERS))
+
+    # ---------------- stages ----------------
+
+    def _detect(self, question: str) -> str:
+        return self.processor.detect_language(question)[0]
+
+    def _warm(self):
+        return self.warm() if self.warm else None
+
+    def _search_original(self, question: str, warm) -> List:
+        return self.retrieve(question)
+
+    def _translate_query(self, question: str, detect: Optional[str]) -> Optional[str]:
+        if not self.translate_queries or detect in (None, 'en'):
+            return None
+        translated, success = self.processor.translate_text(question, detect, 'en', canonical=True)
+        return translated if success and translated != question else None
+
+    def _search_translated(self, translate_query: Optional[str], warm) -> Optional[List]:
+        return self.retrieve(translate_query) if translate_query else None
+
+    def _merge(self, search_translated: Optional[List], search_original: List) -> List:
+        return merge_sources(search_translated, search_original, k=self.k)
+
+    def _translate_streamed(self, inputs: Dict[str, str], language: str) -> Dict[str, Any]:
+        """Generate in English and translate each finished line while generation continues"""
+        start = time.perf_counter()
+        futures, english = [], []
+        translate = with_request_profile(self.processor.translate_markdown)
+        for line in iter_complete_lines(self.stream(inputs)):
+            english.append(line)
+            futures.append(self._segment_pool.submit(translate, line, 'en', language))
+        generated = time.perf_counter()
+        translated = [future.result()[0] for future in futures]
+        done = time.perf_counter()
+        return {
+            "answer": "".join(translated),
+            "english": "".join(english),
+            "generation_ms": (generated - start) * 1000,
+            "translation_ms": (done - generated) * 1000,
+        }
+
+    def _translate_whole(self, answer: str, language: str) -> Tuple[str, float]:
+        start = time.perf_counter()
+        translated, _ = self.processor.translate_markdown(answer, 'en', language)
+        return translated, (time.perf_counter() - start) * 1000
+
+    def _answer(self, question: str, sources: List, language: str, route: str) -> Dict[str, Any]:
+        inputs = {
+            "context": "\n\n".join(doc.page_content for doc in sources),
+            "question": question,
+        }
+        generation_ms = translation_ms = 0.0
+        answer = None
+
+        if route == ROUTE_NATIVE:
+            start = time.perf_counter()
+            try:
+                answer = self.generate(inputs, language)
+            except Exception as e:
+                logger.warning(f"Native generation in {language} failed: {e}")
+            generation_ms = (time.perf_counter() - start) * 1000
+            if answer is not None and self.verify_language and self.processor.detect_language(answer)[0] == 'en':
+                # Asked for the language but answered in English: translate that answer
+                route = ROUTE_TRANSLATED
+                answer, translation_ms = self._translate_whole(answer, language)
+            elif answer is None:
+                route = ROUTE_TRANSLATED
+
+        if answer is None and route == ROUTE_TRANSLATED and self.stream is not None and self.parallel:
+            streamed = self._translate_streamed(inputs, language)
+            answer = streamed["answer"]
+            generation_ms += streamed["generation_ms"]
+            translation_ms = streamed["translation_ms"]
+        elif answer is None:
+            start = time.perf_counter()
+            answer = self.generate(inputs, 'en')
+            generation_ms += (time.perf_counter() - start) * 1000
+            if route == ROUTE_TRANSLATED:
+                answer, translation_ms = self._translate_whole(answer, language)
+
+        return {"answer": answer, "route": route,
+                "generation_ms": generation_ms, "translation_ms": translation_ms}
+
+    # ---------------- entry point ----------------
+
+    def route_for(self, language: str, generation: str = 'auto') -> str:
+        """Route for a response language: english, native or translated"""
+        if language == 'en':
+            return ROUTE_ENGLISH
+        native = self.native_languages if self.native_languages is not None else config.NATIVE_GENERATION_LANGUAGES
+        if generation == 'native' or (generation == 'auto' and language in native):
+            return ROUTE_NATIVE
+        return ROUTE_TRANSLATED
+
+    def run(self, question: str, language: str, generation: str = 'auto') -> Dict[str, Any]:
+        """
+        Answer a question in language
+
+        Returns:
+            {"answer", "source_documents", "language", "language_route", "timings"}; timings
+            has retrieval/generation/translation/total milliseconds and per-stage "stages"
+            ("cached": True and no stages when the answer came from answer_cache)
+        """
+        route = self.route_for(language, generation)
+        if self.answer_cache is not None:
+            start = time.perf_counter()
+            cached = self.answer_cache.get(question, language, route)
+            if cached is not None:
+                total_ms = (time.perf_counter() - start) * 1000
+                timings = {"retrieval_ms": 0.0, "generation_ms": 0.0, "translation_ms": 0.0,
+                           "total_ms": total_ms, "stages": {}, "cached": True}
+                return dict(cached, timings=timings)
+
+        run = self.pipeline.run(question=question, language=language, route=route)
+        answer = run.results["answer"]
+        stages = run.timings
+        result = {
+            "answer": answer["answer"],
+            "source_documents": run.results["sources"],
+            "language": language,
+            "language_route": answer["route"],
+            "timings": {
+                "retrieval_ms": stages["sources"]["end_ms"],
+                "generation_ms": answer["generation_ms"],
+                "translation_ms": answer["translation_ms"],
+                "total_ms": run.total_ms,
+                "stages": stages,
+            },
+        }
+        if self.answer_cache is not None:
+            self.answer_cache.put(question, result, language, route)
+        return result
+
+
+__all__ = [
+    'Stage', 'Pipeline', 'PipelineRun', 'PipelineError', 'QueryPipeline',
+    'get_shared_executor', 'merge_sources', 'iter_complete_lines',
+    'ROUTE_ENGLISH', 'ROUTE_NATIVE', 'ROUTE_TRANSLATED',
+]
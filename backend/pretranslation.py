@@ -0,0 +1,270 @@
+"""
+Background Pre-translation
+Low-priority worker that translates a fresh answer into the user's other recently
+used response languages, so switching the Response Language renders instantly
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from . import config
+
+logger = logging.getLogger(__name__)
+
+# Niceness applied to the worker thread where the OS supports per-thread priorities (Linux)
+WORKER_NICENESS = 10
+
+
+class Pretranslator:
+    """
+    Bounded queue of (message, language) translation jobs served by one daemon thread.
+
+    Jobs belong to an owner (the chat session). cancel(owner) drops its pending jobs
+    when the user moves on; past max_pending the oldest pending job is dropped.
+    The worker never starts an owner's job while that owner has a foreground()
+    request in flight, and waits up to max_defer seconds per job for other owners'
+    requests to finish, so background work yields to users without starving when
+    some request is always in flight.
+    Finished translations are held until the owner collect()s them.
+    """
+
+    def __init__(
+        self,
+        translate_fn: Callable[[str, str, str], Tuple[str, bool]],
+        max_pending: int = 24,
+        max_results: int = 256,
+        max_defer: float = 1.0
+    ):
+        """
+        Args:
+            translate_fn: (text, source_lang, target_lang) -> (translation, success)
+            max_pending: Jobs kept waiting; older jobs are dropped beyond this
+            max_results: Finished translations held for collect(); oldest dropped beyond this
+            max_defer: Seconds a job yields to other owners' requests before it runs anyway
+        """
+        self.translate_fn = translate_fn
+        self.max_pending = max_pending
+        self.max_results = max_results
+        self.max_defer = max_defer
+
+        self._pending = OrderedDict()   # (owner, key, lang) -> (text, source_lang)
+        self._results = OrderedDict()   # (owner, key, lang) -> translation
+        self._running = None             # job being translated; reset by cancel(drop_results=True)
+        self._foreground = Counter()     # owner -> user-facing requests in flight
+        self._cond = threading.Condition()
+        self._thread = None
+        self._closed = False
+
+        self.completed = 0
+        self.failed = 0
+        self.dropped = 0
+        self.cancelled = 0
+
+    # ---------------- producer side ----------------
+
+    def submit(
+        self,
+        owner: str,
+        key: Hashable,
+        text: str,
+        source_lang: str,
+        target_langs: Iterable[str]
+    ) -> int:
+        """
+        Queue translations of text into each target language
+
+        Args:
+            owner: Chat session the message belongs to (unit of cancellation)
+            key: Message identifier returned by collect()
+            text: Answer markdown
+            source_lang: Language of text
+            target_langs: Languages to pre-translate into (source_lang is skipped)
+
+        Returns:
+            Number of jobs queued
+        """
+        queued = 0
+        with self._cond:
+            if self._closed:
+                return 0
+            for lang in dict.fromkeys(target_langs):
+                job = (owner, key, lang)
+                if lang == source_lang or job in self._pending or job in self._results:
+                    continue
+                self._pending[job] = (text, source_lang)
+                queued += 1
+            while len(self._pending) > self.max_pending:
+                self._pending.popitem(last=False)
+                self.dropped += 1
+            if queued:
+                self._ensure_worker()
+                self._cond.notify()
+        return queued
+
+    def cancel(self, owner: str, drop_results: bool = False) -> int:
+        """
+        Drop the owner's pending jobs (a job already running still finishes)
+
+        Args:
+            owner: Chat session whose jobs to drop
+            drop_results: Also forget its finished and running translations, for when
+                their message keys no longer mean the same messages (chat cleared)
+
+        Returns:
+            Number of pending jobs dropped
+        """
+        with self._cond:
+            jobs = [job for job in self._pending if job[0] == owner]
+            for job in jobs:
+                del self._pending[job]
+            self.cancelled += len(jobs)
+            if drop_results:
+                for job in [job for job in self._results if job[0] == owner]:
+                    del self._results[job]
+                if self._running is not None and self._running[0] == owner:
+                    self._running = None
+            return len(jobs)
+
+    def collect(self, owner: str) -> List[Tuple[Hashable, str, str]]:
+        """Remove and return the owner's finished translations as (key, lang, translation)"""
+        with self._cond:
+            jobs = [job for job in self._results if job[0] == owner]
+            return [(job[1], job[2], self._results.pop(job)) for job in jobs]
+
+    def peek(self, owner: str, key: Hashable, lang: str) -> Optional[str]:
+        """A finished translation that has not been collected yet, or None"""
+        with self._cond:
+            return self._results.get((owner, key, lang))
+
+    @contextmanager
+    def foreground(self, owner: Optional[str] = None):
+        """Mark a user-facing request of owner in flight; the worker yields to it (see class docstring)"""
+        with self._cond:
+            self._foreground[owner] += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._foreground[owner] -= 1
+                if not self._foreground[owner]:
+                    del self._foreground[owner]
+                self._cond.notify_all()
+
+    # ---------------- worker ----------------
+
+    def _ensure_worker(self):
+        """Start the worker thread on first use (lock held)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="pretranslation", daemon=True)
+            self._thread.start()
+
+    def _eligible_job(self) -> Optional[Tuple]:
+        """Newest pending job whose owner has no request in flight (lock held)"""
+        # Newest first: the latest answer is the one the user is looking at
+        for job in reversed(self._pending):
+            if job[0] not in self._foreground:
+                return job
+        return None
+
+    def _next_job(self):
+        with self._cond:
+            deferred_since = None
+            while True:
+                if self._closed:
+                    return None
+                job = self._eligible_job()
+                if job is None:
+                    self._cond.wait()
+                    continue
+                if not self._foreground:
+                    break
+                # Other owners' requests are in flight: yield to them, but only for max_defer
+                now = time.monotonic()
+                deferred_since = now if deferred_since is None else deferred_since
+                remaining = self.max_defer - (now - deferred_since)
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            text, source_lang = self._pending.pop(job)
+            self._running = job
+            return job, text, source_lang
+
+    def _run(self):
+        try:
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), WORKER_NICENESS)
+        except (AttributeError, OSError):
+            pass
+        while True:
+            item = self._next_job()
+            if item is None:
+                return
+            job, text, source_lang = item
+            try:
+                translation, success = self.translate_fn(text, source_lang, job[2])
+            except Exception as e:
+                logger.debug(f"Pre-translation into {job[2]} failed: {e}")
+                translation, success = None, False
+            with self._cond:
+                if self._running != job:
+                    self.cancelled += 1
+                    continue
+                self._running = None
+                if not success:
+                    self.failed += 1
+                    continue
+                self.completed += 1
+                self._results[job] = translation
+                while len(self._results) > self.max_results:
+                    self._results.popitem(last=False)
+
+    def shutdown(self):
+        """Stop the worker after its current job; pending jobs are discarded"""
+        with self._cond:
+            self._closed = True
+            self._pending.clear()
+            self._cond.notify_all()
+
+    def stats(self) -> Dict:
+        """Queue depth and completed/failed/dropped/cancelled counters"""
+        with self._cond:
+            return {
+                "pending": len(self._pending),
+                "ready": len(self._results),
+                "completed": self.completed,
+                "failed": self.failed,
+                "dropped": self.dropped,
+                "cancelled": self.cancelled,
+            }
+
+
+# Singleton instance
+_pretranslator_instance = None
+_pretranslator_lock = threading.Lock()
+
+
+def get_pretranslator() -> Pretranslator:
+    """Get or create the shared pre-translator backed by the multilingual processor"""
+    global _pretranslator_instance
+    if _pretranslator_instance is None:
+        with _pretranslator_lock:
+            if _pretranslator_instance is None:
+                from .multilingual import get_multilingual_processor
+
+                def translate(text: str, source_lang: str, target_lang: str) -> Tuple[str, bool]:
+                    # Fallback translations fail the job, so they are never stored with the message
+                    return get_multilingual_processor().translate_markdown(
+                        text, source_lang, target_lang, allow_fallback=False
+                    )
+
+                _pretranslator_instance = Pretranslator(
+                    translate, max_pending=config.PRETRANSLATE_MAX_PENDING, max_defer=config.PRETRANSLATE_MAX_DEFER
+                )
+    return _pretranslator_instance
+
+
+__all__ = ['Pretranslator', 'get_pretranslator']
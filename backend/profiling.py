@@ -0,0 +1,170 @@
+"""
+Request Profiling Module
+Samples call stacks of individual requests and writes collapsed stacks for flamegraphs.
+Work a request hands to pool threads is sampled too when submitted via with_request_profile().
+"""
+
+import os
+import sys
+import time
+import uuid
+import random
+import logging
+import functools
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Optional
+
+from . import config
+
+logger = logging.getLogger(__name__)
+
+
+class StackSampler:
+    """
+    Periodically samples a request's Python stacks and aggregates collapsed stacks
+
+    Samples the thread that started the request plus any thread attached with
+    add_thread() (pool workers running one of the request's tasks).
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._workers = Counter()  # attached thread ident -> tasks it is running for this request
+        self._workers_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def add_thread(self, thread_id: int):
+        """Also sample thread_id until a matching discard_thread()"""
+        with self._workers_lock:
+            self._workers[thread_id] += 1
+
+    def discard_thread(self, thread_id: int):
+        with self._workers_lock:
+            self._workers[thread_id] -= 1
+            if self._workers[thread_id] <= 0:
+                del self._workers[thread_id]
+
+    def start(self):
+        """Start sampling in a background daemon thread"""
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling and wait for the sampler thread to exit"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            frames = sys._current_frames()
+            frame = frames.get(self.thread_id)
+            if frame is None:
+                break
+            self.stacks[self._collapse(frame)] += 1
+            with self._workers_lock:
+                workers = [ident for ident in self._workers if ident != self.thread_id]
+            for ident in workers:
+                frame = frames.get(ident)
+                if frame is not None:
+                    self.stacks[self._collapse(frame)] += 1
+            self.samples += 1
+
+    @staticmethod
+    def _collapse(frame) -> str:
+        """Render a frame chain as 'outer;...;inner' (flamegraph.pl collapsed format)"""
+        parts = []
+        while frame is not None:
+            code = frame.f_code
+            parts.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{code.co_firstlineno}")
+            frame = frame.f_back
+        return ";".join(reversed(parts))
+
+    def write_collapsed(self, path: str):
+        """Write aggregated stacks, one 'stack count' line each"""
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+_active_sampler: ContextVar[Optional[StackSampler]] = ContextVar("active_sampler", default=None)
+
+
+def with_request_profile(fn: Callable) -> Callable:
+    """
+    fn bound to the request being profiled in the calling thread, for submitting to a pool
+
+    The thread that later runs it is sampled (and passes the binding on to work it
+    submits itself) while the call lasts. Returns fn unchanged when nothing is profiled.
+    """
+    sampler = _active_sampler.get()
+    if sampler is None:
+        return fn
+
+    @functools.wraps(fn)
+    def run(*args, **kwargs):
+        ident = threading.get_ident()
+        token = _active_sampler.set(sampler)
+        sampler.add_thread(ident)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            sampler.discard_thread(ident)
+            _active_sampler.reset(token)
+    return run
+
+
+def should_profile(force: bool = False) -> bool:
+    """Decide whether this request is profiled (forced, or sampled at PROFILE_SAMPLE_RATE)"""
+    if force:
+        return True
+    rate = config.PROFILE_SAMPLE_RATE
+    return rate > 0 and random.random() < rate
+
+
+@contextmanager
+def profile_request(name: str, request_id: Optional[str] = None, force: bool = False):
+    """
+    Profile the enclosed block when sampled, writing one .folded file per request
+    
+    Args:
+        name: Request kind, used in the output filename (e.g. 'process_query')
+        request_id: Request identifier (random if omitted)
+        force: Profile regardless of the sampling rate (admin toggle)
+        
+    Yields:
+        The request id when profiling is active, otherwise None
+    """
+    if not should_profile(force):
+        yield None
+        return
+
+    request_id = request_id or uuid.uuid4().hex[:8]
+    sampler = StackSampler(threading.get_ident(), interval=config.PROFILE_INTERVAL_MS / 1000.0)
+    start = time.perf_counter()
+    token = _active_sampler.set(sampler)
+    sampler.start()
+    try:
+        yield request_id
+    finally:
+        sampler.stop()
+        _active_sampler.reset(token)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        try:
+            os.makedirs(config.PROFILE_DIR, exist_ok=True)
+            filename = f"{time.strftime('%Y%m%d-%H%M%S')}_{name}_{request_id}_{elapsed_ms:.0f}ms.folded"
+            path = os.path.join(config.PROFILE_DIR, filename)
+            sampler.write_collapsed(path)
+            logger.info(f"Profiled {name} [{request_id}] in {elapsed_ms:.0f} ms ({sampler.samples} samples) → {path}")
+        except OSError as e:
+            logger.warning(f"Could not write profile for {name} [{request_id}]: {e}")
+
+
+__all__ = ['StackSampler', 'should_profile', 'profile_request', 'with_request_profile']
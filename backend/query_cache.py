@@ -0,0 +1,104 @@
+"""
+Canonical Query Cache
+Bounded LRU keyed by the canonical form of a question (see canonicalize_query), so
+"IPC 420?", "Section 420 of the IPC" and "धारा ४२० आईपीसी" share one entry.
+Used for answers and query embeddings.
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class CanonicalCache:
+    """
+    Thread-safe LRU of values keyed by (canonical text, *context).
+
+    Each entry remembers the raw text it was stored under, so a hit for differently
+    written text is counted separately as a canonical hit: the hits a raw-text key
+    would have missed.
+    """
+
+    def __init__(
+        self,
+        canonicalize: Optional[Callable[[str], str]] = None,
+        max_entries: int = 256,
+        ttl: float = 0.0
+    ):
+        """
+        Args:
+            canonicalize: text -> key text (default: multilingual.canonicalize_query)
+            max_entries: Maximum entries kept; least recently used evicted beyond this
+            ttl: Seconds an entry stays valid (0 = until evicted)
+        """
+        if canonicalize is None:
+            from .multilingual import canonicalize_query
+            canonicalize = canonicalize_query
+        self.canonicalize = canonicalize
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        self._entries = OrderedDict()  # key -> (value, raw text, stored at)
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.canonical_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, text: str, *context: Hashable) -> tuple:
+        """Cache key for text in context (e.g. response language)"""
+        return (self.canonicalize(text),) + context
+
+    def get(self, text: str, *context: Hashable) -> Optional[Any]:
+        """Cached value for text in context, or None"""
+        key = self.key(text, *context)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl and time.monotonic() - entry[2] > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            if entry[1] != text:
+                self.canonical_hits += 1
+            return entry[0]
+
+    def put(self, text: str, value: Any, *context: Hashable):
+        """Cache value for text in context"""
+        if self.max_entries <= 0:
+            return
+        key = self.key(text, *context)
+        with self._lock:
+            self._entries[key] = (value, text, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict:
+        """Hit/miss counters; canonical_hits are hits a raw-text key would have missed"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "canonical_hits": self.canonical_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+__all__ = ['CanonicalCache']
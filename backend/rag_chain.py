@@ -29,28 +29,15 @@ try:
 except ImportError as e:
     raise ImportError(f"Failed to import config: {e}")
 
+from .language_prompts import SYSTEM_PROMPTS
+from .multilingual import LANGUAGES_BY_CODE, LANGUAGE_CODE_BY_NAME, get_multilingual_processor
+from .translation_engines import EngineStats
+from .query_cache import CanonicalCache
+from .pipeline import QueryPipeline, ROUTE_ENGLISH, ROUTE_NATIVE, ROUTE_TRANSLATED
 
-class RAGChain:
-    """RAG Chain for legal query answering"""
-    
-    def __init__(self, vector_store_manager: VectorStoreManager):
-        self.vector_store_manager = vector_store_manager
-        
-        # Initialize LLM
-        if not config.GOOGLE_API_KEY:
-            raise ValueError("GOOGLE_API_KEY not found in environment variables")
-        
-        self.llm = ChatGoogleGenerativeAI(
-            model=config.MODEL_NAME,
-            google_api_key=config.GOOGLE_API_KEY,
-            temperature=config.TEMPERATURE,
-            max_tokens=config.MAX_TOKENS
-        )
-        
-        # Custom prompt for legal assistance - enhanced for structured, engaging responses
-        self.prompt_template = """You are NyayaSahayak, an expert legal assistant specializing in Indian laws (IPC, BNS, CrPC, Consumer Protection, etc.). Your role is to make legal information accessible and understandable for citizens.
-
-**Context from legal documents:**
+# Rules shared by every language; the headings stay in English because
+# parse_answer_cards() looks for them
+ANSWER_INSTRUCTIONS = """**Context from legal documents:**
 {context}
 
 **User Question:** {question}
@@ -64,11 +51,71 @@ class RAGChain:
    **KEY POINTS:** • Point 1 • Point 2 • Point 3 (max 4 points, each 1 line)
    **LEGAL PROVISION:** Act/Section + brief text (2-3 lines max)
    **NEXT STEPS:** 1-2 actionable steps
-5. If question is in Hindi, respond in Hindi with same structure.
+5. {language_rule}
 6. Use **bold** for section numbers, act names, punishments. No long prose.
 7. Be helpful and accurate - when using your own knowledge, mention it's general legal info and recommend consulting a lawyer for specific cases."""
+
+ENGLISH_LANGUAGE_RULE = "If question is in Hindi, respond in Hindi with same structure."
+NATIVE_LANGUAGE_RULE = (
+    "Write the whole answer in {language}, whatever language the question is in. Keep the four "
+    "headings (**SUMMARY:**, **KEY POINTS:**, **LEGAL PROVISION:**, **NEXT STEPS:**) in English "
+    "exactly as shown, and keep section numbers and act names as they appear in the context."
+)
+
+
+def resolve_language_code(language: str) -> str:
+    """Language code for a code, language key ('hindi') or name; unknown values map to 'en'"""
+    if not language:
+        return 'en'
+    if language in LANGUAGES_BY_CODE:
+        return language
+    return LANGUAGE_CODE_BY_NAME.get(language.lower(), 'en')
+
+
+class RAGChain:
+    """RAG Chain for legal query answering"""
+    
+    def __init__(self, vector_store_manager: VectorStoreManager, multilingual_processor=None, llm=None):
+        """
+        Args:
+            vector_store_manager: Loaded vector store to retrieve from
+            multilingual_processor: Translator for post-hoc translation and language checks
+                (default: the shared MultilingualProcessor)
+            llm: LangChain chat model or runnable that answers the prompts
+                (default: Gemini from config; benchmarks pass an offline stand-in)
+        """
+        self.vector_store_manager = vector_store_manager
+        if multilingual_processor is None:
+            multilingual_processor = get_multilingual_processor()
+        self.multilingual_processor = multilingual_processor
+        
+        # Initialize LLM
+        if llm is None:
+            if not config.GOOGLE_API_KEY:
+                raise ValueError("GOOGLE_API_KEY not found in environment variables")
+            llm = ChatGoogleGenerativeAI(
+                model=config.MODEL_NAME,
+                google_api_key=config.GOOGLE_API_KEY,
+                temperature=config.TEMPERATURE,
+                max_tokens=config.MAX_TOKENS
+            )
+        self.llm = llm
+        
+        # Custom prompt for legal assistance - enhanced for structured, engaging responses
+        self.prompt_template = (
+            "You are NyayaSahayak, an expert legal assistant specializing in Indian laws (IPC, BNS, CrPC, "
+            "Consumer Protection, etc.). Your role is to make legal information accessible and understandable "
+            "for citizens.\n\n"
+            + ANSWER_INSTRUCTIONS.replace("{language_rule}", ENGLISH_LANGUAGE_RULE)
+        )
         
         self.prompt = PromptTemplate.from_template(self.prompt_template)
+        self._generation_chains = {}  # language code -> prompt | llm | parser
+        self.route_stats = EngineStats()
+        self.answer_cache = (
+            CanonicalCache(max_entries=config.ANSWER_CACHE_MAX_ENTRIES, ttl=config.ANSWER_CACHE_TTL)
+            if config.ANSWER_CACHE_MAX_ENTRIES > 0 else None
+        )
         
         # Create RAG chain
         self.qa_chain = None
@@ -76,48 +123,92 @@ class RAGChain:
     
     def _initialize_chain(self):
         """Initialize the RAG chain using LangChain 1.x API"""
-        retriever = self.vector_store_manager.get_retriever(k=config.TOP_K_RESULTS)
-        
-        # Create RAG chain using LangChain 1.x style
-        def format_docs(docs):
-            return "\n\n".join(doc.page_content for doc in docs)
-        
-        # Build the chain
-        rag_chain = (
-            {
-                "context": retriever | format_docs,
-                "question": RunnablePassthrough()
-            }
-            | self.prompt
-            | self.llm
-            | StrOutputParser()
+        self.retriever = self.vector_store_manager.get_retriever(k=config.TOP_K_RESULTS)
+        # Generation only: query() retrieves once and passes the context in
+        self.qa_chain = self.prompt | self.llm | StrOutputParser()
+        self.pipeline = self._build_pipeline()
+    
+    def _native_prompt(self, language_code: str) -> str:
+        """Language's system prompt (English one if it has none) plus the shared answer rules"""
+        info = LANGUAGES_BY_CODE.get(language_code, {})
+        system_prompt = SYSTEM_PROMPTS.get(language_code, SYSTEM_PROMPTS['en'])
+        rule = NATIVE_LANGUAGE_RULE.format(language=info.get('name', language_code))
+        # System prompts are plain text; escape braces so PromptTemplate leaves them alone
+        system_prompt = system_prompt.replace("{", "{{").replace("}", "}}")
+        return system_prompt + "\n\n" + ANSWER_INSTRUCTIONS.replace("{language_rule}", rule)
+    
+    def _generation_chain(self, language_code: str):
+        """Cached prompt | llm | parser pipeline that answers in language_code"""
+        if language_code == 'en':
+            return self.qa_chain
+        chain = self._generation_chains.get(language_code)
+        if chain is None:
+            prompt = PromptTemplate.from_template(self._native_prompt(language_code))
+            chain = prompt | self.llm | StrOutputParser()
+            self._generation_chains[language_code] = chain
+        return chain
+    
+    def _build_pipeline(self, parallel: bool = True) -> QueryPipeline:
+        """detect → translate query → search → generate → translate answer (overlapped unless parallel=False)"""
+        cross_lingual = getattr(self.vector_store_manager, "model_name", None) == config.MULTILINGUAL_EMBEDDING_MODEL
+        return QueryPipeline(
+            # Scored copies, so stored chat messages can keep each source's score with its chunk id
+            retrieve=lambda question: self.vector_store_manager.search_scored(question, k=config.TOP_K_RESULTS),
+            generate=lambda inputs, language: self._generation_chain(language).invoke(inputs),
+            processor=self.multilingual_processor,
+            stream=self.qa_chain.stream,
+            warm=lambda: self.vector_store_manager.embeddings,
+            # A multilingual index already understands the question as typed
+            translate_queries=not cross_lingual,
+            k=config.TOP_K_RESULTS,
+            parallel=parallel,
+            answer_cache=self.answer_cache,
         )
-        
-        self.qa_chain = rag_chain
-        self.retriever = retriever  # Store retriever for source documents
     
-    def query(self, question: str) -> dict:
-        """Query the RAG system"""
+    def query(self, question: str, response_language: str = 'en', generation: str = 'auto') -> dict:
+        """
+        Query the RAG system
+        
+        Args:
+            question: User question in any supported language
+            response_language: Code or language key ('hi', 'hindi') the answer should be in
+            generation: 'auto' (native if the language is in NATIVE_GENERATION_LANGUAGES),
+                'native' or 'translate' (answer in English, then translate)
+            
+        Returns:
+            {"answer", "source_documents", "language", "language_route", "timings"}; timings holds
+            retrieval/generation/translation/total milliseconds and per-stage "stages"
+        """
         if self.qa_chain is None:
             raise ValueError("RAG chain not initialized")
         
+        language_code = resolve_language_code(response_language)
         try:
-            # Get answer from chain
-            answer = self.qa_chain.invoke(question)
-            
-            # Get source documents
-            source_documents = self.retriever.invoke(question)
-            
-            return {
-                "answer": answer,
-                "source_documents": source_documents
-            }
+            result = self.pipeline.run(question, language_code, generation)
+            self.route_stats.record(result["language_route"], result["timings"]["total_ms"] / 1000, True)
+            return result
         except Exception as e:
             return {
                 "answer": f"Error processing query: {str(e)}",
-                "source_documents": []
+                "source_documents": [],
+                "language": 'en',
+                "language_route": self.pipeline.route_for(language_code, generation),
+                "timings": {},
             }
+    
+    def get_route_report(self):
+        """Per-route call count, share and mean end-to-end latency (see EngineStats.report)"""
+        return self.route_stats.report()
+    
+    def get_cache_report(self) -> dict:
+        """Translation, answer and query-embedding cache counters, each with canonical_hits"""
+        report = {"translation": self.multilingual_processor.translation_cache.stats()}
+        if self.answer_cache is not None:
+            report["answer"] = self.answer_cache.stats()
+        embedding_stats = self.vector_store_manager.embedding_cache_stats()
+        if embedding_stats is not None:
+            report["embedding"] = embedding_stats
+        return report
 
 # Explicitly export RAGChain
-__all__ = ['RAGChain']
-
+__all__ = ['RAGChain', 'resolve_language_code', 'ROUTE_ENGLISH', 'ROUTE_NATIVE', 'ROUTE_TRANSLATED']
@@ -0,0 +1,182 @@
+"""
+Session Memory Accounting
+Estimates the per-session memory footprint of Streamlit session state by key,
+and the allocations a request makes (tracemalloc)
+"""
+
+import sys
+import time
+import types
+import logging
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Session keys holding shared/heavy resources (models, indexes) rather than user data
+RESOURCE_KEYS = frozenset({'rag_chain'})
+
+# Session keys dropped when over budget, in this order: first what the next run
+# re-reads from the chat store, then the last Case Companion answer (the page shows
+# its empty state until the user asks again). Chat messages live in the chat store
+# and sources as references, so these are the only per-session data that grow.
+EVICTABLE_KEYS = ('chat_sessions', 'chat_history', 'cc_response')
+
+# Session key holding when enforce_session_budget last measured the session
+_CHECKED_AT_KEY = '_session_budget_checked_at'
+
+# Objects that are shared process-wide and never attributed to a session
+_SKIP_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType,
+               types.MethodType, types.CodeType, types.FrameType)
+
+
+def deep_sizeof(obj, seen: Optional[set] = None) -> int:
+    """
+    Approximate the total size of an object graph in bytes
+    
+    Args:
+        obj: Root object
+        seen: Ids already counted (share between calls to count shared objects once)
+        
+    Returns:
+        Size in bytes of all objects reachable from obj not already in seen
+    """
+    if seen is None:
+        seen = set()
+    total = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, _SKIP_TYPES):
+            continue
+        seen.add(id(current))
+        try:
+            total += sys.getsizeof(current)
+        except TypeError:
+            continue
+
+        if isinstance(current, (str, bytes, bytearray, int, float, bool)) or current is None:
+            continue
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        else:
+            if hasattr(current, '__dict__'):
+                stack.append(vars(current))
+            for slot in getattr(type(current), '__slots__', ()):
+                if hasattr(current, slot):
+                    stack.append(getattr(current, slot))
+    return total
+
+
+def measure_session_state(state, include_resources: bool = True) -> Dict[str, int]:
+    """
+    Measure the footprint of each session state key
+    
+    Objects referenced from several keys are attributed to the first key
+    measured, so the values add up to the session total.
+    
+    Args:
+        state: st.session_state or any mapping
+        include_resources: Also size RESOURCE_KEYS (slow for a loaded RAG chain)
+        
+    Returns:
+        Dictionary of key -> bytes, largest first
+    """
+    seen = set()
+    sizes = {}
+    for key in list(state.keys()):
+        if not include_resources and key in RESOURCE_KEYS:
+            continue
+        try:
+            sizes[key] = deep_sizeof(state[key], seen)
+        except Exception as e:
+            logger.debug(f"Could not size session key {key}: {e}")
+    return dict(sorted(sizes.items(), key=lambda item: item[1], reverse=True))
+
+
+def split_resources(sizes: Dict[str, int]) -> Tuple[int, int]:
+    """Return (data_bytes, resource_bytes) for a measure_session_state() result"""
+    resource_bytes = sum(size for key, size in sizes.items() if key in RESOURCE_KEYS)
+    return sum(sizes.values()) - resource_bytes, resource_bytes
+
+
+def enforce_session_budget(state, budget_bytes: int, min_interval: float = 0.0) -> List[str]:
+    """
+    Drop EVICTABLE_KEYS in order until user data fits the budget
+    
+    A session still over budget afterwards (its remaining keys are not evictable)
+    is logged with its largest keys.
+    
+    Args:
+        state: st.session_state or any mutable mapping
+        budget_bytes: Maximum bytes of non-resource session data
+        min_interval: Seconds between measurements of the same session; calls in
+            between return at once (measuring walks every object in the session)
+        
+    Returns:
+        Keys that were evicted
+    """
+    now = time.monotonic()
+    if min_interval > 0 and now - state.get(_CHECKED_AT_KEY, float('-inf')) < min_interval:
+        return []
+    state[_CHECKED_AT_KEY] = now
+    sizes = measure_session_state(state, include_resources=False)
+    data_bytes = sum(sizes.values())
+    evicted = []
+    for key in EVICTABLE_KEYS:
+        if data_bytes <= budget_bytes:
+            break
+        if key in state and sizes.get(key, 0):
+            data_bytes -= sizes[key]
+            del state[key]
+            evicted.append(key)
+    if evicted:
+        logger.warning(f"Session over memory budget ({budget_bytes} bytes); evicted {evicted}")
+    if data_bytes > budget_bytes:
+        largest = [key for key in sizes if key not in evicted][:3]
+        logger.warning(f"Session still uses {data_bytes} bytes (budget {budget_bytes}); largest keys {largest}")
+    return evicted
+
+
+def format_size(num_bytes: int) -> str:
+    """Human-readable byte count"""
+    size = float(num_bytes)
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+@contextmanager
+def track_allocations(top: int = 10):
+    """
+    Record net allocations made inside the block, grouped by source line
+    
+    Yields a list that is filled with (location, size_bytes, count) tuples
+    when the block exits. Tracing is process-wide, so allocations by other
+    threads running at the same time are included.
+    """
+    results = []
+    started_here = not tracemalloc.is_tracing()
+    if started_here:
+        tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    try:
+        yield results
+    finally:
+        after = tracemalloc.take_snapshot()
+        if started_here:
+            tracemalloc.stop()
+        for stat in after.compare_to(before, 'lineno')[:top]:
+            frame = stat.traceback[0]
+            results.append((f"{frame.filename}:{frame.lineno}", stat.size_diff, stat.count_diff))
+
+
+__all__ = [
+    'RESOURCE_KEYS', 'EVICTABLE_KEYS', 'deep_sizeof', 'measure_session_state',
+    'split_resources', 'enforce_session_budget', 'format_size', 'track_allocations',
+]
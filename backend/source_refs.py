@@ -0,0 +1,140 @@
+"""
+Source Reference Module
+Compact, serializable references to retrieved chunks and on-demand rehydration
+"""
+
+import hashlib
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from . import config
+
+# Vector store whose docstore stored chunk references are resolved against (see set_chunk_store)
+_chunk_store = None
+
+# Characters of text kept with a reference: the whole citation for chunks without an
+# index, a fallback for indexed chunks whose text has changed since the answer
+PREVIEW_CHARS = 300
+INDEXED_PREVIEW_CHARS = 120
+
+
+def text_digest(text: str) -> str:
+    """Short fingerprint of a chunk's text, checked before a stored reference is resolved"""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=6).hexdigest()
+
+
+def set_chunk_store(vector_store_manager) -> None:
+    """
+    Resolve SourceRef texts against this vector store from now on (called when an index loads)
+
+    There is one chunk store per process: references carry no index id, so with
+    several indexes loaded (e.g. English and cross-lingual) they resolve against
+    whichever was created or loaded last. A reference also carries a digest of
+    its text, so a chunk that was renumbered (re-ingested PDF, other chunk size,
+    other index) is not shown in its place.
+    """
+    global _chunk_store
+    _chunk_store = vector_store_manager
+    chunk_text.cache_clear()
+
+
+@lru_cache(maxsize=config.SOURCE_CHUNK_CACHE_SIZE)
+def chunk_text(source: str, chunk_index: int) -> Optional[str]:
+    """Text of a stored chunk from the current vector store's docstore (None if unavailable)"""
+    if _chunk_store is None:
+        return None
+    doc = _chunk_store.get_chunk(source, chunk_index)
+    return doc.page_content if doc is not None else None
+
+
+class SourceRef:
+    """
+    A source kept with a chat message: its chunk id, a digest of its text and the
+    retrieval score, with the text looked up in the docstore only when page_content
+    is read. A chunk whose text no longer matches the digest is not used; the
+    reference's short preview is shown instead.
+
+    Chunks without an index (and messages saved before references) carry a
+    preview of their text instead.
+    """
+
+    __slots__ = ("source", "chunk_index", "score", "preview", "digest")
+
+    def __init__(self, source: str, chunk_index: Optional[int] = None,
+                 score: Optional[float] = None, preview: str = "", digest: Optional[str] = None):
+        self.source = source
+        self.chunk_index = chunk_index
+        self.score = score
+        self.preview = preview
+        self.digest = digest
+
+    @classmethod
+    def from_document(cls, doc) -> "SourceRef":
+        if isinstance(doc, cls):
+            return doc
+        metadata = getattr(doc, "metadata", {}) or {}
+        chunk_index = metadata.get("chunk_index")
+        text = getattr(doc, "page_content", "")
+        return cls(
+            metadata.get("source", "Legal Document"),
+            chunk_index,
+            metadata.get("score"),
+            text[:PREVIEW_CHARS if chunk_index is None else INDEXED_PREVIEW_CHARS],
+            text_digest(text) if chunk_index is not None else None,
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "SourceRef":
+        """Read a stored reference, or a {"source", "content"} source saved before references"""
+        return cls(data.get("source", "Legal Document"), data.get("chunk"), data.get("score"),
+                   data.get("content", ""), data.get("hash"))
+
+    def to_dict(self) -> Dict:
+        """{"source", "chunk", "hash"} plus "score" when known and a "content" preview"""
+        data = {"source": self.source}
+        if self.chunk_index is not None:
+            data["chunk"] = self.chunk_index
+        if self.digest is not None:
+            data["hash"] = self.digest
+        if self.score is not None:
+            data["score"] = round(float(self.score), 4)
+        if self.preview:
+            data["content"] = self.preview
+        return data
+
+    @property
+    def metadata(self) -> Dict:
+        return {"source": self.source, "chunk_index": self.chunk_index, "score": self.score}
+
+    @property
+    def page_content(self) -> str:
+        if self.chunk_index is not None:
+            text = chunk_text(self.source, self.chunk_index)
+            # References saved before digests have none and are trusted as before
+            if text is not None and (self.digest is None or text_digest(text) == self.digest):
+                return text
+        return self.preview
+
+
+def compact_sources(docs, limit: int = 4) -> List[Dict]:
+    """
+    Reduce retrieved Documents to small references
+    
+    Args:
+        docs: Retrieved Document objects
+        limit: Maximum number of sources kept
+        
+    Returns:
+        List of SourceRef.to_dict() dicts
+    """
+    return [SourceRef.from_document(doc).to_dict() for doc in (docs or [])[:limit]]
+
+
+def rehydrate_sources(refs: List[Dict]) -> List[SourceRef]:
+    """Turn compact references back into renderable documents (texts load on first read)"""
+    return [SourceRef.from_dict(ref) for ref in refs or []]
+
+
+__all__ = [
+    'SourceRef', 'compact_sources', 'rehydrate_sources', 'set_chunk_store', 'chunk_text', 'text_digest',
+]
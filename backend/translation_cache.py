@@ -0,0 +1,268 @@
+"""
+Translation Cache
+Bounded LRU cache for translations keyed by a hash of the full text, with optional
+sqlite persistence so translations survive restarts and are shared across processes
+"""
+
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from . import config
+
+logger = logging.getLogger(__name__)
+
+# Rows kept in the sqlite file; the oldest-used rows are pruned past this
+DEFAULT_MAX_PERSISTED_ENTRIES = 50000
+# Prune the sqlite file once every this many writes
+_PRUNE_EVERY = 500
+
+
+class TranslationCache:
+    """
+    Thread-safe LRU of translations bounded by entry count and bytes.
+    Misses in memory fall through to the sqlite file when one is configured.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        max_bytes: int = 16 * 1024 * 1024,
+        path: Optional[str] = None,
+        max_persisted_entries: int = DEFAULT_MAX_PERSISTED_ENTRIES
+    ):
+        """
+        Args:
+            max_entries: Maximum translations kept in memory
+            max_bytes: Maximum UTF-8 size of cached translations kept in memory
+            path: sqlite file for persistence (None keeps the cache in memory only)
+            max_persisted_entries: Maximum rows kept in the sqlite file
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.path = path
+        self.max_persisted_entries = max_persisted_entries
+
+        self._entries = OrderedDict()  # key -> (translation, size, raw text it was stored for, fallback)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._writes = 0
+
+        self.hits = 0
+        self.canonical_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if self.path:
+            self._init_db()
+
+    @staticmethod
+    def make_key(text: str, source_lang: str, target_lang: str) -> str:
+        """SHA-256 of the language pair and the full text"""
+        payload = f"{source_lang}\x1f{target_lang}\x1f{text}".encode("utf-8")
+        return hashlib.sha256(payload).hexdigest()
+
+    # ---------------- persistence ----------------
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """Per-thread sqlite connection (None when persistence is off)"""
+        if not self.path:
+            return None
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_db(self):
+        try:
+            conn = self._connection()
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS translations (
+                    key TEXT PRIMARY KEY,
+                    source_lang TEXT NOT NULL,
+                    target_lang TEXT NOT NULL,
+                    translation TEXT NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_translations_last_used ON translations(last_used)")
+            conn.commit()
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Translation cache persistence disabled: {e}")
+            self.path = None
+
+    def _load(self, key: str) -> Optional[str]:
+        try:
+            conn = self._connection()
+            row = conn.execute("SELECT translation FROM translations WHERE key = ?", (key,)).fetchone()
+            if row:
+                conn.execute("UPDATE translations SET last_used = ? WHERE key = ?", (time.time(), key))
+                conn.commit()
+                return row[0]
+        except sqlite3.Error as e:
+            logger.debug(f"Translation cache read failed: {e}")
+        return None
+
+    def _store(self, key: str, source_lang: str, target_lang: str, translation: str):
+        try:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO translations (key, source_lang, target_lang, translation, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, source_lang, target_lang, translation, time.time())
+            )
+            self._writes += 1
+            if self._writes % _PRUNE_EVERY == 0:
+                conn.execute(
+                    "DELETE FROM translations WHERE key NOT IN "
+                    "(SELECT key FROM translations ORDER BY last_used DESC LIMIT ?)",
+                    (self.max_persisted_entries,)
+                )
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.debug(f"Translation cache write failed: {e}")
+
+    # ---------------- memory LRU ----------------
+
+    def _remember(self, key: str, translation: str, text: str, fallback: bool = False):
+        """Insert into the in-memory LRU and evict past the limits (lock held)"""
+        size = len(translation.encode("utf-8"))
+        if key in self._entries:
+            self._bytes -= self._entries.pop(key)[1]
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (translation, size, text, fallback)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, (_, evicted_size, _, _) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self.evictions += 1
+
+    def get(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        key_text: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Cached translation of text, or None
+
+        Args:
+            key_text: Text to key on instead of text, e.g. its canonical form; a hit
+                stored for different raw text is counted in canonical_hits
+        """
+        hit = self.lookup(text, source_lang, target_lang, key_text=key_text)
+        return hit[0] if hit is not None else None
+
+    def lookup(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        key_text: Optional[str] = None
+    ) -> Optional[Tuple[str, bool]]:
+        """
+        Like get(), but returns (translation, fallback) so callers can tell a
+        last-resort translation (see put) from a real one
+        """
+        key = self.make_key(text if key_text is None else key_text, source_lang, target_lang)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                if entry[2] != text:
+                    self.canonical_hits += 1
+                return entry[0], entry[3]
+
+        translation = self._load(key) if self.path else None
+        with self._lock:
+            if translation is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, translation, text)
+        return translation, False
+
+    def contains(self, text: str, source_lang: str, target_lang: str, key_text: Optional[str] = None) -> bool:
+        """Whether text is in the in-memory LRU (no counters, no disk lookup)"""
+        return self.make_key(text if key_text is None else key_text, source_lang, target_lang) in self._entries
+
+    def put(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        translation: str,
+        persist: bool = True,
+        key_text: Optional[str] = None,
+        fallback: bool = False
+    ):
+        """
+        Cache a translation
+
+        Args:
+            persist: Also write to the sqlite file
+            key_text: Text to key on instead of text (see get)
+            fallback: Low-quality last-resort translation: kept in memory only and
+                flagged as such by lookup()
+        """
+        key = self.make_key(text if key_text is None else key_text, source_lang, target_lang)
+        with self._lock:
+            self._remember(key, translation, text, fallback)
+        if persist and not fallback and self.path:
+            self._store(key, source_lang, target_lang, translation)
+
+    def clear(self):
+        """Drop in-memory entries (the sqlite file is left untouched)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict:
+        """Hit/miss/eviction counters and current size; canonical_hits are hits a raw-text key would have missed"""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "canonical_hits": self.canonical_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                "persistent": bool(self.path),
+            }
+
+
+# Singleton instance
+_cache_instance = None
+
+
+def get_translation_cache() -> TranslationCache:
+    """Get or create the shared translation cache configured from config"""
+    global _cache_instance
+    if _cache_instance is None:
+        _cache_instance = TranslationCache(
+            max_entries=config.TRANSLATION_CACHE_MAX_ENTRIES,
+            max_bytes=config.TRANSLATION_CACHE_MAX_BYTES,
+            path=config.TRANSLATION_CACHE_PATH or None,
+        )
+    return _cache_instance
+
+
+__all__ = ['TranslationCache', 'get_translation_cache']
@@ -0,0 +1,184 @@
+"""
+Translation HTTP Client
+Pooled keep-alive session for translation APIs with per-host rate limiting
+and retry with jittered exponential backoff
+"""
+
+import time
+import random
+import logging
+import threading
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from . import config
+
+logger = logging.getLogger(__name__)
+
+MYMEMORY_URL = "https://api.mymemory.translated.net/get"
+
+# HTTP statuses worth retrying; everything else is returned as-is
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class RateLimiter:
+    """Token bucket: at most `rate` requests per second with bursts up to `burst`"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request may be sent"""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class TranslationClient:
+    """
+    Thread-safe HTTP client shared by all translation calls.
+    Reuses TCP/TLS connections through one pooled requests.Session.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 8,
+        timeout: float = 5.0,
+        max_retries: int = 2,
+        backoff: float = 0.5,
+        rate_per_host: float = 5.0
+    ):
+        """
+        Args:
+            pool_size: Keep-alive connections kept per host
+            timeout: Per-request timeout in seconds
+            max_retries: Retries after the first attempt on connection errors, 429 and 5xx
+            backoff: Base delay for exponential backoff (full jitter); a server's
+                Retry-After is honoured up to backoff * 2 ** max_retries
+            rate_per_host: Requests per second allowed per host (0 disables limiting)
+        """
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.rate_per_host = rate_per_host
+        self._session = None
+        self._session_lock = threading.Lock()
+        self._limiters: Dict[str, RateLimiter] = {}
+        self._limiters_lock = threading.Lock()
+
+    @property
+    def session(self):
+        """Lazy pooled session (requests is only imported on first use)"""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._session = session
+        return self._session
+
+    def _limiter_for(self, url: str) -> RateLimiter:
+        host = urlparse(url).netloc
+        with self._limiters_lock:
+            limiter = self._limiters.get(host)
+            if limiter is None:
+                limiter = RateLimiter(self.rate_per_host, burst=self.pool_size)
+                self._limiters[host] = limiter
+            return limiter
+
+    def _retry_delay(self, attempt: int, response=None) -> Optional[float]:
+        """
+        Seconds to wait before the next attempt, or None to give up
+
+        A Retry-After longer than the longest backoff (backoff * 2 ** max_retries) is
+        not waited out: the request thread would block for it, so the caller's next
+        engine or fallback takes over instead.
+        """
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            delay = float(retry_after)
+            return delay if delay <= self.backoff * (2 ** self.max_retries) else None
+        return random.uniform(0, self.backoff * (2 ** attempt))
+
+    def get_json(self, url: str, params: Optional[Dict] = None) -> Optional[Dict]:
+        """
+        GET a JSON document with rate limiting and retries
+
+        Returns:
+            Decoded JSON, or None if every attempt failed
+        """
+        import requests
+        limiter = self._limiter_for(url)
+        for attempt in range(self.max_retries + 1):
+            limiter.acquire()
+            response = None
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+                if response.status_code == 200:
+                    return response.json()
+                if response.status_code not in RETRY_STATUSES:
+                    logger.debug(f"HTTP {response.status_code} from {url}")
+                    return None
+            except (requests.ConnectionError, requests.Timeout) as e:
+                logger.debug(f"Request to {url} failed (attempt {attempt + 1}): {e}")
+            except ValueError as e:
+                logger.debug(f"Invalid JSON from {url}: {e}")
+                return None
+            if attempt < self.max_retries:
+                delay = self._retry_delay(attempt, response)
+                if delay is None:
+                    logger.debug(f"{url} asked to retry after {response.headers.get('Retry-After')} s; giving up")
+                    return None
+                time.sleep(delay)
+        return None
+
+    def translate_mymemory(self, text: str, source_lang: str, target_lang: str) -> str:
+        """Translate with the MyMemory API; returns the input text on failure"""
+        try:
+            data = self.get_json(MYMEMORY_URL, {
+                'q': text,
+                'langpair': f'{source_lang}|{target_lang}'
+            })
+            if data and data.get('responseStatus') == 200:
+                return data['responseData'].get('translatedText', text)
+        except Exception as e:
+            logger.debug(f"MyMemory API error: {e}")
+        return text
+
+
+# Singleton instance
+_client_instance = None
+
+
+def get_translation_client() -> TranslationClient:
+    """Get or create the shared translation client configured from config"""
+    global _client_instance
+    if _client_instance is None:
+        _client_instance = TranslationClient(
+            pool_size=config.TRANSLATION_HTTP_POOL_SIZE,
+            timeout=config.TRANSLATION_HTTP_TIMEOUT,
+            max_retries=config.TRANSLATION_MAX_RETRIES,
+            rate_per_host=config.TRANSLATION_RATE_PER_HOST,
+        )
+    return _client_instance
+
+
+__all__ = ['RateLimiter', 'TranslationClient', 'get_translation_client', 'MYMEMORY_URL']
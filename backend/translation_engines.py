@@ -0,0 +1,218 @@
+"""
+Translation Engines
+Priority-ordered translation backends (local model, remote API, dictionary, stand-in)
+with per-engine latency and hit-share accounting
+"""
+
+import time
+import logging
+import threading
+import importlib.util
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Language codes used by NLLB-200 style models (FLORES-200)
+NLLB_LANGUAGE_CODES = {
+    'en': 'eng_Latn',
+    'hi': 'hin_Deva',
+    'bn': 'ben_Beng',
+    'ta': 'tam_Taml',
+    'te': 'tel_Telu',
+    'mr': 'mar_Deva',
+    'gu': 'guj_Gujr',
+    'kn': 'kan_Knda',
+    'ml': 'mal_Mlym',
+    'pa': 'pan_Guru',
+    'ur': 'urd_Arab',
+    'or': 'ory_Orya',
+}
+
+
+class TranslationEngine(ABC):
+    """
+    Base class for translation engines
+
+    Subclasses set `name` and implement translate(); returning None means
+    "cannot translate this", and the next engine is tried.
+    """
+
+    name = "engine"
+    # Whether results may be written to the shared persistent cache
+    persist_results = True
+
+    def available(self) -> bool:
+        """Whether the engine can be used at all (dependencies, configuration)"""
+        return True
+
+    @abstractmethod
+    def translate(self, text: str, source_lang: str, target_lang: str) -> Optional[str]:
+        """Translation of text, or None if this engine cannot translate it"""
+
+
+class LocalModelEngine(TranslationEngine):
+    """
+    CPU-only seq2seq model (e.g. facebook/nllb-200-distilled-600M) run through transformers.
+    The model is loaded on first use, never at import time.
+    """
+
+    name = "local"
+
+    def __init__(self, model_name: str, max_length: int = 512, num_threads: int = 0):
+        """
+        Args:
+            model_name: Hugging Face model id or local path
+            max_length: Maximum generated tokens per segment
+            num_threads: torch CPU threads (0 keeps torch's default)
+        """
+        self.model_name = model_name
+        self.max_length = max_length
+        self.num_threads = num_threads
+        self._model = None
+        self._tokenizer = None
+        self._load_lock = threading.Lock()
+        # src_lang is tokenizer state shared by every thread translating through this engine
+        self._tokenize_lock = threading.Lock()
+        self._failed = False
+
+    def available(self) -> bool:
+        return (
+            bool(self.model_name)
+            and not self._failed
+            and importlib.util.find_spec("transformers") is not None
+            and importlib.util.find_spec("torch") is not None
+        )
+
+    def _load(self):
+        with self._load_lock:
+            if self._model is not None:
+                return
+            try:
+                import torch
+                from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+                if self.num_threads:
+                    torch.set_num_threads(self.num_threads)
+                logger.info(f"Loading local translation model {self.model_name} (CPU)...")
+                self._tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+                self._model = AutoModelForSeq2SeqLM.from_pretrained(self.model_name).to("cpu").eval()
+            except Exception as e:
+                logger.warning(f"Local translation model unavailable: {e}")
+                self._failed = True
+                raise
+
+    def translate(self, text: str, source_lang: str, target_lang: str) -> Optional[str]:
+        source_code = NLLB_LANGUAGE_CODES.get(source_lang)
+        target_code = NLLB_LANGUAGE_CODES.get(target_lang)
+        if not source_code or not target_code:
+            return None
+        try:
+            self._load()
+        except Exception:
+            return None
+
+        import torch
+        with self._tokenize_lock:
+            self._tokenizer.src_lang = source_code
+            inputs = self._tokenizer(text, return_tensors="pt", truncation=True, max_length=self.max_length)
+        with torch.inference_mode():
+            output = self._model.generate(
+                **inputs,
+                forced_bos_token_id=self._tokenizer.convert_tokens_to_ids(target_code),
+                max_length=self.max_length,
+            )
+        return self._tokenizer.batch_decode(output, skip_special_tokens=True)[0]
+
+
+class MyMemoryEngine(TranslationEngine):
+    """Remote MyMemory API; an unchanged result counts as a miss"""
+
+    name = "mymemory"
+
+    def __init__(self, translate_fn: Callable[[str, str, str], str], is_available: Callable[[], bool] = None):
+        self.translate_fn = translate_fn
+        self.is_available = is_available
+
+    def available(self) -> bool:
+        return self.is_available() if self.is_available else True
+
+    def translate(self, text: str, source_lang: str, target_lang: str) -> Optional[str]:
+        translated = self.translate_fn(text, source_lang, target_lang)
+        if translated and translated != text:
+            return translated
+        return None
+
+
+class DictionaryEngine(TranslationEngine):
+    """Word-by-word substitution from BASIC_TRANSLATIONS; last resort, never persisted"""
+
+    name = "dictionary"
+    persist_results = False
+
+    def __init__(self, translate_fn: Callable[[str, str, str], str]):
+        self.translate_fn = translate_fn
+
+    def translate(self, text: str, source_lang: str, target_lang: str) -> Optional[str]:
+        return self.translate_fn(text, source_lang, target_lang)
+
+
+class StandInEngine(TranslationEngine):
+    """Deterministic offline engine for tests and benchmarks: '[hi] text'"""
+
+    name = "stand-in"
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = 0
+
+    def translate(self, text: str, source_lang: str, target_lang: str) -> Optional[str]:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return f"[{target_lang}] {text}"
+
+
+class EngineStats:
+    """Thread-safe per-engine call, hit and latency counters"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict] = {}
+
+    def record(self, engine: str, seconds: float, hit: bool):
+        with self._lock:
+            entry = self._stats.setdefault(engine, {"calls": 0, "hits": 0, "seconds": 0.0})
+            entry["calls"] += 1
+            entry["hits"] += int(hit)
+            entry["seconds"] += seconds
+
+    def report(self) -> List[Dict]:
+        """
+        Per-engine summary in priority order of first use
+
+        Returns:
+            [{"engine", "calls", "hits", "hit_share", "mean_ms"}]; hit_share is the
+            fraction of all translations served by that engine
+        """
+        with self._lock:
+            total_hits = sum(entry["hits"] for entry in self._stats.values())
+            return [
+                {
+                    "engine": name,
+                    "calls": entry["calls"],
+                    "hits": entry["hits"],
+                    "hit_share": entry["hits"] / total_hits if total_hits else 0.0,
+                    "mean_ms": entry["seconds"] * 1000 / entry["calls"] if entry["calls"] else 0.0,
+                }
+                for name, entry in self._stats.items()
+            ]
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+__all__ = [
+    'NLLB_LANGUAGE_CODES', 'TranslationEngine', 'LocalModelEngine', 'MyMemoryEngine',
+    'DictionaryEngine', 'StandInEngine', 'EngineStats',
+]
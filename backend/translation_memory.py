@@ -0,0 +1,258 @@
+"""
+Translation Memory
+Exact and fuzzy (character trigram) lookup of known translations, seeded from the
+curated strings in language_strings.py / language_prompts.py and grown from verified
+engine results
+"""
+
+import re
+import logging
+import threading
+import unicodedata
+from collections import Counter, deque
+from typing import Dict, List, Optional, Set, Tuple
+
+from . import config
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_DIGITS_RE = re.compile(r"\d+")
+# Words, including Indic vowel signs and viramas (\w alone splits at them)
+_TOKEN_RE = re.compile(r"[\w\u0600-\u06ff\u0900-\u0dff]+")
+
+# Words a fuzzy match may differ in: they do not change what a sentence means
+_FILLER_WORDS = frozenset({
+    "a", "an", "the", "of", "in", "on", "at", "to", "for", "by", "with", "from", "as",
+    "is", "are", "was", "were", "be", "been", "this", "that", "these", "those", "it", "its",
+    "and", "or", "do", "does", "please",
+    "का", "की", "के", "है", "हैं", "में", "से", "को", "पर", "और", "यह", "वह",
+})
+
+# Negations and qualifiers flip or narrow a legal statement; they must never be fuzzed
+# ("bailable" vs "not bailable" vs "non-bailable" differ only in these)
+_QUALIFIER_WORDS = frozenset({
+    "not", "no", "non", "nor", "never", "none", "neither", "without", "except", "unless",
+    "only", "but", "cannot", "shall", "may", "must",
+    "नहीं", "न", "मत", "बिना", "केवल", "सिर्फ", "सिवाय", "अलावा",
+})
+
+# Shorter texts only match exactly ("bail" must never fuzzy-match "jail")
+MIN_FUZZY_CHARS = 12
+
+
+def normalize(text: str) -> str:
+    """NFC, case-folded, whitespace-collapsed form used for matching"""
+    return _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFC", text)).strip().casefold()
+
+
+def content_tokens(text: str) -> Counter:
+    """Words of normalized text that carry meaning (fillers dropped, qualifiers always kept)"""
+    return Counter(
+        token for token in _TOKEN_RE.findall(text)
+        if token in _QUALIFIER_WORDS or token not in _FILLER_WORDS
+    )
+
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TranslationMemory:
+    """
+    In-memory translation memory per language pair.
+    Fuzzy matches use Dice similarity over character trigrams, found through an
+    inverted trigram index, and are only served when both texts have the same content
+    words: they may differ in case, punctuation, spacing and filler words, never in a
+    number (Section 420 ≠ Section 406), a negation or a qualifier ("bailable" ≠
+    "not bailable" ≠ "non-bailable").
+    """
+
+    def __init__(self, min_similarity: float = 0.9, max_learned: int = 5000):
+        """
+        Args:
+            min_similarity: Lowest Dice similarity served as a fuzzy match
+            max_learned: Learned (non-curated) entries kept; oldest are dropped first
+        """
+        self.min_similarity = min_similarity
+        self.max_learned = max_learned
+
+        self._exact: Dict[Tuple[str, str, str], str] = {}
+        self._ids: Dict[Tuple[str, str, str], int] = {}
+        # entry id -> (pair, normalized source, translation, grams, content tokens)
+        self._entries: Dict[int, Tuple] = {}
+        self._index: Dict[Tuple[str, str], Dict[str, Set[int]]] = {}
+        self._learned = deque()
+        self._next_id = 0
+        self._lock = threading.RLock()
+
+        self.exact_hits = 0
+        self.fuzzy_hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._exact)
+
+    def add(self, source_text: str, translation: str, source_lang: str, target_lang: str, curated: bool = False):
+        """
+        Add a translation pair
+
+        Args:
+            curated: Human-verified seed pair (never evicted)
+
+        Adding a source text again replaces its earlier translation for exact and fuzzy lookups.
+        """
+        key = normalize(source_text)
+        if not key or not translation or source_lang == target_lang:
+            return
+        pair = (source_lang, target_lang)
+        with self._lock:
+            old_id = self._ids.get((source_lang, target_lang, key))
+            if old_id is not None:
+                self._remove(old_id)
+                try:
+                    self._learned.remove(old_id)
+                except ValueError:
+                    pass  # A curated entry
+            self._exact[(source_lang, target_lang, key)] = translation
+
+            entry_id = self._next_id
+            self._next_id += 1
+            self._ids[(source_lang, target_lang, key)] = entry_id
+            grams = _trigrams(key)
+            self._entries[entry_id] = (pair, key, translation, len(grams), content_tokens(key))
+            index = self._index.setdefault(pair, {})
+            for gram in grams:
+                index.setdefault(gram, set()).add(entry_id)
+
+            if not curated:
+                self._learned.append(entry_id)
+                while len(self._learned) > self.max_learned:
+                    self._remove(self._learned.popleft())
+
+    def _remove(self, entry_id: int):
+        pair, key, _, _, _ = self._entries.pop(entry_id)
+        self._exact.pop((pair[0], pair[1], key), None)
+        self._ids.pop((pair[0], pair[1], key), None)
+        index = self._index.get(pair, {})
+        for gram in _trigrams(key):
+            ids = index.get(gram)
+            if ids:
+                ids.discard(entry_id)
+                if not ids:
+                    del index[gram]
+
+    def lookup(self, text: str, source_lang: str, target_lang: str) -> Optional[Tuple[str, float]]:
+        """
+        Find a known translation for text
+
+        Returns:
+            (translation, similarity) with similarity 1.0 for exact matches, or None
+        """
+        key = normalize(text)
+        with self._lock:
+            exact = self._exact.get((source_lang, target_lang, key))
+            if exact is not None:
+                self.exact_hits += 1
+                return exact, 1.0
+
+            match = self._fuzzy(key, (source_lang, target_lang)) if len(key) >= MIN_FUZZY_CHARS else None
+            if match is None:
+                self.misses += 1
+                return None
+            self.fuzzy_hits += 1
+            return match
+
+    def _fuzzy(self, key: str, pair: Tuple[str, str]) -> Optional[Tuple[str, float]]:
+        index = self._index.get(pair)
+        if not index:
+            return None
+        grams = _trigrams(key)
+        shared = Counter()
+        for gram in grams:
+            for entry_id in index.get(gram, ()):
+                shared[entry_id] += 1
+
+        tokens = content_tokens(key)
+        digits = _DIGITS_RE.findall(key)
+        best = None
+        best_score = self.min_similarity
+        for entry_id, common in shared.items():
+            _, entry_key, translation, gram_count, entry_tokens = self._entries[entry_id]
+            score = 2.0 * common / (len(grams) + gram_count)
+            if (score >= best_score and entry_tokens == tokens
+                    and _DIGITS_RE.findall(entry_key) == digits):
+                best, best_score = translation, score
+        return (best, best_score) if best is not None else None
+
+    def stats(self) -> Dict:
+        """Entry count and exact/fuzzy/miss counters"""
+        with self._lock:
+            return {
+                "entries": len(self._exact),
+                "learned": len(self._learned),
+                "exact_hits": self.exact_hits,
+                "fuzzy_hits": self.fuzzy_hits,
+                "misses": self.misses,
+            }
+
+
+def _aligned_pairs(tables: List[Dict[str, Dict]]) -> List[Tuple[str, str, str]]:
+    """(english, translation, language) for every key present in both 'en' and another language"""
+    pairs = []
+    for table in tables:
+        english = table.get('en', {})
+        for lang, strings in table.items():
+            if lang == 'en':
+                continue
+            for key, value in strings.items():
+                source = english.get(key)
+                if isinstance(source, str) and isinstance(value, str) and source != value:
+                    pairs.append((source, value, lang))
+                elif isinstance(source, list) and isinstance(value, list) and len(source) == len(value):
+                    # Keyword lists only line up when both sides have the same length
+                    pairs.extend((s, v, lang) for s, v in zip(source, value) if s != v)
+    return pairs
+
+
+def seed_from_curated(memory: TranslationMemory) -> int:
+    """
+    Load the curated UI strings, legal terms, help messages and legal keyword
+    mappings into memory in both directions
+
+    Returns:
+        Number of pairs added
+    """
+    from .language_strings import LANGUAGE_STRINGS, LEGAL_TERMS, HELP_MESSAGES
+    from .language_prompts import LEGAL_CONTEXT_MAPPINGS
+
+    pairs = _aligned_pairs([LANGUAGE_STRINGS, LEGAL_TERMS, HELP_MESSAGES, LEGAL_CONTEXT_MAPPINGS])
+    for english, translation, lang in pairs:
+        memory.add(english, translation, 'en', lang, curated=True)
+        memory.add(translation, english, lang, 'en', curated=True)
+    return len(pairs)
+
+
+# Singleton instance
+_memory_instance = None
+_memory_lock = threading.Lock()
+
+
+def get_translation_memory() -> TranslationMemory:
+    """Get or create the shared translation memory, seeded from the curated strings"""
+    global _memory_instance
+    if _memory_instance is None:
+        with _memory_lock:
+            if _memory_instance is None:
+                memory = TranslationMemory(min_similarity=config.TRANSLATION_MEMORY_MIN_SIMILARITY)
+                try:
+                    count = seed_from_curated(memory)
+                    logger.info(f"Translation memory seeded with {count} curated pairs")
+                except ImportError as e:
+                    logger.warning(f"Could not seed translation memory: {e}")
+                _memory_instance = memory
+    return _memory_instance
+
+
+__all__ = ['TranslationMemory', 'seed_from_curated', 'get_translation_memory', 'normalize', 'content_tokens']
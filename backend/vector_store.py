@@ -5,9 +5,15 @@ Handles FAISS vector store creation, loading, and similarity search
 
 import os
 import sys
-from typing import List
+import json
+from typing import List, Optional
 from langchain_community.vectorstores import FAISS
 from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from . import config
+from .query_cache import CanonicalCache
+from .source_refs import set_chunk_store
 
 # Disable TensorFlow before importing transformers-dependent modules
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
@@ -31,19 +37,76 @@ if not hasattr(importlib.util, '_original_find_spec'):
     importlib.util.find_spec = patched_find_spec
 
 
+# Written next to the FAISS files so an index is never queried with a different model
+INDEX_META_FILE = "embedding_model.json"
+
+
+class PrefixedEmbeddings(Embeddings):
+    """Adds the query/passage prefixes that instruction-tuned models such as e5 expect"""
+
+    def __init__(self, base: Embeddings, query_prefix: str = "", passage_prefix: str = ""):
+        self.base = base
+        self.query_prefix = query_prefix
+        self.passage_prefix = passage_prefix
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.base.embed_documents([self.passage_prefix + text for text in texts])
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.base.embed_query(self.query_prefix + text)
+
+
+class CachedQueryEmbeddings(Embeddings):
+    """Reuses query embeddings for questions with the same canonical form (documents pass through)"""
+
+    def __init__(self, base: Embeddings, max_entries: int = 1024):
+        self.base = base
+        self.cache = CanonicalCache(max_entries=max_entries)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.base.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        vector = self.cache.get(text)
+        if vector is None:
+            vector = self.base.embed_query(text)
+            self.cache.put(text, vector)
+        return vector
+
+
 class VectorStoreManager:
     """Manages FAISS vector store for document embeddings"""
     
-    def __init__(self, store_path: str = "vector_store"):
+    def __init__(
+        self,
+        store_path: str = "vector_store",
+        model_name: Optional[str] = None,
+        query_prefix: str = "",
+        passage_prefix: str = "",
+        normalize_embeddings: bool = False
+    ):
+        """
+        Args:
+            store_path: Directory holding the FAISS index
+            model_name: Sentence-transformers model (default: config.EMBEDDING_MODEL)
+            query_prefix: Text prepended to queries before embedding
+            passage_prefix: Text prepended to document chunks before embedding
+            normalize_embeddings: Unit-length vectors, so FAISS L2 ranking equals cosine ranking
+        """
         self.store_path = store_path
+        self.model_name = model_name or config.EMBEDDING_MODEL
+        self.query_prefix = query_prefix
+        self.passage_prefix = passage_prefix
+        self.normalize_embeddings = normalize_embeddings
         self._embeddings = None  # Lazy initialization
         self.vector_store = None
+        self._chunk_lookup = None  # (source, chunk_index) -> docstore id, built on demand
     
     @property
     def embeddings(self):
         """Lazy load embeddings model only when needed"""
         if self._embeddings is None:
-            print("Loading embeddings model (this may take a moment on first run)...")
+            print(f"Loading embeddings model {self.model_name} (this may take a moment on first run)...")
             try:
                 # Suppress warnings during import
                 import warnings
@@ -51,10 +114,16 @@ class VectorStoreManager:
                 
                 # Try to use HuggingFace embeddings
                 from langchain_community.embeddings import HuggingFaceEmbeddings
-                self._embeddings = HuggingFaceEmbeddings(
-                    model_name="sentence-transformers/all-MiniLM-L6-v2",
-                    model_kwargs={'device': 'cpu'}
+                embeddings = HuggingFaceEmbeddings(
+                    model_name=self.model_name,
+                    model_kwargs={'device': 'cpu'},
+                    encode_kwargs={'normalize_embeddings': self.normalize_embeddings}
                 )
+                if self.query_prefix or self.passage_prefix:
+                    embeddings = PrefixedEmbeddings(embeddings, self.query_prefix, self.passage_prefix)
+                if config.QUERY_EMBEDDING_CACHE_MAX_ENTRIES > 0:
+                    embeddings = CachedQueryEmbeddings(embeddings, config.QUERY_EMBEDDING_CACHE_MAX_ENTRIES)
+                self._embeddings = embeddings
                 print("✓ Embeddings model loaded successfully")
             except ImportError as e:
                 error_msg = str(e)
@@ -95,6 +164,8 @@ class VectorStoreManager:
             documents=documents,
             embedding=self.embeddings
         )
+        self._chunk_lookup = None
+        set_chunk_store(self)
         
         print("Vector store created successfully!")
         return self.vector_store
@@ -106,19 +177,39 @@ class VectorStoreManager:
         
         os.makedirs(self.store_path, exist_ok=True)
         self.vector_store.save_local(self.store_path)
+        with open(os.path.join(self.store_path, INDEX_META_FILE), "w", encoding="utf-8") as f:
+            json.dump({
+                "model_name": self.model_name,
+                "query_prefix": self.query_prefix,
+                "passage_prefix": self.passage_prefix,
+                "normalize_embeddings": self.normalize_embeddings,
+            }, f, indent=2)
         print(f"Vector store saved to {self.store_path}")
     
+    def index_model_name(self) -> Optional[str]:
+        """Embedding model recorded when the index on disk was built (None for older indexes)"""
+        try:
+            with open(os.path.join(self.store_path, INDEX_META_FILE), encoding="utf-8") as f:
+                return json.load(f).get("model_name")
+        except (OSError, ValueError):
+            return None
+    
     def load_vector_store(self) -> FAISS:
         """Load vector store from disk"""
         if not os.path.exists(self.store_path):
             raise FileNotFoundError(f"Vector store not found at {self.store_path}")
         
         print(f"Loading vector store from {self.store_path}...")
+        built_with = self.index_model_name()
+        if built_with and built_with != self.model_name:
+            print(f"Warning: index was built with {built_with}, querying with {self.model_name}")
         self.vector_store = FAISS.load_local(
             self.store_path,
             self.embeddings,
             allow_dangerous_deserialization=True
         )
+        self._chunk_lookup = None
+        set_chunk_store(self)
         print("Vector store loaded successfully!")
         return self.vector_store
     
@@ -130,6 +221,31 @@ class VectorStoreManager:
         results = self.vector_store.similarity_search_with_score(query, k=k)
         return results
     
+    def search_scored(self, query: str, k: int = 5) -> List[Document]:
+        """
+        Top-k chunks like the retriever returns, each a copy whose metadata also has
+        "score": the FAISS distance to the query (lower is closer)
+        """
+        if self.vector_store is None:
+            raise ValueError("Vector store not initialized")
+        return [
+            Document(page_content=doc.page_content, metadata={**doc.metadata, "score": float(score)})
+            for doc, score in self.vector_store.similarity_search_with_score(query, k=k)
+        ]
+    
+    def get_chunk(self, source: str, chunk_index: int) -> Optional[Document]:
+        """Look up a stored chunk by source file and chunk index without searching"""
+        if self.vector_store is None:
+            return None
+        docstore = getattr(self.vector_store.docstore, "_dict", {})
+        if self._chunk_lookup is None:
+            self._chunk_lookup = {
+                (doc.metadata.get("source"), doc.metadata.get("chunk_index")): doc_id
+                for doc_id, doc in docstore.items()
+            }
+        doc_id = self._chunk_lookup.get((source, chunk_index))
+        return docstore.get(doc_id) if doc_id is not None else None
+    
     def get_retriever(self, k: int = 5):
         """Get a retriever from the vector store"""
         if self.vector_store is None:
@@ -139,4 +255,31 @@ class VectorStoreManager:
             search_type="similarity",
             search_kwargs={"k": k}
         )
+    
+    def embedding_cache_stats(self) -> Optional[dict]:
+        """Query-embedding cache counters (None before the model loads or with the cache off)"""
+        cache = getattr(self._embeddings, "cache", None)
+        return cache.stats() if cache is not None else None
+
+
+def create_vector_store_manager(multilingual: Optional[bool] = None) -> VectorStoreManager:
+    """
+    Manager for the configured retrieval mode
+
+    Args:
+        multilingual: Use the cross-lingual index and model (default: config.CROSS_LINGUAL_RETRIEVAL)
 
+    Returns:
+        VectorStoreManager for the English-only index or the multilingual index
+    """
+    if multilingual is None:
+        multilingual = config.CROSS_LINGUAL_RETRIEVAL
+    if not multilingual:
+        return VectorStoreManager(config.VECTOR_STORE_PATH)
+    return VectorStoreManager(
+        config.MULTILINGUAL_VECTOR_STORE_PATH,
+        model_name=config.MULTILINGUAL_EMBEDDING_MODEL,
+        query_prefix=config.MULTILINGUAL_QUERY_PREFIX,
+        passage_prefix=config.MULTILINGUAL_PASSAGE_PREFIX,
+        normalize_embeddings=True,
+    )
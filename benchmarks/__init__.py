@@ -0,0 +1,4 @@
+"""
+Benchmarks for the Legal Assistance System
+Offline micro-benchmarks, load tests and startup measurements
+"""
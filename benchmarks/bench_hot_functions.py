@@ -0,0 +1,439 @@
+"""
+Hot Function Benchmarks
+Micro-benchmarks for functions on the per-query and per-rerun paths
+"""
+
+import os
+import atexit
+import tempfile
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from benchmarks import fixtures
+from benchmarks.harness import benchmark, BenchmarkSkipped
+from benchmarks.stand_ins import HashEmbeddings
+
+REPO_ROOT = Path(__file__).parent.parent
+
+_tmpdir = tempfile.TemporaryDirectory(prefix="legalai_bench_")
+atexit.register(_tmpdir.cleanup)
+TMP_DIR = Path(_tmpdir.name)
+
+
+# ============== Multilingual ==============
+
+@benchmark("detect_language/english_query", number=2000)
+def bench_detect_english():
+    from backend.multilingual import MultilingualProcessor
+    from backend.translation_cache import TranslationCache
+    processor = MultilingualProcessor(translation_cache=TranslationCache())
+    return lambda: processor.detect_language(fixtures.ENGLISH_QUERY)
+
+
+@benchmark("detect_language/hindi_query", number=2000)
+def bench_detect_hindi():
+    from backend.multilingual import MultilingualProcessor
+    from backend.translation_cache import TranslationCache
+    processor = MultilingualProcessor(translation_cache=TranslationCache())
+    return lambda: processor.detect_language(fixtures.HINDI_QUERY)
+
+
+@benchmark("detect_language/fir_10kb", number=50)
+def bench_detect_fir():
+    from backend.multilingual import MultilingualProcessor
+    from backend.translation_cache import TranslationCache
+    processor = MultilingualProcessor(translation_cache=TranslationCache())
+    return lambda: processor.detect_language(fixtures.FIR_TEXT)
+
+
+@benchmark("detect_language/fir_100kb_full", number=20)
+def bench_detect_fir_100kb_full():
+    from backend.multilingual import MultilingualProcessor
+    from backend.translation_cache import TranslationCache
+    processor = MultilingualProcessor(translation_cache=TranslationCache())
+    return lambda: processor.detect_language(fixtures.FIR_TEXT_100KB, max_chars=0)
+
+
+@benchmark("detect_language/fir_100kb_sampled", number=200)
+def bench_detect_fir_100kb_sampled():
+    from backend.multilingual import MultilingualProcessor
+    from backend.translation_cache import TranslationCache
+    processor = MultilingualProcessor(translation_cache=TranslationCache())
+    return lambda: processor.detect_language(fixtures.FIR_TEXT_100KB)
+
+
+def _legacy_detect_language(text: str):
+    """The pre-table implementation (range checks + second pass), kept as a reference point"""
+    ranges = [
+        ('hi', range(0x0900, 0x097F)), ('bn', range(0x0980, 0x09FF)), ('pa', range(0x0A00, 0x0A7F)),
+        ('gu', range(0x0A80, 0x0AFF)), ('or', range(0x0B00, 0x0B7F)), ('ta', range(0x0B80, 0x0BFF)),
+        ('te', range(0x0C60, 0x0C7F)), ('kn', range(0x0C80, 0x0CFF)), ('ml', range(0x0D00, 0x0D7F)),
+        ('ur', range(0x0600, 0x06FF)),
+    ]
+    counts = dict.fromkeys([code for code, _ in ranges] + ['en'], 0)
+    for char in text:
+        code = ord(char)
+        for lang, block in ranges:
+            if code in block:
+                counts[lang] += 1
+                break
+        else:
+            if 32 <= code <= 126:
+                counts['en'] += 1
+    best = max(counts, key=counts.get)
+    total = len([c for c in text if ord(c) > 32])
+    return best, counts[best] / total if total else 0.0
+
+
+@benchmark("detect_language/legacy_fir_100kb", number=5)
+def bench_detect_fir_100kb_legacy():
+    return lambda: _legacy_detect_language(fixtures.FIR_TEXT_100KB)
+
+
+@benchmark("language_index/rerun_lookups", number=5000)
+def bench_language_index_lookups():
+    from backend.multilingual import MultilingualProcessor
+    from backend.translation_cache import TranslationCache
+    processor = MultilingualProcessor(translation_cache=TranslationCache())
+
+    # What one Streamlit rerun of the language sidebar asks for
+    def rerun():
+        processor._get_lang_code('Odia')
+        processor.validate_language_code('or')
+        processor.format_for_language(fixtures.ENGLISH_QUERY, 'ur')
+        processor.get_language_selector_options()
+    return rerun
+
+
+def _legacy_string_accessors():
+    """get_string/get_all_strings as they were before the frozen bundles, kept as a reference point"""
+    from backend.language_strings import LANGUAGE_STRINGS, LEGAL_TERMS, HELP_MESSAGES
+    tables = {'general': LANGUAGE_STRINGS, 'legal': LEGAL_TERMS, 'help': HELP_MESSAGES}
+
+    def get_string(key: str, language: str, category: str = 'general') -> str:
+        table = tables[category]
+        strings = table.get(language, table['en'])
+        return strings.get(key, table['en'].get(key, key))
+
+    def get_all_strings(language: str) -> dict:
+        return {
+            **LANGUAGE_STRINGS.get(language, LANGUAGE_STRINGS['en']),
+            **LEGAL_TERMS.get(language, LEGAL_TERMS['en']),
+            **HELP_MESSAGES.get(language, HELP_MESSAGES['en']),
+        }
+    return get_string, get_all_strings
+
+
+def _rerun_label_keys() -> list:
+    """Every general label plus the help texts: what one fully localized page rerun looks up"""
+    from backend.language_strings import LANGUAGE_STRINGS, HELP_MESSAGES
+    return list(LANGUAGE_STRINGS['en']), list(HELP_MESSAGES['en'])
+
+
+@benchmark("language_strings/rerun_legacy", number=2000)
+def bench_language_strings_legacy():
+    get_string, get_all_strings = _legacy_string_accessors()
+    labels, help_keys = _rerun_label_keys()
+
+    def rerun():
+        for key in labels:
+            get_string(key, 'ta')
+        for key in help_keys:
+            get_string(key, 'ta', 'help')
+        get_all_strings('ta')
+    return rerun
+
+
+@benchmark("language_strings/rerun_per_key", number=2000)
+def bench_language_strings_per_key():
+    from backend.language_strings import get_string, get_all_strings
+    labels, help_keys = _rerun_label_keys()
+
+    def rerun():
+        for key in labels:
+            get_string(key, 'ta')
+        for key in help_keys:
+            get_string(key, 'ta', 'help')
+        get_all_strings('ta')
+    return rerun
+
+
+@benchmark("language_strings/rerun_bulk", number=2000)
+def bench_language_strings_bulk():
+    from backend.language_strings import get_bundle, get_strings
+    labels, help_keys = _rerun_label_keys()
+
+    def rerun():
+        get_strings(labels, 'ta')
+        get_strings(help_keys, 'ta', 'help')
+        get_bundle('ta', 'all')
+    return rerun
+
+
+@benchmark("translate_text/cache_hit", number=5000)
+def bench_translate_cache_hit():
+    from backend.multilingual import MultilingualProcessor
+    from backend.translation_cache import TranslationCache
+    from backend.translation_engines import StandInEngine
+    # Never touch the network: prime the cache through a deterministic engine
+    processor = MultilingualProcessor(translation_cache=TranslationCache(), engines=[StandInEngine()])
+    processor.translate_text(fixtures.STRUCTURED_ANSWER, 'en', 'hi')
+    return lambda: processor.translate_text(fixtures.STRUCTURED_ANSWER, 'en', 'hi')
+
+
+@benchmark("canonicalize_query/variants", number=2000)
+def bench_canonicalize_query():
+    from backend.multilingual import canonicalize_query
+    variants = fixtures.CANONICAL_QUERY_VARIANTS + [fixtures.ENGLISH_QUERY]
+
+    def canonicalize_all():
+        for text in variants:
+            canonicalize_query(text)
+    return canonicalize_all
+
+
+@benchmark("translate_markdown/warm_segments", number=500)
+def bench_translate_markdown_warm():
+    from backend.multilingual import MultilingualProcessor
+    from backend.translation_cache import TranslationCache
+    from backend.translation_engines import StandInEngine
+    processor = MultilingualProcessor(translation_cache=TranslationCache(), engines=[StandInEngine()])
+    processor.translate_markdown(fixtures.STRUCTURED_ANSWER, 'en', 'hi')
+    return lambda: processor.translate_markdown(fixtures.STRUCTURED_ANSWER, 'en', 'hi')
+
+
+@benchmark("translation_memory/fuzzy_miss", number=2000)
+def bench_translation_memory_fuzzy_miss():
+    from backend.translation_memory import TranslationMemory, seed_from_curated
+    memory = TranslationMemory()
+    seed_from_curated(memory)
+    # Worst case per segment: scan trigram candidates and find nothing close enough
+    return lambda: memory.lookup("Anticipatory bail can be sought before arrest", 'en', 'hi')
+
+
+@benchmark("translation_cache/disk_hit", number=2000)
+def bench_translation_cache_disk_hit():
+    from backend.translation_cache import TranslationCache
+    path = str(TMP_DIR / "translation_cache.db")
+    TranslationCache(path=path).put(fixtures.STRUCTURED_ANSWER, 'en', 'hi', "[hi] answer")
+    # A fresh process starts with an empty LRU; max_entries=0 forces every lookup to sqlite
+    cache = TranslationCache(max_entries=0, path=path)
+    return lambda: cache.get(fixtures.STRUCTURED_ANSWER, 'en', 'hi')
+
+
+@benchmark("get_legal_context/en", number=2000)
+def bench_legal_context_en():
+    from backend.language_prompts import LanguageSpecificPromptManager
+    manager = LanguageSpecificPromptManager()
+    return lambda: manager.get_legal_context(fixtures.ENGLISH_QUERY, 'en')
+
+
+@benchmark("get_legal_context/hi", number=2000)
+def bench_legal_context_hi():
+    from backend.language_prompts import LanguageSpecificPromptManager
+    manager = LanguageSpecificPromptManager()
+    return lambda: manager.get_legal_context(fixtures.HINDI_QUERY, 'hi')
+
+
+# ============== Answer rendering ==============
+
+@benchmark("parse_answer_cards/structured", number=2000)
+def bench_parse_structured():
+    from backend.answer_format import parse_answer_cards
+    return lambda: parse_answer_cards(fixtures.STRUCTURED_ANSWER)
+
+
+@benchmark("parse_answer_cards/unstructured", number=2000)
+def bench_parse_unstructured():
+    from backend.answer_format import parse_answer_cards
+    return lambda: parse_answer_cards(fixtures.UNSTRUCTURED_ANSWER)
+
+
+@benchmark("jargon_explainer/find_terms", number=2000)
+def bench_find_legal_terms():
+    from backend.answer_format import find_legal_terms
+    return lambda: find_legal_terms(fixtures.STRUCTURED_ANSWER)
+
+
+# ============== Chat history ==============
+
+def _chat_history_setup(count: int, operation: str, source_refs: bool = False):
+    from backend.chat_history import load_chat_sessions, save_chat_sessions
+    path = TMP_DIR / f"chat_history_{count}{'_refs' if source_refs else ''}.json"
+    sessions = fixtures.make_sessions(count, source_refs=source_refs)
+    save_chat_sessions(sessions, path)
+    if operation == "load":
+        return lambda: load_chat_sessions(path)
+    return lambda: save_chat_sessions(sessions, path)
+
+
+@benchmark("chat_history/load_1k", number=5, repeat=5)
+def bench_load_1k():
+    return _chat_history_setup(1000, "load")
+
+
+@benchmark("chat_history/save_1k", number=5, repeat=5)
+def bench_save_1k():
+    return _chat_history_setup(1000, "save")
+
+
+@benchmark("chat_history/load_10k", number=1, repeat=3)
+def bench_load_10k():
+    return _chat_history_setup(10000, "load")
+
+
+@benchmark("chat_history/save_10k", number=1, repeat=3)
+def bench_save_10k():
+    return _chat_history_setup(10000, "save")
+
+
+@benchmark("chat_history/load_10k_refs", number=1, repeat=3)
+def bench_load_10k_refs():
+    # Sources stored as chunk references instead of 300-character previews
+    return _chat_history_setup(10000, "load", source_refs=True)
+
+
+def _legacy_deserialize_sources(sources_data) -> list:
+    """deserialize_sources as it was before SourceRef (a class defined per call), kept as a reference point"""
+    class DocLike:
+        def __init__(self, source, content):
+            self.metadata = {"source": source}
+            self.page_content = content
+    return [DocLike(d["source"], d["content"]) for d in (sources_data or [])]
+
+
+@benchmark("chat_history/sources_legacy_1k", number=5, repeat=5)
+def bench_sources_legacy():
+    stored = [m["sources"] for s in fixtures.make_sessions(1000) for m in s["messages"]]
+    return lambda: [_legacy_deserialize_sources(sources) for sources in stored]
+
+
+@benchmark("chat_history/sources_refs_1k", number=5, repeat=5)
+def bench_sources_refs():
+    from backend.chat_history import deserialize_sources
+    stored = [m["sources"] for s in fixtures.make_sessions(1000, source_refs=True) for m in s["messages"]]
+    return lambda: [deserialize_sources(sources) for sources in stored]
+
+
+def _chat_turn_setup(count: int, backend: str):
+    """One chat turn as the app runs it: load the current session, save the answer, redraw the sidebar"""
+    from backend.chat_history import save_chat_sessions
+    from backend.chat_store import JSONChatStore, SQLiteChatStore, UserChatStore
+    sessions = fixtures.make_sessions(count)
+    json_path = TMP_DIR / f"chat_turn_{count}.json"
+    save_chat_sessions(sessions, json_path)
+    if backend == "json":
+        backing = JSONChatStore(TMP_DIR / "chat_turn_users", legacy_path=json_path)
+    else:
+        backing = SQLiteChatStore(TMP_DIR / f"chat_turn_{count}_{backend}.db", json_path=json_path)
+    # The imported history is the shared legacy one (user '')
+    if backend == "write_behind":
+        from backend.chat_cache import WriteBehindChatStore
+        store = WriteBehindChatStore(backing, '', journal_dir=TMP_DIR / "chat_turn_journal")
+    else:
+        store = UserChatStore(backing, '')
+    session_id = store.create_session()
+
+    def turn():
+        store.get_session(session_id)
+        store.append_message(session_id, fixtures.ENGLISH_QUERY, fixtures.STRUCTURED_ANSWER, [])
+        store.list_sessions(limit=8)
+        store.get_messages(session_id)
+    return turn
+
+
+@benchmark("chat_store/turn_json_10k", number=1, repeat=3)
+def bench_chat_turn_json_10k():
+    return _chat_turn_setup(10000, "json")
+
+
+@benchmark("chat_store/turn_sqlite_10k", number=50, repeat=5)
+def bench_chat_turn_sqlite_10k():
+    return _chat_turn_setup(10000, "sqlite")
+
+
+@benchmark("chat_store/turn_write_behind_10k", number=50, repeat=5)
+def bench_chat_turn_write_behind_10k():
+    # Reads from memory, one journal append per turn; flushes to sqlite happen in the background
+    return _chat_turn_setup(10000, "write_behind")
+
+
+@benchmark("chat_store/sidebar_page_sqlite_10k", number=500, repeat=5)
+def bench_chat_sidebar_page():
+    from backend.chat_store import SQLiteChatStore, UserChatStore, session_cursor
+    backing = SQLiteChatStore(TMP_DIR / "chat_sidebar.db")
+    with backing._transaction() as conn:
+        conn.executemany(
+            "INSERT INTO sessions (id, user_id, title, created) VALUES (?, ?, ?, ?)",
+            [(f"{i:08x}", f"user{i % 1000}", "What is the law on theft?", f"2024-01-{1 + i % 28:02d}T{i % 24:02d}:00:00")
+             for i in range(10000)]
+        )
+    store = UserChatStore(backing, "user7")
+    first_page = store.list_sessions(limit=9)
+
+    def sidebar():
+        # Second page of one user's history among 10k sessions of 1,000 users
+        store.list_sessions(limit=9, after=session_cursor(first_page[7]))
+    return sidebar
+
+
+def _chat_search_setup(count: int, backend: str):
+    """A sidebar search of a user's history of count sessions (two messages each)"""
+    from backend.chat_history import save_chat_sessions
+    from backend.chat_store import JSONChatStore, SQLiteChatStore, UserChatStore
+    json_path = TMP_DIR / f"chat_search_{count}.json"
+    save_chat_sessions(fixtures.make_sessions(count), json_path)
+    if backend == "json":
+        backing = JSONChatStore(TMP_DIR / "chat_search_users", legacy_path=json_path)
+    else:
+        backing = SQLiteChatStore(TMP_DIR / f"chat_search_{count}.db", json_path=json_path)
+    store = UserChatStore(backing, '')
+    # One topic in eight: about 2,500 of the 20,000 messages match
+    return lambda: store.search("divorce", limit=10)
+
+
+@benchmark("chat_store/search_json_10k", number=1, repeat=3)
+def bench_chat_search_json_10k():
+    return _chat_search_setup(10000, "json")
+
+
+@benchmark("chat_store/search_sqlite_10k", number=50, repeat=5)
+def bench_chat_search_sqlite_10k():
+    return _chat_search_setup(10000, "sqlite")
+
+
+# ============== Ingestion & retrieval ==============
+
+@benchmark("pdf/process_pdf", number=1, repeat=3)
+def bench_process_pdf():
+    try:
+        from backend.pdf_processor import PDFProcessor
+    except ImportError as e:
+        raise BenchmarkSkipped(f"PDF dependencies missing: {e}")
+    pdf_path = REPO_ROOT / "250883_english_01042024.pdf"
+    if not pdf_path.exists():
+        raise BenchmarkSkipped(f"{pdf_path.name} not found")
+    processor = PDFProcessor(chunk_size=1000, chunk_overlap=200)
+
+    def run():
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            return processor.process_pdf(str(pdf_path))
+    return run
+
+
+@benchmark("vector_store/similarity_search", number=200)
+def bench_similarity_search():
+    try:
+        from langchain_core.documents import Document
+        from backend.vector_store import VectorStoreManager
+        manager = VectorStoreManager(str(TMP_DIR / "vector_store"))
+        manager._embeddings = HashEmbeddings()  # offline stand-in for MiniLM
+        documents = [
+            Document(page_content=chunk["text"], metadata=chunk["metadata"])
+            for chunk in fixtures.make_legal_chunks(2000)
+        ]
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            manager.create_vector_store(documents)
+    except ImportError as e:
+        raise BenchmarkSkipped(f"vector store dependencies missing: {e}")
+    return lambda: manager.similarity_search(fixtures.ENGLISH_QUERY, k=5)
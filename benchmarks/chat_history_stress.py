@@ -0,0 +1,186 @@
+#!/usr/bin/env python
+"""
+Chat History Write Stress Test
+Many processes × threads append messages to the same few sessions of one
+chat_history.json at once, then the file is checked for lost, duplicated and
+corrupted writes. Modes:
+
+    append   append_chat_message (locked read-modify-write, atomic rename)
+    blind    load_chat_sessions → change the stale copy → save_chat_sessions (merge on save)
+    legacy   the unlocked load → open(..., "w") rewrite chat_history.py used to do, for comparison
+
+Usage (from the project root):
+    python -m benchmarks.chat_history_stress
+    python -m benchmarks.chat_history_stress --mode blind --processes 4 --threads 8
+    python -m benchmarks.chat_history_stress --mode legacy     # shows the lost updates
+"""
+
+import sys
+import json
+import time
+import tempfile
+import argparse
+import threading
+import statistics
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+parent_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(parent_dir))
+
+from benchmarks import fixtures
+from benchmarks.load_test import percentile
+
+MODES = ["append", "blind", "legacy"]
+
+
+def _legacy_append(session_id: str, query: str, answer: str, path: Path):
+    """The pre-locking write path: unlocked load, then open(..., "w") with errors swallowed"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            sessions = json.load(f)
+    except Exception:
+        sessions = []
+    for s in sessions:
+        if s["id"] == session_id:
+            s["messages"].append({"q": query, "a": answer, "lang": "en", "sources": []})
+            break
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(sessions, f, ensure_ascii=False, indent=2)
+    except Exception:
+        pass
+
+
+def _blind_append(session_id: str, query: str, answer: str, path: Path):
+    """A writer holding a copy it loaded earlier: change it and save it whole"""
+    from backend.chat_history import load_chat_sessions, save_chat_sessions
+    sessions = load_chat_sessions(path)
+    for s in sessions:
+        if s["id"] == session_id:
+            s["messages"].append({"q": query, "a": answer, "lang": "en", "sources": []})
+            break
+    save_chat_sessions(sessions, path)
+
+
+def _write(mode: str, session_id: str, query: str, answer: str, path: Path):
+    if mode == "legacy":
+        _legacy_append(session_id, query, answer, path)
+    elif mode == "blind":
+        _blind_append(session_id, query, answer, path)
+    else:
+        from backend.chat_history import append_chat_message
+        append_chat_message(session_id, query, answer, [], path)
+
+
+def run_process(process_index: int, args_dict: dict, session_ids: list, path: str) -> list:
+    """One worker process: its threads each append args.writes messages; returns latencies in ms"""
+    latencies = []
+    lock = threading.Lock()
+
+    def writer(thread_index: int):
+        mine = []
+        for i in range(args_dict["writes"]):
+            session_id = session_ids[(process_index + thread_index + i) % len(session_ids)]
+            start = time.perf_counter()
+            _write(args_dict["mode"], session_id, f"p{process_index}-t{thread_index}-{i}",
+                   fixtures.STRUCTURED_ANSWER, Path(path))
+            mine.append((time.perf_counter() - start) * 1000)
+        with lock:
+            latencies.extend(mine)
+
+    threads = [threading.Thread(target=writer, args=(t,)) for t in range(args_dict["threads"])]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies
+
+
+def verify(path: Path, expected: set) -> dict:
+    """Lost, duplicated and unexpected messages in the final file"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            sessions = json.load(f)
+    except (OSError, ValueError):
+        return {"corrupt": True, "persisted": 0, "lost": len(expected), "duplicated": 0, "sessions": 0}
+    counts = Counter(m["q"] for s in sessions for m in s.get("messages", []) if m["q"] in expected)
+    return {
+        "corrupt": False,
+        "sessions": len(sessions),
+        "persisted": sum(counts.values()),
+        "lost": len(expected - set(counts)),
+        "duplicated": sum(n - 1 for q, n in counts.items() if n > 1),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Concurrent writers on one chat_history.json")
+    parser.add_argument("--mode", choices=MODES, default="append")
+    parser.add_argument("--processes", type=int, default=4, help="Writer processes")
+    parser.add_argument("--threads", type=int, default=4, help="Writer threads per process")
+    parser.add_argument("--writes", type=int, default=25, help="Messages appended per thread")
+    parser.add_argument("--sessions", type=int, default=4, help="Sessions the writers share")
+    parser.add_argument("--history", type=int, default=200, help="Sessions already in the file")
+    parser.add_argument("--json", dest="json_path", help="Also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    from backend.chat_history import save_chat_sessions
+
+    writers = args.processes * args.threads
+    total = writers * args.writes
+    print("\n" + "=" * 70)
+    print(f"  🧵 Chat History Stress: {args.processes} processes × {args.threads} threads × "
+          f"{args.writes} writes ({args.mode})")
+    print("=" * 70 + "\n")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = Path(workdir) / "chat_history.json"
+        sessions = fixtures.make_sessions(args.history)
+        session_ids = [f"stress{i:02d}" for i in range(args.sessions)]
+        for sid in session_ids:
+            sessions.insert(0, {"id": sid, "title": "New Chat", "created": "2024-02-01T10:00:00", "messages": []})
+        save_chat_sessions(sessions, path, merge=False)
+        expected = {
+            f"p{p}-t{t}-{i}" for p in range(args.processes) for t in range(args.threads) for i in range(args.writes)
+        }
+
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=args.processes) as pool:
+            futures = [pool.submit(run_process, p, vars(args), session_ids, str(path)) for p in range(args.processes)]
+            latencies = [ms for future in futures for ms in future.result()]
+        wall = time.perf_counter() - start
+
+        report = {
+            "mode": args.mode,
+            "writers": writers,
+            "writes": total,
+            "wall_s": round(wall, 2),
+            "writes_per_s": round(total / wall, 1) if wall else 0.0,
+            "p50_ms": round(percentile(latencies, 50), 1),
+            "p90_ms": round(percentile(latencies, 90), 1),
+            "p99_ms": round(percentile(latencies, 99), 1),
+            "mean_ms": round(statistics.mean(latencies), 1) if latencies else 0.0,
+            "file_kb": round(path.stat().st_size / 1024, 1) if path.exists() else 0.0,
+        }
+        report.update(verify(path, expected))
+
+    print(f"  Writes:        {total} from {writers} concurrent writers in {report['wall_s']} s "
+          f"({report['writes_per_s']} writes/s)")
+    print(f"  Latency:       p50 {report['p50_ms']} ms • p90 {report['p90_ms']} ms • p99 {report['p99_ms']} ms")
+    print(f"  Persisted:     {report['persisted']}/{total} messages in {report['sessions']} sessions "
+          f"({report['file_kb']} KB)")
+    print(f"  Lost updates:  {report['lost']}")
+    print(f"  Duplicated:    {report['duplicated']}")
+    print(f"  Corrupt file:  {'YES' if report['corrupt'] else 'no'}\n")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    failed = report["corrupt"] or report["lost"] or report["duplicated"]
+    return 1 if failed and args.mode != "legacy" else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,258 @@
+#!/usr/bin/env python
+"""
+Cold-Start Benchmark
+Measures import-time breakdown, time to first render of the login page and time to
+first answer, each in a fresh interpreter, and enforces the login-page import budget.
+
+Usage (from the project root):
+    python -m benchmarks.cold_start
+    python -m benchmarks.cold_start --login-budget-ms 2500 --json cold_start.json
+    python -m benchmarks.cold_start --real-models   # first answer from the saved FAISS index
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import argparse
+import subprocess
+from collections import defaultdict
+from pathlib import Path
+
+parent_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(parent_dir))
+
+# Modules that must not be loaded before the login page has rendered
+FORBIDDEN_AT_LOGIN = (
+    "torch",
+    "transformers",
+    "sentence_transformers",
+    "tensorflow",
+    "faiss",
+    "langchain",
+    "langchain_core",
+    "langchain_community",
+    "langchain_google_genai",
+    "google.generativeai",
+    "pypdf",
+)
+
+# (label, module) pairs whose import cost is broken down with -X importtime
+IMPORT_TARGETS = [
+    ("login page", "backend.auth"),
+    ("main app helpers", "frontend.multilingual_ui"),
+    ("first answer", "backend.rag_chain"),
+]
+
+
+def _child_env() -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(parent_dir), env.get("PYTHONPATH")]))
+    env.setdefault("PYTHONDONTWRITEBYTECODE", "1")
+    return env
+
+
+def _run_child(args: list, workdir: str) -> subprocess.CompletedProcess:
+    # A temp cwd keeps UserDatabase from creating legal_db/ inside the project
+    return subprocess.run(
+        [sys.executable] + args, cwd=workdir, env=_child_env(),
+        capture_output=True, text=True, timeout=600,
+    )
+
+
+def parse_importtime(stderr: str, module: str) -> dict:
+    """Aggregate `-X importtime` output by top-level package.
+
+    Args:
+        stderr: Output of `python -X importtime -c "import <module>"`
+        module: The imported module; its cumulative time is the total
+
+    Returns:
+        {"total_us": int, "packages": {package: self_us}}
+    """
+    packages = defaultdict(int)
+    total_us = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue  # header row
+        name = parts[2].strip()
+        packages[name.split(".")[0]] += self_us
+        if name == module:
+            total_us = cumulative_us
+    return {"total_us": total_us, "packages": dict(packages)}
+
+
+def measure_imports(module: str, workdir: str) -> dict:
+    """Import a module in a fresh interpreter with -X importtime"""
+    start = time.perf_counter()
+    proc = _run_child(["-X", "importtime", "-c", f"import {module}"], workdir)
+    wall_ms = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "failed"
+        return {"module": module, "error": error}
+    breakdown = parse_importtime(proc.stderr, module)
+    breakdown.update({"module": module, "wall_ms": round(wall_ms, 1)})
+    return breakdown
+
+
+def _forbidden_loaded() -> list:
+    return sorted(
+        name for name in sys.modules
+        if any(name == f or name.startswith(f + ".") for f in FORBIDDEN_AT_LOGIN)
+    )
+
+
+def child_login() -> dict:
+    """Render the login page once via Streamlit's AppTest (runs in the child)"""
+    start = time.perf_counter()
+    try:
+        from streamlit.testing.v1 import AppTest
+    except ImportError as e:
+        return {"error": f"streamlit not available: {e}"}
+    streamlit_ms = (time.perf_counter() - start) * 1000
+
+    run_start = time.perf_counter()
+    app = AppTest.from_file(str(parent_dir / "frontend" / "authenticated_app.py"), default_timeout=120)
+    app.run()
+    render_ms = (time.perf_counter() - run_start) * 1000
+    return {
+        "streamlit_import_ms": round(streamlit_ms, 1),
+        "render_ms": round(render_ms, 1),
+        "total_ms": round((time.perf_counter() - start) * 1000, 1),
+        "exceptions": [str(e.value) for e in app.exception],
+        "forbidden_loaded": _forbidden_loaded(),
+    }
+
+
+def child_answer(real_models: bool, chunks: int) -> dict:
+    """Import the RAG stack, build an index and answer one question (runs in the child)"""
+    start = time.perf_counter()
+    try:
+        from backend import config
+        from benchmarks import fixtures
+        from benchmarks.stand_ins import build_offline_chain
+    except ImportError as e:
+        return {"error": str(e)}
+    import_ms = (time.perf_counter() - start) * 1000
+
+    index_start = time.perf_counter()
+    index_path = config.VECTOR_STORE_PATH if real_models else None
+    try:
+        chain = build_offline_chain(fixtures.make_legal_chunks(chunks), index_path=index_path)
+    except ImportError as e:
+        return {"error": str(e)}
+    index_ms = (time.perf_counter() - index_start) * 1000
+
+    query_start = time.perf_counter()
+    result = chain.query(fixtures.ENGLISH_QUERY)
+    query_ms = (time.perf_counter() - query_start) * 1000
+    return {
+        "import_ms": round(import_ms, 1),
+        "index_ms": round(index_ms, 1),
+        "query_ms": round(query_ms, 1),
+        "total_ms": round((time.perf_counter() - start) * 1000, 1),
+        "retriever": type(chain.retriever).__name__,
+        "sources": len(result["source_documents"]),
+    }
+
+
+def run_child_mode(mode: str, workdir: str, extra: list = None) -> dict:
+    """Run this script in a fresh interpreter and collect its JSON result"""
+    start = time.perf_counter()
+    proc = _run_child(["-m", "benchmarks.cold_start", "--child", mode] + (extra or []), workdir)
+    wall_ms = (time.perf_counter() - start) * 1000
+    try:
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+    except (IndexError, ValueError):
+        error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "no output"
+        return {"error": error}
+    result["process_wall_ms"] = round(wall_ms, 1)
+    return result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Cold-start benchmark")
+    parser.add_argument("--top", type=int, default=12, help="Packages to show per import breakdown")
+    parser.add_argument("--login-budget-ms", type=float, default=None,
+                        help="Fail if the login page takes longer than this to render")
+    parser.add_argument("--real-models", action="store_true",
+                        help="First answer from the saved FAISS index and real embedding model")
+    parser.add_argument("--chunks", type=int, default=2000, help="Synthetic chunks for the offline index")
+    parser.add_argument("--json", dest="json_path", help="Also write the report as JSON")
+    parser.add_argument("--child", choices=["login", "answer"], help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child == "login":
+        print(json.dumps(child_login()))
+        return 0
+    if args.child == "answer":
+        print(json.dumps(child_answer(args.real_models, args.chunks)))
+        return 0
+
+    workdir = tempfile.mkdtemp(prefix="legalai_cold_start_")
+    report = {"imports": {}, "login": None, "first_answer": None}
+    failures = []
+
+    print("\n" + "=" * 70)
+    print("  🧊 Cold Start")
+    print("=" * 70)
+
+    for label, module in IMPORT_TARGETS:
+        result = measure_imports(module, workdir)
+        report["imports"][label] = result
+        print(f"\n  Import: {label} ({module})")
+        if "error" in result:
+            print(f"    skipped: {result['error']}")
+            continue
+        print(f"    total {result['total_us'] / 1000:.1f} ms • process {result['wall_ms']} ms")
+        ranked = sorted(result["packages"].items(), key=lambda item: item[1], reverse=True)
+        for package, self_us in ranked[:args.top]:
+            print(f"    {package:32} {self_us / 1000:>9.1f} ms")
+
+    login = run_child_mode("login", workdir)
+    report["login"] = login
+    print("\n  Login page (first render)")
+    if "error" in login:
+        print(f"    skipped: {login['error']}")
+    else:
+        print(f"    streamlit import {login['streamlit_import_ms']} ms • render {login['render_ms']} ms • "
+              f"process {login['process_wall_ms']} ms")
+        if login["exceptions"]:
+            print(f"    ⚠️ exceptions: {login['exceptions']}")
+        if login["forbidden_loaded"]:
+            failures.append(f"heavy modules loaded at login: {', '.join(login['forbidden_loaded'])}")
+        if args.login_budget_ms is not None and login["total_ms"] > args.login_budget_ms:
+            failures.append(f"login render {login['total_ms']} ms > budget {args.login_budget_ms} ms")
+
+    extra = ["--chunks", str(args.chunks)] + (["--real-models"] if args.real_models else [])
+    answer = run_child_mode("answer", workdir, extra)
+    report["first_answer"] = answer
+    print("\n  First answer")
+    if "error" in answer:
+        print(f"    skipped: {answer['error']}")
+    else:
+        print(f"    imports {answer['import_ms']} ms • index {answer['index_ms']} ms ({answer['retriever']}) • "
+              f"query {answer['query_ms']} ms • process {answer['process_wall_ms']} ms")
+
+    report["failures"] = failures
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    print()
+    if failures:
+        for failure in failures:
+            print(f"  ❌ {failure}")
+        return 1
+    print("  ✅ Cold-start budget met")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,245 @@
+#!/usr/bin/env python
+"""
+Cross-Lingual Retrieval Benchmark
+Compares the two ways a question in an Indian language can reach the English statute
+chunks, on the labelled questions in fixtures.CROSS_LINGUAL_QUERIES:
+
+    translate → retrieve   translate the question to English, search the English-only index
+    cross-lingual          search the multilingual index with the question as typed
+
+and reports recall@k, MRR and end-to-end latency per language and overall. End to end
+is query translation + search + a stand-in generation step (OfflineLLM with --llm-latency,
+the same for both paths), so the latency gap is the one a user would see.
+
+Usage (from the project root):
+    python -m benchmarks.cross_lingual                    # saved indexes, built from the PDFs if missing
+    python -m benchmarks.cross_lingual --k 3 --json cross_lingual.json
+    python -m benchmarks.cross_lingual --offline          # harness check: hash embeddings, stand-in translation
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import statistics
+from pathlib import Path
+from typing import Callable, Dict, List
+
+parent_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(parent_dir))
+
+from benchmarks import fixtures
+from benchmarks.load_test import percentile
+
+# (path name, needs translation)
+PATHS = [("translate→retrieve", True), ("cross-lingual", False)]
+
+
+class BruteForceRetriever:
+    """Exact cosine search over precomputed embeddings (used by --offline, no FAISS needed)"""
+
+    def __init__(self, embeddings, texts: List[str]):
+        self.embeddings = embeddings
+        self.texts = texts
+        self.vectors = embeddings.embed_documents(texts)
+
+    def search(self, query: str, k: int) -> List[str]:
+        q = self.embeddings.embed_query(query)
+        scores = [sum(a * b for a, b in zip(q, v)) for v in self.vectors]
+        ranked = sorted(range(len(scores)), key=scores.__getitem__, reverse=True)
+        return [self.texts[i] for i in ranked[:k]]
+
+
+class ManagerRetriever:
+    """Search through a loaded VectorStoreManager, as the app does"""
+
+    def __init__(self, manager):
+        self.manager = manager
+
+    def search(self, query: str, k: int) -> List[str]:
+        return [doc.page_content for doc in self.manager.similarity_search(query, k=k)]
+
+
+def _load_or_build(manager, documents_fn: Callable[[], list], label: str):
+    """Load the saved index if it exists, otherwise embed the PDFs in memory (not saved)"""
+    start = time.perf_counter()
+    if os.path.isdir(manager.store_path) and os.listdir(manager.store_path):
+        manager.load_vector_store()
+        how = "loaded"
+    else:
+        manager.create_vector_store(documents_fn())
+        how = "built"
+    print(f"  {label}: {how} in {time.perf_counter() - start:.1f}s ({manager.model_name})")
+    return ManagerRetriever(manager)
+
+
+def build_real(args):
+    """English-only and multilingual retrievers over the statute PDFs, plus the app's translator"""
+    from backend import config
+    from backend.vector_store import create_vector_store_manager
+    from backend.pdf_processor import PDFProcessor
+    from backend.multilingual import MultilingualProcessor
+    from backend.translation_cache import TranslationCache
+
+    documents = []
+
+    def load_documents():
+        if not documents:
+            processor = PDFProcessor(chunk_size=config.CHUNK_SIZE, chunk_overlap=config.CHUNK_OVERLAP)
+            documents.extend(processor.process_multiple_pdfs(config.PDF_FILES))
+            if args.max_chunks:
+                del documents[args.max_chunks:]
+        return documents
+
+    english = _load_or_build(create_vector_store_manager(multilingual=False), load_documents, "English index")
+    multilingual = _load_or_build(create_vector_store_manager(multilingual=True), load_documents, "Multilingual index")
+    # Fresh in-memory cache so every translation is timed cold
+    processor = MultilingualProcessor(translation_cache=TranslationCache())
+    return english, multilingual, processor
+
+
+def build_offline(args):
+    """Hash embeddings and a stand-in translator: exercises the harness, recall is not meaningful"""
+    from benchmarks.stand_ins import HashEmbeddings
+    from backend.multilingual import MultilingualProcessor
+    from backend.translation_cache import TranslationCache
+    from backend.translation_engines import StandInEngine
+
+    texts = [chunk["text"] for chunk in fixtures.make_legal_chunks(args.chunks)]
+    retriever = BruteForceRetriever(HashEmbeddings(), texts)
+    processor = MultilingualProcessor(
+        translation_cache=TranslationCache(),
+        engines=[StandInEngine(latency=args.translate_latency)],
+    )
+    return retriever, retriever, processor
+
+
+def evaluate(english, multilingual, processor, k: int, llm) -> List[Dict]:
+    """Run every labelled question through both paths, each answered by llm from the retrieved chunks"""
+    relevance = {topic: re.compile(pattern, re.IGNORECASE)
+                 for topic, pattern in fixtures.CROSS_LINGUAL_RELEVANCE.items()}
+    rows = []
+    for topic, by_language in fixtures.CROSS_LINGUAL_QUERIES.items():
+        for lang, question in by_language.items():
+            for path, translate in PATHS:
+                start = time.perf_counter()
+                query, translated_ok, translate_s = question, True, 0.0
+                if translate and lang != 'en':
+                    query, translated_ok = processor.translate_text(question, lang, 'en', canonical=True)
+                    translate_s = time.perf_counter() - start
+                search_start = time.perf_counter()
+                results = (english if translate else multilingual).search(query, k)
+                generate_start = time.perf_counter()
+                "".join(llm.answer(question, "\n\n".join(results)))
+                total_s = time.perf_counter() - start
+
+                rank = next((i for i, text in enumerate(results, 1) if relevance[topic].search(text)), 0)
+                rows.append({
+                    "path": path, "topic": topic, "lang": lang,
+                    "hit": rank > 0, "rr": 1.0 / rank if rank else 0.0,
+                    "seconds": total_s, "translate_seconds": translate_s,
+                    "search_seconds": generate_start - search_start,
+                    "generate_seconds": total_s - (generate_start - start),
+                    "translated": translated_ok,
+                })
+    return rows
+
+
+def summarize(rows: List[Dict]) -> Dict:
+    """Per path: overall and per-language recall@k, MRR and latency"""
+    summary = {}
+    for path, _ in PATHS:
+        path_rows = [r for r in rows if r["path"] == path]
+
+        def stats(subset):
+            seconds = [r["seconds"] for r in subset]
+            return {
+                "queries": len(subset),
+                "recall": round(sum(r["hit"] for r in subset) / len(subset), 3),
+                "mrr": round(statistics.mean(r["rr"] for r in subset), 3),
+                "p50_ms": round(percentile(seconds, 50) * 1000, 1),
+                "p90_ms": round(percentile(seconds, 90) * 1000, 1),
+                "translate_ms": round(statistics.mean(r["translate_seconds"] for r in subset) * 1000, 1),
+                "search_ms": round(statistics.mean(r["search_seconds"] for r in subset) * 1000, 1),
+                "generate_ms": round(statistics.mean(r["generate_seconds"] for r in subset) * 1000, 1),
+                "untranslated": sum(not r["translated"] for r in subset),
+            }
+
+        languages = list(dict.fromkeys(r["lang"] for r in path_rows))
+        summary[path] = {
+            "overall": stats(path_rows),
+            "non_english": stats([r for r in path_rows if r["lang"] != 'en']),
+            "by_language": {lang: stats([r for r in path_rows if r["lang"] == lang]) for lang in languages},
+        }
+    return summary
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Cross-lingual retrieval vs translate-then-retrieve")
+    parser.add_argument("--k", type=int, default=5, help="Chunks retrieved per question")
+    parser.add_argument("--max-chunks", type=int, default=0,
+                        help="Embed only the first N PDF chunks when an index has to be built (0 = all)")
+    parser.add_argument("--offline", action="store_true",
+                        help="Hash embeddings + stand-in translation (checks the harness, not quality)")
+    parser.add_argument("--chunks", type=int, default=500, help="Synthetic chunks for --offline")
+    parser.add_argument("--translate-latency", type=float, default=0.05,
+                        help="Stand-in translation latency in seconds for --offline")
+    parser.add_argument("--llm-latency", type=float, default=1.0,
+                        help="Stand-in generation latency in seconds (0 times translation + search only)")
+    parser.add_argument("--json", dest="json_path", help="Also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    print("\n" + "=" * 70)
+    print(f"  🌐 Cross-Lingual Retrieval Benchmark (k={args.k}{', offline' if args.offline else ''})")
+    print("=" * 70 + "\n")
+
+    try:
+        english, multilingual, processor = (build_offline if args.offline else build_real)(args)
+    except ImportError as e:
+        print(f"  Skipped: missing dependency ({e}). Install requirements.txt or use --offline.")
+        return 0
+    except (RuntimeError, FileNotFoundError, OSError) as e:
+        print(f"  Skipped: could not prepare the indexes ({e}).")
+        return 0
+
+    from benchmarks.stand_ins import OfflineLLM
+    rows = evaluate(english, multilingual, processor, args.k, OfflineLLM(latency=args.llm_latency))
+    summary = summarize(rows)
+
+    names = [path for path, _ in PATHS]
+    print(f"\n  {'':8}" + "".join(f"{name:>34}" for name in names))
+    print(f"  {'lang':8}" + f"{'recall   MRR   p50 ms   p90 ms':>34}" * len(names))
+    languages = summary[names[0]]["by_language"]
+    for label, key in [(lang, lang) for lang in languages] + [("non-en", None), ("overall", None)]:
+        cells = []
+        for name in names:
+            if key is not None:
+                s = summary[name]["by_language"][key]
+            else:
+                s = summary[name]["non_english" if label == "non-en" else "overall"]
+            cells.append(f"{s['recall']:>9.2f}{s['mrr']:>6.2f}{s['p50_ms']:>9.1f}{s['p90_ms']:>9.1f}")
+        print(f"  {label:8}" + "".join(f"{cell:>34}" for cell in cells))
+
+    translated = summary[names[0]]["non_english"]
+    print("\n  Mean per question (ms):  " + " • ".join(
+        f"{name} search {summary[name]['overall']['search_ms']}, generate {summary[name]['overall']['generate_ms']}"
+        for name in names
+    ))
+    print(f"  Translation: mean {translated['translate_ms']} ms per question, "
+          f"{translated['untranslated']} left untranslated")
+    for entry in processor.get_engine_report():
+        if entry["calls"]:
+            print(f"    {entry['engine']:12} {entry['hits']:>3}/{entry['calls']:<3} hits • "
+                  f"mean {entry['mean_ms']:.1f} ms")
+    print()
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"k": args.k, "offline": args.offline, "summary": summary}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
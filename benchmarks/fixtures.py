@@ -0,0 +1,174 @@
+"""
+Benchmark Fixtures
+Fixed, deterministic inputs shared by the benchmarks
+"""
+
+import random
+from typing import Dict, List
+
+ENGLISH_QUERY = "What is the punishment for theft and cheating under IPC 420? Can I get anticipatory bail?"
+
+HINDI_QUERY = "चोरी और धोखाधड़ी के लिए सजा क्या है? क्या मुझे अग्रिम जमानत मिल सकती है?"
+
+TAMIL_QUERY = "திருட்டு என்றால் என்ன? அதற்கான தண்டனை என்ன?"
+
+# Spellings of one question that share a canonical cache key (digits, ZWJ, act names, citation order)
+CANONICAL_QUERY_VARIANTS = [
+    "आईपीसी की धारा 420 क्या है?",
+    "धारा ४२० आईपीसी क्या है",
+    "IPC धारा 420 क्या है ?",
+    "धारा 420 भारतीय दंड संहिता क्या\u200d है।",
+]
+
+STRUCTURED_ANSWER = """**SUMMARY:** Cheating under **Section 318 BNS** (old **IPC 420**) is punishable with imprisonment up to 7 years and fine.
+
+**KEY POINTS:**
+• Cheating requires dishonest inducement to deliver property
+• It is a **cognizable** and **non-bailable** offense
+• The victim can file an **FIR** at the nearest police station
+• Anticipatory bail can be sought before arrest
+
+**LEGAL PROVISION:** **Bharatiya Nyaya Sanhita, 2023 – Section 318(4)**: Whoever cheats and thereby dishonestly induces the person deceived to deliver any property shall be punished with imprisonment of either description for a term which may extend to seven years, and shall also be liable to fine.
+
+**NEXT STEPS:**
+1. File an FIR or a complaint before the **Magistrate** with all payment records
+2. Consult a lawyer about **anticipatory bail** if you fear arrest"""
+
+UNSTRUCTURED_ANSWER = (
+    "Based on general Indian law (not from uploaded documents): theft is defined as dishonestly "
+    "taking movable property out of the possession of a person without consent.\n\n"
+    "The punishment may extend to three years of imprisonment, fine, or both. The offense is "
+    "cognizable and the police can arrest without a warrant.\n\n"
+    "You should file an FIR immediately and keep copies of all documents."
+)
+
+# ~10 KB of pasted complaint text mixing Hindi and English
+FIR_TEXT = ("प्रथम सूचना रिपोर्ट: दिनांक 12/03/2024 को शिकायतकर्ता के घर से सोने के गहने चोरी हुए। "
+            "The complainant states that the accused entered the house at night. ") * 60
+
+# ~100 KB paste (a long complaint with annexures)
+FIR_TEXT_100KB = FIR_TEXT * 10
+
+# Labelled cross-lingual retrieval set: the same question in English and all 12 Indian
+# languages; a retrieved chunk is relevant when it matches the topic's pattern
+CROSS_LINGUAL_QUERIES = {
+    "theft": {
+        "en": "What is the punishment for theft?",
+        "hi": "चोरी की सजा क्या है?",
+        "bn": "চুরির শাস্তি কী?",
+        "ta": "திருட்டுக்கான தண்டனை என்ன?",
+        "te": "దొంగతనానికి శిక్ష ఏమిటి?",
+        "mr": "चोरीसाठी शिक्षा काय आहे?",
+        "gu": "ચોરી માટે સજા શું છે?",
+        "kn": "ಕಳ್ಳತನಕ್ಕೆ ಶಿಕ್ಷೆ ಏನು?",
+        "ml": "മോഷണത്തിനുള്ള ശിക്ഷ എന്താണ്?",
+        "pa": "ਚੋਰੀ ਦੀ ਸਜ਼ਾ ਕੀ ਹੈ?",
+        "ur": "چوری کی سزا کیا ہے؟",
+        "or": "ଚୋରି ପାଇଁ ଦଣ୍ଡ କ'ଣ?",
+    },
+    "murder": {
+        "en": "What is the punishment for murder?",
+        "hi": "हत्या की सजा क्या है?",
+        "bn": "খুনের শাস্তি কী?",
+        "ta": "கொலைக்கான தண்டனை என்ன?",
+        "te": "హత్యకు శిక్ష ఏమిటి?",
+        "mr": "खुनासाठी शिक्षा काय आहे?",
+        "gu": "હત્યા માટે સજા શું છે?",
+        "kn": "ಕೊಲೆಗೆ ಶಿಕ್ಷೆ ಏನು?",
+        "ml": "കൊലപാതകത്തിനുള്ള ശിക്ഷ എന്താണ്?",
+        "pa": "ਕਤਲ ਦੀ ਸਜ਼ਾ ਕੀ ਹੈ?",
+        "ur": "قتل کی سزا کیا ہے؟",
+        "or": "ହତ୍ୟା ପାଇଁ ଦଣ୍ଡ କ'ଣ?",
+    },
+    "cheating": {
+        "en": "What is the punishment for cheating?",
+        "hi": "धोखाधड़ी की सजा क्या है?",
+        "bn": "প্রতারণার শাস্তি কী?",
+        "ta": "ஏமாற்றுதலுக்கான தண்டனை என்ன?",
+        "te": "మోసానికి శిక్ష ఏమిటి?",
+        "mr": "फसवणुकीसाठी शिक्षा काय आहे?",
+        "gu": "છેતરપિંડી માટે સજા શું છે?",
+        "kn": "ವಂಚನೆಗೆ ಶಿಕ್ಷೆ ಏನು?",
+        "ml": "വഞ്ചനയ്ക്കുള്ള ശിക്ഷ എന്താണ്?",
+        "pa": "ਧੋਖਾਧੜੀ ਦੀ ਸਜ਼ਾ ਕੀ ਹੈ?",
+        "ur": "دھوکہ دہی کی سزا کیا ہے؟",
+        "or": "ପ୍ରତାରଣା ପାଇଁ ଦଣ୍ଡ କ'ଣ?",
+    },
+    "kidnapping": {
+        "en": "What is the punishment for kidnapping?",
+        "hi": "अपहरण की सजा क्या है?",
+        "bn": "অপহরণের শাস্তি কী?",
+        "ta": "ஆள் கடத்தலுக்கான தண்டனை என்ன?",
+        "te": "అపహరణకు శిక్ష ఏమిటి?",
+        "mr": "अपहरणासाठी शिक्षा काय आहे?",
+        "gu": "અપહરણ માટે સજા શું છે?",
+        "kn": "ಅಪಹರಣಕ್ಕೆ ಶಿಕ್ಷೆ ಏನು?",
+        "ml": "തട്ടിക്കൊണ്ടുപോകലിനുള്ള ശിക്ഷ എന്താണ്?",
+        "pa": "ਅਗਵਾ ਦੀ ਸਜ਼ਾ ਕੀ ਹੈ?",
+        "ur": "اغوا کی سزا کیا ہے؟",
+        "or": "ଅପହରଣ ପାଇଁ ଦଣ୍ଡ କ'ଣ?",
+    },
+}
+
+CROSS_LINGUAL_RELEVANCE = {
+    "theft": r"\btheft\b",
+    "murder": r"\bmurder\b",
+    "cheating": r"\bcheat",
+    "kidnapping": r"\bkidnap",
+}
+
+SECTION_NAMES = ["theft", "cheating", "assault", "bail", "arrest", "property", "contract", "divorce"]
+
+
+def make_sessions(count: int, messages_per_session: int = 2, seed: int = 42,
+                  source_refs: bool = False) -> List[Dict]:
+    """
+    Generate chat sessions shaped like chat_history.json entries
+
+    Args:
+        source_refs: Store sources as chunk references ({"source", "chunk", "hash",
+            "score", 120-character "content"}) instead of the 300-character previews
+            messages used to carry
+    """
+    rng = random.Random(seed)
+    sessions = []
+    for i in range(count):
+        topic = rng.choice(SECTION_NAMES)
+        messages = []
+        for j in range(messages_per_session):
+            if source_refs:
+                sources = [
+                    {"source": "BNS2023.pdf", "chunk": rng.randint(0, 1200), "hash": f"{rng.getrandbits(48):012x}",
+                     "score": round(rng.uniform(0.3, 1.2), 4), "content": f"Section {rng.randint(1, 358)} " + "x" * 108}
+                    for _ in range(4)
+                ]
+            else:
+                sources = [
+                    {"source": "BNS2023.pdf", "content": f"Section {rng.randint(1, 358)} " + "x" * 280}
+                    for _ in range(4)
+                ]
+            messages.append({
+                "q": f"What is the law on {topic}? (question {j})",
+                "a": STRUCTURED_ANSWER,
+                "sources": sources,
+            })
+        sessions.append({
+            "id": f"{i:08x}",
+            "title": f"What is the law on {topic}?",
+            "created": f"2024-01-{1 + i % 28:02d}T10:00:00",
+            "messages": messages,
+        })
+    return sessions
+
+
+def make_legal_chunks(count: int, seed: int = 7) -> List[Dict]:
+    """Generate fixed statute-like chunks as {'text', 'metadata'} dicts"""
+    rng = random.Random(seed)
+    chunks = []
+    for i in range(count):
+        topic = rng.choice(SECTION_NAMES)
+        text = (f"Section {i + 1}. Whoever commits {topic} shall be punished with imprisonment "
+                f"of either description for a term which may extend to {rng.randint(1, 10)} years, "
+                f"or with fine, or with both. Explanation: {topic} includes attempts and abetment.")
+        chunks.append({"text": text, "metadata": {"source": "synthetic.pdf", "chunk_index": i}})
+    return chunks
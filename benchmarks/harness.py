@@ -0,0 +1,111 @@
+"""
+Benchmark Harness
+Registers micro-benchmarks, times them and compares results against a JSON baseline
+"""
+
+import json
+import time
+import statistics
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+
+# Regressions smaller than this are treated as timer noise
+MIN_REGRESSION_US = 1.0
+
+
+class BenchmarkSkipped(Exception):
+    """Raised by a benchmark setup when an optional dependency or input is missing"""
+
+
+class Benchmark:
+    """A named benchmark: setup() returns the zero-argument callable that is timed"""
+
+    def __init__(self, name: str, setup: Callable[[], Callable[[], object]], number: int, repeat: int):
+        self.name = name
+        self.setup = setup
+        self.number = number
+        self.repeat = repeat
+
+    def run(self, quick: bool = False) -> Dict[str, float]:
+        """Time the benchmark and return per-call statistics in microseconds"""
+        stmt = self.setup()
+        stmt()  # warm-up (imports, lazy caches)
+        number = max(1, self.number // 10) if quick else self.number
+        repeat = min(self.repeat, 3) if quick else self.repeat
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                stmt()
+            timings.append((time.perf_counter() - start) / number * 1e6)
+        return {
+            "median_us": round(statistics.median(timings), 3),
+            "min_us": round(min(timings), 3),
+            "number": number,
+            "repeat": repeat,
+        }
+
+
+_REGISTRY: List[Benchmark] = []
+
+
+def benchmark(name: str, number: int = 100, repeat: int = 5):
+    """Decorator registering a benchmark setup function"""
+    def decorator(setup):
+        _REGISTRY.append(Benchmark(name, setup, number, repeat))
+        return setup
+    return decorator
+
+
+def registered_benchmarks(name_filter: Optional[str] = None) -> List[Benchmark]:
+    """Registered benchmarks, optionally filtered by substring"""
+    return [b for b in _REGISTRY if not name_filter or name_filter in b.name]
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> Dict[str, Dict]:
+    """Load the stored baseline (empty if none yet)"""
+    if not path.exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f).get("results", {})
+
+
+def save_baseline(results: Dict[str, Dict], path: Path = BASELINE_PATH) -> None:
+    """Merge results into the stored baseline"""
+    merged = load_baseline(path)
+    merged.update(results)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"unit": "microseconds per call", "results": dict(sorted(merged.items()))},
+                  f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+
+def find_regressions(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float) -> List[str]:
+    """
+    Compare results to the baseline
+    
+    Args:
+        results: name -> stats from Benchmark.run()
+        baseline: name -> stats loaded from the baseline file
+        threshold: Allowed slowdown factor (1.5 = 50% slower)
+        
+    Returns:
+        Human-readable descriptions of regressed benchmarks
+    """
+    regressions = []
+    for name, stats in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        current, previous = stats["median_us"], base["median_us"]
+        if current > previous * threshold and current - previous > MIN_REGRESSION_US:
+            regressions.append(f"{name}: {previous:.2f} µs → {current:.2f} µs ({current / previous:.2f}x)")
+    return regressions
+
+
+__all__ = [
+    'BASELINE_PATH', 'BenchmarkSkipped', 'Benchmark', 'benchmark',
+    'registered_benchmarks', 'load_baseline', 'save_baseline', 'find_regressions',
+]
@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+"""
+Response-Language Routing Benchmark
+Times the two ways an answer can reach a non-English response language:
+
+    native       Gemini answers directly in the language (language-specific system prompt)
+    translated   Gemini answers in English, then the answer is translated segment by segment
+
+each through the query pipeline run in parallel (independent stages overlapped, answer
+translated line by line while it streams) and sequentially (one stage after another).
+Each question from fixtures.CROSS_LINGUAL_QUERIES is asked in its own language and
+answered in that language.
+
+Usage (from the project root):
+    python -m benchmarks.language_routing                                  # offline stand-ins
+    python -m benchmarks.language_routing --llm-latency 1.5 --translate-latency 0.3
+    python -m benchmarks.language_routing --real-models --limit 12         # Gemini + saved index
+"""
+
+import sys
+import json
+import argparse
+import statistics
+from collections import defaultdict
+from pathlib import Path
+
+parent_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(parent_dir))
+
+from benchmarks import fixtures
+from benchmarks.load_test import percentile
+from benchmarks.stand_ins import build_offline_chain
+
+ROUTES = ["native", "translate"]
+MODES = ["parallel", "sequential"]
+
+
+def _fresh_processor(engines=None):
+    """Translator with empty caches so every post-hoc translation is timed cold"""
+    from backend.multilingual import MultilingualProcessor
+    from backend.translation_cache import TranslationCache
+    from backend.translation_memory import TranslationMemory
+    return MultilingualProcessor(
+        translation_cache=TranslationCache(),
+        engines=engines,
+        translation_memory=TranslationMemory(),
+    )
+
+
+def _reset_translations(processor):
+    """Forget earlier translations so no run is served from another run's cache"""
+    from backend.translation_memory import TranslationMemory
+    processor.translation_cache.clear()
+    processor.translation_memory = TranslationMemory()
+
+
+def build_chains(args) -> dict:
+    """{mode: chain} sharing one index and translator"""
+    if args.real_models:
+        from backend.vector_store import create_vector_store_manager
+        from backend.rag_chain import RAGChain
+        manager = create_vector_store_manager()
+        manager.load_vector_store()
+        chain = RAGChain(manager, multilingual_processor=_fresh_processor())
+        # Every mode asks the same questions; none may be answered from another's cache
+        chain.answer_cache = None
+    else:
+        from backend.translation_engines import StandInEngine
+        chain = build_offline_chain(
+            fixtures.make_legal_chunks(args.chunks), args.llm_latency,
+            multilingual_processor=_fresh_processor([StandInEngine(latency=args.translate_latency)]),
+        )
+    return {"parallel": chain, "sequential": chain}
+
+
+def _use_mode(chains: dict, mode: str):
+    """Chain to query in mode, its pipeline swapped for one built parallel or sequential"""
+    chain = chains[mode]
+    pipelines = chain.__dict__.setdefault("_benchmark_pipelines", {})
+    if mode not in pipelines:
+        pipelines[mode] = chain._build_pipeline(parallel=(mode == "parallel"))
+    chain.pipeline = pipelines[mode]
+    return chain
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Native-language generation vs post-hoc translation")
+    parser.add_argument("--llm-latency", type=float, default=1.0, help="Stand-in LLM latency in seconds")
+    parser.add_argument("--translate-latency", type=float, default=0.25,
+                        help="Stand-in latency per translated segment in seconds")
+    parser.add_argument("--chunks", type=int, default=200, help="Synthetic chunks for the offline index")
+    parser.add_argument("--limit", type=int, default=0, help="Ask only the first N questions (0 = all)")
+    parser.add_argument("--real-models", action="store_true",
+                        help="Real RAGChain (Gemini, GOOGLE_API_KEY) over the saved FAISS index")
+    parser.add_argument("--json", dest="json_path", help="Also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    questions = [
+        (lang, question)
+        for by_language in fixtures.CROSS_LINGUAL_QUERIES.values()
+        for lang, question in by_language.items()
+        if lang != 'en'
+    ]
+    if args.limit:
+        questions = questions[:args.limit]
+
+    print("\n" + "=" * 70)
+    print(f"  🗣️ Response-Language Routing: {len(questions)} questions × {len(ROUTES)} routes × "
+          f"{len(MODES)} modes{' (Gemini)' if args.real_models else ' (offline)'}")
+    print("=" * 70 + "\n")
+
+    try:
+        chains = build_chains(args)
+    except (ImportError, ValueError, FileNotFoundError) as e:
+        print(f"  Skipped: {e}")
+        return 0
+
+    results = defaultdict(list)
+    fallbacks = 0
+    for lang, question in questions:
+        for mode in MODES:
+            chain = _use_mode(chains, mode)
+            for route in ROUTES:
+                _reset_translations(chain.multilingual_processor)
+                result = chain.query(question, response_language=lang, generation=route)
+                results[(route, mode)].append(result["timings"])
+                if route == "native" and result["language_route"] != "native":
+                    fallbacks += 1
+
+    report = {"questions": len(questions), "native_fallbacks": fallbacks, "runs": {}}
+    for (route, mode), timings in results.items():
+        totals = [t["total_ms"] for t in timings]
+        stage_ms = defaultdict(list)
+        for t in timings:
+            for stage, span in t.get("stages", {}).items():
+                stage_ms[stage].append(span["ms"])
+        report["runs"][f"{route}/{mode}"] = {
+            "p50_ms": round(percentile(totals, 50), 1),
+            "p90_ms": round(percentile(totals, 90), 1),
+            "mean_ms": round(statistics.mean(totals), 1),
+            "retrieval_ms": round(statistics.mean(t["retrieval_ms"] for t in timings), 1),
+            "generation_ms": round(statistics.mean(t["generation_ms"] for t in timings), 1),
+            "translation_ms": round(statistics.mean(t["translation_ms"] for t in timings), 1),
+            "stages_ms": {stage: round(statistics.mean(v), 1) for stage, v in stage_ms.items()},
+        }
+
+    print(f"  {'route/mode':22}{'p50 ms':>9}{'p90 ms':>9}{'mean ms':>9}{'sources':>9}{'generate':>10}{'translate':>11}")
+    for name, stats in report["runs"].items():
+        print(f"  {name:22}{stats['p50_ms']:>9}{stats['p90_ms']:>9}{stats['mean_ms']:>9}"
+              f"{stats['retrieval_ms']:>9}{stats['generation_ms']:>10}{stats['translation_ms']:>11}")
+    print()
+    for route in ROUTES:
+        parallel, sequential = report["runs"][f"{route}/parallel"], report["runs"][f"{route}/sequential"]
+        if parallel["mean_ms"]:
+            print(f"  {route:10} parallel pipeline: {sequential['mean_ms'] / parallel['mean_ms']:.2f}x faster "
+                  f"than sequential")
+    native, translated = report["runs"]["native/parallel"], report["runs"]["translate/parallel"]
+    if native["mean_ms"]:
+        print(f"  Post-hoc translation takes {translated['mean_ms'] / native['mean_ms']:.2f}x the native time on average")
+    print(f"  Native answers that fell back to translation: {fallbacks}/{len(questions) * len(MODES)}\n")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
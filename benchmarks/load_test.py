@@ -0,0 +1,340 @@
+#!/usr/bin/env python
+"""
+Concurrent-User Load Test
+Drives the real query path (auth check → session load → retrieval + LLM → history save)
+for N simulated users, each on its own thread like Streamlit script runs.
+
+Usage (from the project root):
+    python -m benchmarks.load_test --users 20 --requests 5
+    python -m benchmarks.load_test --users 20 --per-session-model   # one index per user, as today
+    python -m benchmarks.load_test --users 5 --real-models          # MiniLM + saved FAISS index
+    python -m benchmarks.load_test --users 20 --chat-store json     # legacy chat_history.json
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import argparse
+import threading
+import statistics
+from collections import defaultdict
+from pathlib import Path
+
+parent_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(parent_dir))
+
+from benchmarks import fixtures
+from benchmarks.stand_ins import build_offline_chain
+
+QUERIES = [
+    fixtures.ENGLISH_QUERY,
+    "What are my rights during police arrest and custody under CrPC?",
+    "Explain bail provisions, types of bail, and procedure under Indian law",
+    "What are the legal provisions for property disputes and ownership in India?",
+    "What is the punishment for assault?",
+]
+
+TEST_PASSWORD = "LoadTest#2024"
+
+
+def read_rss_bytes() -> int:
+    """Current resident set size of this process (0 if unavailable)"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except ImportError:
+        return 0
+
+
+class RSSSampler:
+    """Samples RSS in the background to capture the peak"""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.start_rss = read_rss_bytes()
+        self.peak_rss = self.start_rss
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            self.peak_rss = max(self.peak_rss, read_rss_bytes())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop_event.set()
+        self._thread.join()
+        self.end_rss = read_rss_bytes()
+
+
+class Metrics:
+    """Thread-safe collection of latencies, stage timings and errors"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = []
+        self.stages = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def record_stage(self, stage: str, seconds: float):
+        with self._lock:
+            self.stages[stage].append(seconds)
+
+    def record_request(self, seconds: float):
+        with self._lock:
+            self.latencies.append(seconds)
+
+    def record_error(self, kind: str):
+        with self._lock:
+            self.errors[kind] += 1
+
+
+def percentile(values, pct: float) -> float:
+    """Nearest-rank percentile of a list of floats"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+class Timer:
+    """Context manager recording elapsed time into Metrics under a stage name"""
+
+    def __init__(self, metrics: Metrics, stage: str):
+        self.metrics = metrics
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.start
+        self.metrics.record_stage(self.stage, self.elapsed)
+
+
+def build_chain(args, shared_chain=None):
+    """Build the RAG chain a user session would hold (the real RAGChain with an offline LLM)"""
+    if shared_chain is not None and not args.per_session_model:
+        return shared_chain
+    index_path = None
+    if args.real_models:
+        from backend import config
+        index_path = config.VECTOR_STORE_PATH
+    return build_offline_chain(fixtures.make_legal_chunks(args.chunks), args.llm_latency, index_path)
+
+
+def simulate_user(user_index: int, args, env: dict, metrics: Metrics, barrier: threading.Barrier,
+                  ready: threading.Barrier):
+    """One user session: login once, then (once every user is logged in) ask questions through the chat path"""
+    from backend.chat_store import UserChatStore
+    db = env["db"]
+    store = UserChatStore(env["chat_store"], f"user{user_index}")
+    email = f"loaduser{user_index}@example.com"
+    session_state = {"authenticated": False, "current_session_id": None}
+
+    barrier.wait()
+
+    chain = None
+    try:
+        with Timer(metrics, "login"):
+            result = db.login_user(email, TEST_PASSWORD)
+        if not result["success"]:
+            metrics.record_error("sqlite_locked" if "locked" in result["message"] else "login_failed")
+        else:
+            session_state["authenticated"] = True
+            with Timer(metrics, "model_load"):
+                chain = build_chain(args, env.get("shared_chain"))
+    finally:
+        # Every user, failed or not, must arrive or the others wait forever
+        ready.wait()
+    if chain is None:
+        return
+
+    for request_index in range(args.requests):
+        start = time.perf_counter()
+        # Auth check (AuthManager.is_authenticated)
+        if not session_state["authenticated"]:
+            metrics.record_error("unauthenticated")
+            return
+
+        # Session load (get_current_session)
+        with Timer(metrics, "session_load"):
+            sessions = store.list_sessions()
+            if not session_state["current_session_id"]:
+                session_state["current_session_id"] = store.create_session()
+            elif not any(s["id"] == session_state["current_session_id"] for s in sessions):
+                # Our session vanished: another writer overwrote the file
+                metrics.record_error("session_lost")
+
+        # Retrieval + LLM (RAGChain.query)
+        with Timer(metrics, "retrieval_llm"):
+            question = QUERIES[(user_index + request_index) % len(QUERIES)]
+            answer = chain.query(question)
+
+        # History save (add_to_session)
+        with Timer(metrics, "history_save"):
+            store.append_message(
+                session_state["current_session_id"], question,
+                answer["answer"], answer["source_documents"]
+            )
+
+        metrics.record_request(time.perf_counter() - start)
+        if args.think_time:
+            time.sleep(args.think_time)
+
+
+def count_persisted_messages(store):
+    """Count messages on disk; returns (count, file_corrupt)"""
+    if store.backend == "sqlite":
+        return store.count_messages(), False
+    count, corrupt = 0, False
+    for history_path in store.directory.glob("*.json"):
+        try:
+            with open(history_path, "r", encoding="utf-8") as f:
+                sessions = json.load(f)
+        except ValueError:
+            # Interleaved writers left a truncated or concatenated JSON document
+            corrupt = True
+            continue
+        count += sum(len(s.get("messages", [])) for s in sessions)
+    return count, corrupt
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Concurrent-user load test with an offline LLM stand-in")
+    parser.add_argument("--users", type=int, default=10, help="Concurrent simulated users")
+    parser.add_argument("--requests", type=int, default=5, help="Questions per user")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Stand-in LLM latency in seconds")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Pause between a user's questions")
+    parser.add_argument("--chunks", type=int, default=2000, help="Synthetic chunks per index")
+    parser.add_argument("--per-session-model", action="store_true",
+                        help="Each user builds its own index/chain (current Streamlit behaviour)")
+    parser.add_argument("--real-models", action="store_true",
+                        help="Load the saved FAISS index with the real embedding model")
+    parser.add_argument("--chat-store", choices=["sqlite", "json"], default="sqlite",
+                        help="Chat history backend the simulated users write to")
+    parser.add_argument("--json", dest="json_path", help="Also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        # The offline chain is the real RAGChain, so LangChain and FAISS must be installed
+        import backend.rag_chain
+    except ImportError as e:
+        print(f"Skipped: {e}")
+        return 0
+
+    from backend.database import UserDatabase
+
+    workdir = Path(tempfile.mkdtemp(prefix="legalai_load_"))
+    db = UserDatabase(str(workdir / "users.db"))
+    print(f"Registering {args.users} users (bcrypt)...")
+    for i in range(args.users):
+        db.register_user(f"loaduser{i}@example.com", f"Load User {i}", TEST_PASSWORD)
+
+    from backend.chat_store import JSONChatStore, SQLiteChatStore
+    if args.chat_store == "json":
+        chat_store = JSONChatStore(workdir / "chat_history", legacy_path=workdir / "chat_history.json")
+    else:
+        chat_store = SQLiteChatStore(workdir / "chat_history.db")
+    env = {"db": db, "chat_store": chat_store}
+    if not args.per_session_model:
+        env["shared_chain"] = build_chain(args)
+
+    metrics = Metrics()
+    barrier = threading.Barrier(args.users)
+    # Questions start together once all users have logged in and loaded their chain;
+    # throughput is measured from there, so it excludes bcrypt logins and model loads
+    query_start = []
+    ready = threading.Barrier(args.users, action=lambda: query_start.append(time.perf_counter()))
+    threads = [
+        threading.Thread(target=simulate_user, args=(i, args, env, metrics, barrier, ready), name=f"user-{i}")
+        for i in range(args.users)
+    ]
+
+    with RSSSampler() as rss:
+        wall_start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        end = time.perf_counter()
+    wall = end - wall_start
+    query_wall = end - query_start[0] if query_start else wall
+
+    expected = len(metrics.latencies)
+    persisted, corrupt = count_persisted_messages(env["chat_store"])
+    report = {
+        "users": args.users,
+        "chat_store": args.chat_store,
+        "requests": expected,
+        "wall_seconds": round(wall, 3),
+        "query_seconds": round(query_wall, 3),
+        "throughput_rps": round(expected / query_wall, 2) if query_wall else 0.0,
+        "latency_ms": {
+            f"p{p}": round(percentile(metrics.latencies, p) * 1000, 1) for p in (50, 90, 99)
+        },
+        "stage_ms": {
+            stage: {
+                "p50": round(percentile(values, 50) * 1000, 1),
+                "p99": round(percentile(values, 99) * 1000, 1),
+                "mean": round(statistics.mean(values) * 1000, 1),
+            }
+            for stage, values in sorted(metrics.stages.items())
+        },
+        "rss_mb": {
+            "start": round(rss.start_rss / 2 ** 20, 1),
+            "peak": round(rss.peak_rss / 2 ** 20, 1),
+            "growth": round((rss.peak_rss - rss.start_rss) / 2 ** 20, 1),
+        },
+        "contention": {
+            "messages_expected": expected,
+            "messages_persisted": persisted,
+            "lost_updates": max(0, expected - persisted),
+            "history_file_corrupt": corrupt,
+            **dict(metrics.errors),
+        },
+    }
+
+    print("\n" + "=" * 70)
+    print(f"  🚦 Load Test: {args.users} users × {args.requests} questions"
+          f"{' (per-session model)' if args.per_session_model else ''} • {args.chat_store} chat store")
+    print("=" * 70 + "\n")
+    print(f"  Throughput:      {report['throughput_rps']} req/s over {report['query_seconds']} s of questions "
+          f"({report['wall_seconds']} s with logins and model loads)")
+    print(f"  Latency (ms):    p50 {report['latency_ms']['p50']} • p90 {report['latency_ms']['p90']} • "
+          f"p99 {report['latency_ms']['p99']}")
+    print(f"  RSS (MB):        start {report['rss_mb']['start']} • peak {report['rss_mb']['peak']} • "
+          f"growth {report['rss_mb']['growth']}")
+    print("\n  Stages (ms):")
+    for stage, stats in report["stage_ms"].items():
+        print(f"    {stage:15} p50 {stats['p50']:>9} • p99 {stats['p99']:>9} • mean {stats['mean']:>9}")
+    print("\n  Contention:")
+    for key, value in report["contention"].items():
+        print(f"    {key:20} {value}")
+    print()
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+"""
+Run the offline micro-benchmark suite and compare against benchmarks/baseline.json
+
+Usage (from the project root):
+    python -m benchmarks.run                    # fail on regressions past the threshold
+    python -m benchmarks.run --update-baseline  # record new baseline numbers
+    python -m benchmarks.run -k chat_history    # run a subset
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+parent_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(parent_dir))
+
+from benchmarks.harness import (
+    BenchmarkSkipped,
+    registered_benchmarks,
+    load_baseline,
+    save_baseline,
+    find_regressions,
+)
+
+# Importing a benchmark module registers its benchmarks
+BENCHMARK_MODULES = [
+    "benchmarks.bench_hot_functions",
+]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run offline micro-benchmarks")
+    parser.add_argument("-k", "--filter", help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--threshold", type=float, default=1.5,
+                        help="Allowed slowdown factor before failing (default: 1.5)")
+    parser.add_argument("--update-baseline", action="store_true", help="Store results as the new baseline")
+    parser.add_argument("--quick", action="store_true", help="Fewer iterations (smoke run)")
+    args = parser.parse_args(argv)
+
+    for module in BENCHMARK_MODULES:
+        __import__(module)
+
+    baseline = load_baseline()
+    results = {}
+
+    print("\n" + "=" * 70)
+    print("  ⏱️  NyayaSahayak Micro-Benchmarks")
+    print("=" * 70 + "\n")
+
+    for bench in registered_benchmarks(args.filter):
+        try:
+            stats = bench.run(quick=args.quick)
+        except BenchmarkSkipped as e:
+            print(f"  - {bench.name:42} skipped: {e}")
+            continue
+        results[bench.name] = stats
+        base = baseline.get(bench.name)
+        reference = f"baseline {base['median_us']:.2f}" if base else "no baseline"
+        print(f"  ✓ {bench.name:42} {stats['median_us']:>14.2f} µs  ({reference})")
+
+    print("\n" + "=" * 70)
+
+    if args.update_baseline:
+        save_baseline(results)
+        print(f"  ✓ Baseline updated with {len(results)} results")
+        return 0
+
+    regressions = find_regressions(results, baseline, args.threshold)
+    if regressions:
+        print(f"  ✗ {len(regressions)} regression(s) past {args.threshold:.2f}x:\n")
+        for line in regressions:
+            print(f"    {line}")
+        return 1
+
+    print(f"  ✓ No regressions past {args.threshold:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+"""
+Offline Stand-ins
+Deterministic replacements for network/model dependencies used by the benchmarks
+"""
+
+import re
+import math
+import time
+import zlib
+from typing import Iterator, List, Optional
+
+try:
+    from langchain_core.embeddings import Embeddings
+except ImportError:  # benchmarks that need FAISS skip without LangChain anyway
+    Embeddings = object
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+class HashEmbeddings(Embeddings):
+    """Bag-of-hashed-tokens embeddings: deterministic, offline, cheap"""
+
+    def __init__(self, dimensions: int = 384):
+        self.dimensions = dimensions
+
+    def _embed(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimensions
+        for token in _TOKEN_RE.findall(text.lower()):
+            vector[zlib.crc32(token.encode("utf-8")) % self.dimensions] += 1.0
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text)
+
+
+# Pieces of RAGChain's prompt the stand-in LLM answers from (see ANSWER_INSTRUCTIONS)
+_PROMPT_RE = re.compile(
+    r"\*\*Context from legal documents:\*\*\n(?P<context>.*?)\n\n\*\*User Question:\*\* (?P<question>.*?)\n\n",
+    re.DOTALL,
+)
+# NATIVE_LANGUAGE_RULE names the language by its native name, e.g. "हिन्दी (Hindi)"
+_NATIVE_LANGUAGE_RE = re.compile(r"Write the whole answer in (\S)")
+
+
+def _in_script(text: str, block: Optional[int]) -> str:
+    """Shift Latin letters into a Unicode script block: unreadable, but detected as that language"""
+    if block is None:
+        return text
+    return "".join(chr(block + 0x15 + ord(c) - ord("a")) if "a" <= c <= "z" else c for c in text.lower())
+
+
+class OfflineLLM:
+    """
+    Deterministic chat-model stand-in that answers RAGChain's prompts in the app's structured format
+
+    The question, context and requested language are read back out of the prompt.
+    Native answers are written in the language's script, so RAGChain's answer
+    language check treats them as it would a real model's.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = 0
+
+    def _compose(self, question: str, context: str, block: Optional[int]) -> str:
+        topic = question.strip().rstrip("?")[:80]
+
+        def say(text: str) -> str:
+            return _in_script(text, block)
+
+        return (
+            f"**SUMMARY:** {say('General information about ' + topic)}.\n\n"
+            f"**KEY POINTS:**\n• {say('Point drawn from the retrieved context')}\n"
+            f"• {say('Consult a lawyer for specifics')}\n\n"
+            f"**LEGAL PROVISION:** {say(context[:160])}\n\n"
+            f"**NEXT STEPS:**\n1. {say('Collect documents')}\n2. {say('Approach the nearest police station or court')}"
+        )
+
+    def answer(self, question: str, context: str = "", block: Optional[int] = None) -> Iterator[str]:
+        """
+        The structured answer line by line, the latency spread evenly over the lines
+
+        Args:
+            block: First code point of the Unicode block to write in (None: English)
+        """
+        self.calls += 1
+        lines = self._compose(question, context, block).splitlines(keepends=True)
+        for line in lines:
+            if self.latency:
+                time.sleep(self.latency / len(lines))
+            yield line
+
+    def generate(self, prompt) -> Iterator[str]:
+        """Answer a RAGChain prompt (PromptValue or str)"""
+        text = prompt.to_string() if hasattr(prompt, "to_string") else str(prompt)
+        match = _PROMPT_RE.search(text)
+        question, context = (match.group("question"), match.group("context")) if match else (text, "")
+        native = _NATIVE_LANGUAGE_RE.search(text)
+        block = ord(native.group(1)) & ~0x7F if native and ord(native.group(1)) > 0x7F else None
+        yield from self.answer(question, context, block)
+
+    def as_runnable(self):
+        """The stand-in as a LangChain runnable: prompt | llm | parser invokes and streams it"""
+        from langchain_core.runnables import RunnableLambda
+        return RunnableLambda(self.generate, name="offline_llm")
+
+
+def offline_processor(engines=None):
+    """MultilingualProcessor with fresh caches and offline engines (default: StandInEngine, no latency)"""
+    from backend.multilingual import MultilingualProcessor
+    from backend.translation_cache import TranslationCache
+    from backend.translation_memory import TranslationMemory
+    from backend.translation_engines import StandInEngine
+    return MultilingualProcessor(
+        translation_cache=TranslationCache(),
+        engines=engines if engines is not None else [StandInEngine()],
+        translation_memory=TranslationMemory(),
+    )
+
+
+def build_offline_chain(
+    chunks: List[dict],
+    llm_latency: float = 0.0,
+    index_path: str = None,
+    multilingual_processor=None
+):
+    """Build the real RAGChain over FAISS with the stand-in LLM and translator, no API key or network.
+
+    Args:
+        chunks: Synthetic chunks used when no saved index is given
+        llm_latency: Seconds the stand-in LLM takes per answer
+        index_path: Load this saved FAISS index with the real embedding model instead
+        multilingual_processor: Translator (default: offline_processor())
+
+    Returns:
+        RAGChain without its answer cache, so repeated questions are answered every time
+
+    Raises:
+        ImportError: LangChain or FAISS is not installed
+    """
+    import os
+    import tempfile
+    from contextlib import redirect_stdout
+    from langchain_core.documents import Document
+    from backend.vector_store import VectorStoreManager
+    from backend.rag_chain import RAGChain
+
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        if index_path:
+            manager = VectorStoreManager(index_path)
+            manager.load_vector_store()
+        else:
+            manager = VectorStoreManager(tempfile.mkdtemp(prefix="legalai_offline_vs_"))
+            manager._embeddings = HashEmbeddings()
+            manager.create_vector_store(
+                [Document(page_content=c["text"], metadata=c["metadata"]) for c in chunks]
+            )
+    chain = RAGChain(
+        manager,
+        multilingual_processor=multilingual_processor or offline_processor(),
+        llm=OfflineLLM(latency=llm_latency).as_runnable(),
+    )
+    chain.answer_cache = None
+    chain.pipeline = chain._build_pipeline()
+    return chain
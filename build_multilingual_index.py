@@ -0,0 +1,46 @@
+"""
+Build the cross-lingual FAISS index
+Embeds the English statute PDFs with the multilingual model so queries in any of the
+12 supported Indian languages retrieve English chunks directly, without translation.
+
+Run this from the project root:
+    python build_multilingual_index.py
+Then set CROSS_LINGUAL_RETRIEVAL=1 in .env to use the index in the app.
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from backend import config
+from backend.pdf_processor import PDFProcessor
+from backend.vector_store import create_vector_store_manager
+
+
+def build():
+    pdf_files = [f for f in config.PDF_FILES if os.path.exists(f)]
+    if not pdf_files:
+        print("❌ No PDF files found in project directory.")
+        return 1
+
+    start = time.perf_counter()
+    processor = PDFProcessor(chunk_size=config.CHUNK_SIZE, chunk_overlap=config.CHUNK_OVERLAP)
+    documents = processor.process_multiple_pdfs(pdf_files)
+    if not documents:
+        print("❌ Could not process PDF documents.")
+        return 1
+
+    manager = create_vector_store_manager(multilingual=True)
+    print(f"🧠 Embedding {len(documents)} chunks with {manager.model_name}...")
+    manager.create_vector_store(documents)
+    manager.save_vector_store()
+    print(f"🎉 Multilingual index built in {time.perf_counter() - start:.1f}s at {manager.store_path}")
+    print("   Set CROSS_LINGUAL_RETRIEVAL=1 to retrieve with it.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(build())
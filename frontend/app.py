@@ -10,10 +10,8 @@ import sys
 import html
 import re
 import random
-import json
-import uuid
+from contextlib import contextmanager
 from pathlib import Path
-from datetime import datetime
 
 # Voice input - optional dependency
 try:
@@ -42,6 +40,18 @@ sys.path.insert(0, str(parent_dir))
 
 import backend.config as config
 from backend.auth import AuthManager, render_auth_page
+from backend.profiling import profile_request
+from backend.session_memory import (
+    measure_session_state,
+    split_resources,
+    enforce_session_budget,
+    format_size,
+    track_allocations,
+)
+from backend.source_refs import compact_sources, rehydrate_sources
+from backend.chat_store import get_chat_store, assign_legacy_history, session_cursor
+from backend.pretranslation import get_pretranslator
+from backend.answer_format import parse_answer_cards, find_legal_terms
 
 # Multilingual support
 try:
@@ -565,9 +575,13 @@ if "voice_lang" not in st.session_state:
 if "card_shuffle_seed" not in st.session_state:
     st.session_state.card_shuffle_seed = random.randint(0, 9999)
 if "chat_sessions" not in st.session_state:
-    st.session_state.chat_sessions = []
+    st.session_state.chat_sessions = []  # the sidebar's current page of session summaries
+if "history_cursors" not in st.session_state:
+    st.session_state.history_cursors = []  # keyset cursors of the history pages before this one
 if "current_session_id" not in st.session_state:
     st.session_state.current_session_id = None
+if "recent_response_languages" not in st.session_state:
+    st.session_state.recent_response_languages = [st.session_state.get("response_language", "english")]
 if "current_page" not in st.session_state:
     st.session_state.current_page = "chat"  # chat, help, about
 if "scenario_page" not in st.session_state:
@@ -581,117 +595,122 @@ if "civil_criminal_page" not in st.session_state:
 if "civil_criminal_tab" not in st.session_state:
     st.session_state.civil_criminal_tab = "overview"
 
-# Chat persistence path
-CHAT_STORAGE_PATH = parent_dir / "chat_history.json"
-
-
-def load_chat_sessions():
-    """Load saved chat sessions from disk"""
-    try:
-        if CHAT_STORAGE_PATH.exists():
-            with open(CHAT_STORAGE_PATH, "r", encoding="utf-8") as f:
-                return json.load(f)
-    except Exception:
-        pass
-    return []
 
-
-def save_chat_sessions(sessions):
-    """Save chat sessions to disk"""
-    try:
-        with open(CHAT_STORAGE_PATH, "w", encoding="utf-8") as f:
-            json.dump(sessions, f, ensure_ascii=False, indent=2)
-    except Exception:
-        pass
+def chat_store():
+    """Chat history of the signed-in user"""
+    user = AuthManager.get_current_user()
+    return get_chat_store(str(user['id']) if user else '')
 
 
 def create_new_chat():
     """Create a new chat session"""
-    sid = str(uuid.uuid4())[:8]
-    new_session = {
-        "id": sid,
-        "title": "New Chat",
-        "created": datetime.now().isoformat(),
-        "messages": []
-    }
-    sessions = load_chat_sessions()
-    sessions.insert(0, new_session)
-    save_chat_sessions(sessions)
-    st.session_state.chat_sessions = sessions
+    sid = chat_store().create_session()
     st.session_state.current_session_id = sid
+    st.session_state.history_cursors = []
     return sid
 
 
 def get_current_session():
-    """Get current session or create one"""
-    sessions = load_chat_sessions()
-    if not sessions:
-        create_new_chat()
-        sessions = load_chat_sessions()
-    elif not st.session_state.current_session_id:
-        st.session_state.current_session_id = sessions[0]["id"]
-    st.session_state.chat_sessions = sessions
-    return next((s for s in sessions if s["id"] == st.session_state.current_session_id), None)
+    """Get current session summary (one row, no messages) or fall back to the newest / a new one"""
+    store = chat_store()
+    session = None
+    if st.session_state.current_session_id:
+        session = store.get_session(st.session_state.current_session_id)
+    if session is None:
+        newest = store.list_sessions(limit=1)
+        if newest:
+            session = newest[0]
+            st.session_state.current_session_id = session["id"]
+        else:
+            session = store.get_session(create_new_chat())
+    return session
 
 
-def _serialize_sources(sources):
-    """Convert Document objects to JSON-serializable dicts"""
-    out = []
-    for doc in (sources or [])[:4]:
-        try:
-            out.append({
-                "source": getattr(doc, "metadata", {}).get("source", "Legal Document"),
-                "content": getattr(doc, "page_content", "")[:300]
-            })
-        except Exception:
-            pass
-    return out
+def _response_language() -> str:
+    """Language key chosen in the sidebar's Response Language selector"""
+    return st.session_state.get('response_language', 'english')
+
 
+def add_to_session(session_id, query, answer, sources, language='en'):
+    """Add a message to a session and update title if first message; returns the message index"""
+    return chat_store().append_message(session_id, query, answer, sources, language=language)
 
-def _deserialize_sources(sources_data):
-    """Convert saved dicts back to object-like for render_source_cards"""
-    class DocLike:
-        def __init__(self, source, content):
-            self.metadata = {"source": source}
-            self.page_content = content
-    return [DocLike(d["source"], d["content"]) for d in (sources_data or [])]
 
+def get_session_messages(session_id):
+    """Get messages for a session (sources as DocLike objects), answers in the response language"""
+    return chat_store().get_messages(session_id, language=_response_language_code())
 
-def add_to_session(session_id, query, answer, sources):
-    """Add a message to a session and update title if first message"""
-    sessions = load_chat_sessions()
-    for s in sessions:
-        if s["id"] == session_id:
-            s["messages"].append({"q": query, "a": answer, "sources": _serialize_sources(sources)})
-            if s["title"] == "New Chat":
-                s["title"] = (query[:40] + "…") if len(query) > 40 else query
-            break
-    save_chat_sessions(sessions)
-    st.session_state.chat_sessions = sessions
 
+def _response_language_code() -> str:
+    """Language code of the sidebar's Response Language"""
+    from backend.multilingual import INDIAN_LANGUAGES
+    return INDIAN_LANGUAGES.get(_response_language(), {}).get('code', 'en')
 
-def get_session_messages(session_id):
-    """Get messages for a session (sources as DocLike objects)"""
-    sessions = load_chat_sessions()
-    for s in sessions:
-        if s["id"] == session_id:
-            return [
-                (m["q"], m["a"], _deserialize_sources(m.get("sources", [])))
-                for m in s["messages"]
-            ]
-    return []
+
+def remember_response_language(lang_key):
+    """Move a response language to the front of this user's recently used languages"""
+    recent = [key for key in st.session_state.get("recent_response_languages", []) if key != lang_key]
+    st.session_state.recent_response_languages = [lang_key] + recent[:4]
+
+
+def schedule_pretranslation(session_id, message_index, answer, answer_lang):
+    """Queue background translations of a new answer into the user's other recent languages"""
+    if not config.PRETRANSLATE_ENABLED or message_index < 0:
+        return
+    from backend.multilingual import INDIAN_LANGUAGES
+    recent = st.session_state.get("recent_response_languages", [])
+    targets = [
+        INDIAN_LANGUAGES[key]['code'] for key in recent
+        if key in INDIAN_LANGUAGES and INDIAN_LANGUAGES[key]['code'] != answer_lang
+    ][:config.PRETRANSLATE_MAX_LANGUAGES]
+    if targets:
+        get_pretranslator().submit(session_id, message_index, answer, answer_lang, targets)
+
+
+def sync_answer_translations(session_id):
+    """
+    Store finished background translations with their messages, and translate the
+    latest answer now if the response language still has no translation for it
+    """
+    pretranslator = get_pretranslator()
+    finished = pretranslator.collect(session_id)
+    if finished:
+        chat_store().store_translations(session_id, finished)
+
+    language = _response_language_code()
+    missing = chat_store().get_untranslated_answer(session_id, language)
+    if missing is None:
+        return
+    index, answer, answer_lang = missing
+    from backend.multilingual import get_multilingual_processor
+    with st.spinner("🌐 Translating answer..."), pretranslator.foreground(session_id):
+        translated, success = get_multilingual_processor().translate_markdown(
+            answer, answer_lang, language, allow_fallback=False
+        )
+    # A dictionary fallback is not stored, so a real translation can take its place later
+    if success:
+        chat_store().store_translations(session_id, [(index, language, translated)])
 
 
 def clear_current_chat():
     """Clear messages from current session"""
-    sessions = load_chat_sessions()
-    for s in sessions:
-        if s["id"] == st.session_state.current_session_id:
-            s["messages"] = []
-            s["title"] = "New Chat"
-            break
-    save_chat_sessions(sessions)
-    st.session_state.chat_sessions = sessions
+    session_id = st.session_state.current_session_id
+    # Message positions restart at 0, so translations of the old messages must not be stored
+    get_pretranslator().cancel(session_id, drop_results=True)
+    chat_store().clear_session(session_id)
+
+
+# Match markers that cannot occur in chat text, swapped for bold once the snippet's own markdown is removed
+_SEARCH_MARKS = ("\x02", "\x03")
+
+
+def search_chat_history(text):
+    """The signed-in user's messages matching text, best first, with matched words in bold"""
+    results = chat_store().search(text, limit=config.CHAT_SEARCH_MAX_RESULTS, marks=_SEARCH_MARKS)
+    for r in results:
+        snippet = re.sub(r"[*_`#>|\[\]]", "", r["snippet"]).replace("\n", " ")
+        r["snippet"] = snippet.replace(_SEARCH_MARKS[0], "**").replace(_SEARCH_MARKS[1], "**")
+    return results
 
 
 # ============== QUICK LEGAL CATEGORIES (Unique Feature #1) ==============
@@ -706,25 +725,6 @@ LEGAL_CATEGORIES = [
     {"id": "employment", "icon": "💼", "title": "Employment Law", "query": "What are employee rights regarding termination, wages, and workplace harassment?", "desc": "Labour laws"},
 ]
 
-# Legal Jargon Glossary (Unique Feature #4 - Jargon Explainer)
-LEGAL_GLOSSARY = {
-    "IPC": "Indian Penal Code - Main criminal code of India",
-    "BNS": "Bharatiya Nyaya Sanhita - New criminal code replacing IPC (2023)",
-    "CrPC": "Code of Criminal Procedure - Procedure for criminal cases",
-    "cognizable": "Offense where police can arrest without warrant",
-    "non-cognizable": "Offense where police need warrant to arrest",
-    "bail": "Release of accused before trial on security/surety",
-    "anticipatory bail": "Bail sought before arrest in anticipation",
-    "FIR": "First Information Report - Initial complaint to police",
-    "bailable": "Offense where bail is a right",
-    "non-bailable": "Offense where bail is at court's discretion",
-    "compoundable": "Offense that can be settled between parties",
-    "cognizance": "Court taking notice of an offense to start proceedings",
-    "magistrate": "Judicial officer with limited jurisdiction",
-    "summons": "Legal order to appear in court",
-    "warrant": "Court order for arrest or search",
-}
-
 # Scenario templates - Extended list for dynamic rotation
 SCENARIO_TEMPLATES = [
     "What happens if someone cheats me of ₹50,000? What are the legal provisions and punishments?",
@@ -750,7 +750,7 @@ def initialize_system():
             return False
 
         try:
-            from backend.vector_store import VectorStoreManager
+            from backend.vector_store import create_vector_store_manager
         except Exception as e:
             st.error(f"Failed to import VectorStoreManager: {str(e)}")
             return False
@@ -766,8 +766,9 @@ def initialize_system():
             return False
 
         with st.spinner("⚡ Initializing NyayaSahayak..."):
-            if os.path.exists(config.VECTOR_STORE_PATH) and os.listdir(config.VECTOR_STORE_PATH):
-                vector_store_manager = VectorStoreManager(config.VECTOR_STORE_PATH)
+            vector_store_manager = create_vector_store_manager()
+            store_path = vector_store_manager.store_path
+            if os.path.exists(store_path) and os.listdir(store_path):
                 vector_store_manager.load_vector_store()
             else:
                 st.info("📚 First-time setup: Processing legal documents...")
@@ -780,7 +781,6 @@ def initialize_system():
                 if not documents:
                     st.error("Could not process PDF documents.")
                     return False
-                vector_store_manager = VectorStoreManager(config.VECTOR_STORE_PATH)
                 vector_store_manager.create_vector_store(documents)
                 vector_store_manager.save_vector_store()
 
@@ -817,50 +817,13 @@ def render_source_cards(sources):
 
 def render_jargon_explainer(answer_text):
     """Extract and explain legal terms found in answer (Unique Feature #4)"""
-    answer_upper = answer_text.upper()
-    found_terms = []
-    for term, explanation in LEGAL_GLOSSARY.items():
-        if term.upper() in answer_upper and term not in [t[0] for t in found_terms]:
-            found_terms.append((term, explanation))
+    found_terms = find_legal_terms(answer_text)
     if found_terms:
         with st.expander("📖 Legal Terms in This Answer"):
             for term, explanation in found_terms[:8]:
                 st.markdown(f"**{term}:** {explanation}")
 
 
-def parse_answer_cards(answer_text):
-    """Parse answer into structured cards (SUMMARY, KEY POINTS, LEGAL PROVISION, NEXT STEPS)"""
-    cards = []
-    text = answer_text.strip()
-    # Flexible patterns - match **Section:** or Section: or ## Section
-    patterns = [
-        (r"\*\*SUMMARY:?\*\*\s*(.+?)(?=\*\*[A-Z\s]|\n\*\*|$)", "summary", "📌 Summary"),
-        (r"\*\*KEY POINTS?:?\*\*\s*([\s\S]+?)(?=\*\*[A-Z\s]|\n\*\*[A-Z]|$)", "points", "🔑 Key Points"),
-        (r"\*\*LEGAL PROVISION[S]?:?\*\*\s*([\s\S]+?)(?=\*\*[A-Z\s]|\n\*\*[A-Z]|$)", "law", "📜 Legal Provision"),
-        (r"\*\*NEXT STEPS?:?\*\*\s*([\s\S]+?)(?=\*\*|$)", "steps", "✅ Next Steps"),
-    ]
-    for regex, card_type, title in patterns:
-        m = re.search(regex, text, re.IGNORECASE | re.DOTALL)
-        if m:
-            content = m.group(1).strip()
-            if content and len(content) > 3:
-                # Truncate very long content for cards
-                if len(content) > 600:
-                    content = content[:600] + "..."
-                cards.append({"type": card_type, "title": title, "content": content})
-    if not cards:
-        # Fallback: split by double newline or bullets into chunks
-        parts = re.split(r'\n\n+', text)
-        if len(parts) > 1:
-            cards.append({"type": "summary", "title": "📌 Summary", "content": parts[0][:500]})
-            for p in parts[1:3]:
-                if p.strip() and len(p) > 20:
-                    cards.append({"type": "points", "title": "📋 Details", "content": p[:400]})
-        else:
-            cards.append({"type": "summary", "title": "📌 Answer", "content": text[:800]})
-    return cards
-
-
 def render_answer_cards(answer_text):
     """Render answer in attractive card-based layout"""
     cards = parse_answer_cards(answer_text)
@@ -923,6 +886,22 @@ def render_pagination(current_page, total_pages, session_state_key):
             st.write("")
 
 
+def _profiling_forced() -> bool:
+    """Admin toggle: profile every request made from this session"""
+    return bool(st.session_state.get("profile_requests", False))
+
+
+@contextmanager
+def _tracing_allocations():
+    """Admin toggle: record the top allocation sites of a question for the Session Memory panel"""
+    if not st.session_state.get("trace_allocations", False):
+        yield
+        return
+    with track_allocations() as allocations:
+        yield
+    st.session_state.last_allocations = allocations
+
+
 def process_query(query_text: str) -> bool:
     """Process a query and add to current session. Returns True if processed."""
     if not query_text or not query_text.strip():
@@ -934,11 +913,17 @@ def process_query(query_text: str) -> bool:
     if not session:
         create_new_chat()
         session = get_current_session()
-    with st.spinner("🔍 Searching legal documents..."):
-        result = st.session_state.rag_chain.query(query_text.strip())
+    pretranslator = get_pretranslator()
+    # A new question supersedes pre-translations of this chat's older answers
+    pretranslator.cancel(session["id"])
+    with st.spinner("🔍 Searching legal documents..."), pretranslator.foreground(session["id"]), \
+            profile_request("process_query", force=_profiling_forced()), _tracing_allocations():
+        result = st.session_state.rag_chain.query(query_text.strip(), response_language=_response_language())
         answer = result["answer"]
         sources = result.get("source_documents", [])
-        add_to_session(session["id"], query_text.strip(), answer, sources)
+        answer_lang = result.get("language", 'en')
+        index = add_to_session(session["id"], query_text.strip(), answer, sources, language=answer_lang)
+    schedule_pretranslation(session["id"], index, answer, answer_lang)
     return True
 
 
@@ -1316,13 +1301,16 @@ def render_civil_criminal_page():
         
         if process_btn and user_query.strip():
             if st.session_state.rag_chain:
-                with st.spinner("🔍 Searching legal documents..."):
+                with st.spinner("🔍 Searching legal documents..."), \
+                        profile_request("cc_ask", force=_profiling_forced()):
                     # Query the RAG system for answer
-                    result = st.session_state.rag_chain.query(user_query.strip())
+                    result = st.session_state.rag_chain.query(
+                        user_query.strip(), response_language=_response_language()
+                    )
                     st.session_state.cc_response = {
                         "query": user_query.strip(),
                         "answer": result["answer"],
-                        "sources": result.get("source_documents", [])
+                        "source_refs": compact_sources(result.get("source_documents", []))
                     }
             else:
                 st.error("RAG system not initialized. Please go to Chat and initialize first.")
@@ -1368,7 +1356,7 @@ def render_civil_criminal_page():
             """, unsafe_allow_html=True)
             
             # Source Evidence
-            sources = st.session_state.cc_response.get('sources', [])
+            sources = rehydrate_sources(st.session_state.cc_response.get('source_refs', []))
             if sources:
                 with st.expander("📚 Source Documents (Legal References)", expanded=False):
                     for i, doc in enumerate(sources[:4], 1):
@@ -1469,11 +1457,12 @@ Format your response EXACTLY like this:
 
 After the table, provide a brief SUMMARY (2-3 lines) and KEY DIFFERENCES as bullet points."""
                         
-                        result = st.session_state.rag_chain.query(compare_query)
+                        with profile_request("cc_compare", force=_profiling_forced()):
+                            result = st.session_state.rag_chain.query(compare_query)
                         st.session_state.cc_response = {
                             "query": f"Compare: {term1} vs {term2}",
                             "answer": result["answer"],
-                            "sources": result.get("source_documents", []),
+                            "source_refs": compact_sources(result.get("source_documents", [])),
                             "type": "comparison",
                             "term1": term1,
                             "term2": term2
@@ -1560,7 +1549,7 @@ After the table, provide a brief SUMMARY (2-3 lines) and KEY DIFFERENCES as bull
             st.markdown(resp['answer'])
             
             # Sources
-            sources = resp.get('sources', [])
+            sources = rehydrate_sources(resp.get('source_refs', []))
             if sources:
                 with st.expander("📚 Legal References", expanded=False):
                     for i, doc in enumerate(sources[:4], 1):
@@ -1647,11 +1636,12 @@ Please provide:
 
 Be specific and cite relevant sections of Indian law."""
                             
-                            result = st.session_state.rag_chain.query(scenario_prompt)
+                            with profile_request("cc_sample_scenario", force=_profiling_forced()):
+                                result = st.session_state.rag_chain.query(scenario_prompt)
                             st.session_state.cc_response = {
                                 "query": scenario['query'],
                                 "answer": result["answer"],
-                                "sources": result.get("source_documents", []),
+                                "source_refs": compact_sources(result.get("source_documents", [])),
                                 "type": "scenario_analysis"
                             }
                             st.rerun()
@@ -1705,11 +1695,12 @@ Please provide:
 
 Be specific and cite relevant sections of Indian law."""
                     
-                    result = st.session_state.rag_chain.query(scenario_query)
+                    with profile_request("cc_custom_scenario", force=_profiling_forced()):
+                        result = st.session_state.rag_chain.query(scenario_query)
                     st.session_state.cc_response = {
                         "query": custom_scenario.strip(),
                         "answer": result["answer"],
-                        "sources": result.get("source_documents", []),
+                        "source_refs": compact_sources(result.get("source_documents", [])),
                         "type": "scenario_analysis"
                     }
             else:
@@ -1757,7 +1748,7 @@ Be specific and cite relevant sections of Indian law."""
             """, unsafe_allow_html=True)
             
             # Sources
-            sources = resp.get('sources', [])
+            sources = rehydrate_sources(resp.get('source_refs', []))
             if sources:
                 with st.expander("📚 Legal References Used", expanded=False):
                     for i, doc in enumerate(sources[:4], 1):
@@ -1773,7 +1764,17 @@ Be specific and cite relevant sections of Indian law."""
             st.warning("⚠️ **Disclaimer:** This analysis is for informational purposes only and does not constitute legal advice. Please consult a qualified lawyer for your specific situation.")
 
 def main():
-    """Main application"""
+    """Main application; the signed-in user's chat writes are flushed when the run ends"""
+    try:
+        render_app()
+    finally:
+        # Persist this run's chat writes now rather than at the next background flush
+        if AuthManager.is_authenticated():
+            chat_store().flush()
+
+
+def render_app():
+    """Render one run of the app for the current session"""
     
     # ============== AUTHENTICATION CHECK ==============
     AuthManager.init_session()
@@ -1785,6 +1786,17 @@ def main():
     # Get current user
     user = AuthManager.get_current_user()
     
+    # Hand the pre-sign-in shared chat history to its configured owner (CHAT_LEGACY_OWNER)
+    if not st.session_state.get("legacy_history_checked"):
+        if assign_legacy_history(user['email'], user['id']):
+            st.session_state.history_cursors = []
+        st.session_state.legacy_history_checked = True
+    
+    # Keep per-session user data within the memory budget
+    enforce_session_budget(
+        st.session_state, config.SESSION_MEMORY_BUDGET_BYTES, min_interval=config.SESSION_MEMORY_CHECK_INTERVAL
+    )
+    
     # Premium Sidebar Navigation
     with st.sidebar:
         # User Info Section
@@ -1801,6 +1813,66 @@ def main():
             AuthManager.logout()
             st.rerun()
         
+        # Admin-only profiling toggle
+        if user and user['email'] and user['email'].lower() in config.PROFILE_ADMIN_EMAILS:
+            st.session_state.profile_requests = st.checkbox(
+                "🔬 Profile my requests",
+                value=st.session_state.get("profile_requests", False),
+                help=f"Write a collapsed-stack profile per request to {config.PROFILE_DIR}"
+            )
+            with st.expander("📊 Session Memory"):
+                if st.button("Measure", use_container_width=True, key="measure_session_memory"):
+                    sizes = measure_session_state(st.session_state)
+                    data_bytes, resource_bytes = split_resources(sizes)
+                    st.caption(
+                        f"User data: {format_size(data_bytes)} / {format_size(config.SESSION_MEMORY_BUDGET_BYTES)} • "
+                        f"Resources: {format_size(resource_bytes)}"
+                    )
+                    for key, size in list(sizes.items())[:12]:
+                        st.markdown(f"`{key}` — {format_size(size)}")
+                st.session_state.trace_allocations = st.checkbox(
+                    "Trace allocations of my questions",
+                    value=st.session_state.get("trace_allocations", False),
+                    help="tracemalloc while a question is answered (process-wide, slows the request)"
+                )
+                for location, size, count in st.session_state.get("last_allocations", []):
+                    st.markdown(f"`{os.path.basename(location)}` — {format_size(size)} in {count} blocks")
+            with st.expander("🌐 Translation Engines"):
+                from backend.multilingual import get_multilingual_processor
+                report = get_multilingual_processor().get_engine_report()
+                if not report:
+                    st.caption("No translations yet")
+                for row in report:
+                    st.markdown(
+                        f"`{row['engine']}` — {row['hit_share']:.0%} of translations • "
+                        f"{row['mean_ms']:.1f} ms avg • {row['calls']} calls"
+                    )
+                pre = get_pretranslator().stats()
+                st.caption(
+                    f"Pre-translation: {pre['completed']} done • {pre['pending']} queued • "
+                    f"{pre['dropped']} dropped • {pre['cancelled']} cancelled"
+                )
+            with st.expander("🗣️ Answer Language Routes"):
+                chain = st.session_state.get("rag_chain")
+                report = chain.get_route_report() if hasattr(chain, "get_route_report") else []
+                if not report:
+                    st.caption("No answers yet")
+                for row in report:
+                    st.markdown(
+                        f"`{row['engine']}` — {row['hit_share']:.0%} of answers • "
+                        f"{row['mean_ms']:.0f} ms avg end-to-end"
+                    )
+            with st.expander("🔑 Cache Hits"):
+                chain = st.session_state.get("rag_chain")
+                report = chain.get_cache_report() if hasattr(chain, "get_cache_report") else {}
+                if not report:
+                    st.caption("No queries yet")
+                for name, stats in report.items():
+                    st.markdown(
+                        f"`{name}` — {stats['hit_rate']:.0%} hit rate • {stats['hits']} hits, "
+                        f"{stats['canonical_hits']} from canonical keys • {stats['entries']} entries"
+                    )
+        
         st.markdown("---")
         
         # Logo/Brand Section
@@ -1852,14 +1924,48 @@ def main():
 
             # Chat History
             st.markdown("### 📜 History")
-            sessions = load_chat_sessions()
+            search_text = st.text_input(
+                "Search chats", key="history_search", label_visibility="collapsed",
+                placeholder="🔎 Search chats (e.g. anticipatory bail, अग्रिम जमानत)"
+            )
+            if search_text.strip():
+                results = search_chat_history(search_text)
+                for r in results:
+                    if st.button(r["snippet"], key=f"found_{r['session_id']}_{r['position']}",
+                                 help=r["title"], use_container_width=True):
+                        if st.session_state.current_session_id:
+                            get_pretranslator().cancel(st.session_state.current_session_id)
+                        st.session_state.current_session_id = r["session_id"]
+                        st.rerun()
+                if not results:
+                    st.caption("No matching messages")
+                st.markdown("---")
+            page_size = config.CHAT_HISTORY_PAGE_SIZE
+            cursors = st.session_state.history_cursors
+            # One extra row tells whether an older page exists
+            sessions = chat_store().list_sessions(limit=page_size + 1, after=cursors[-1] if cursors else None)
+            has_older = len(sessions) > page_size
+            sessions = sessions[:page_size]
+            st.session_state.chat_sessions = sessions
             if sessions:
-                for s in sessions[:8]:  # Limit to 8 recent chats
+                for s in sessions:
                     is_active = s["id"] == st.session_state.current_session_id
                     btn_label = f"{'⚡ ' if is_active else '○ '}{s['title'][:25]}{'...' if len(s['title']) > 25 else ''}"
                     if st.button(btn_label, key=f"hist_{s['id']}", use_container_width=True):
+                        if st.session_state.current_session_id:
+                            get_pretranslator().cancel(st.session_state.current_session_id)
                         st.session_state.current_session_id = s["id"]
                         st.rerun()
+                if cursors or has_older:
+                    newer_col, older_col = st.columns(2)
+                    with newer_col:
+                        if cursors and st.button("◂ Newer", use_container_width=True, key="hist_newer"):
+                            st.session_state.history_cursors = cursors[:-1]
+                            st.rerun()
+                    with older_col:
+                        if has_older and st.button("Older ▸", use_container_width=True, key="hist_older"):
+                            st.session_state.history_cursors = cursors + [session_cursor(sessions[-1])]
+                            st.rerun()
             else:
                 st.caption("No conversations yet")
 
@@ -1914,6 +2020,7 @@ def main():
                     )
                     if response_lang != current_resp_lang:
                         st.session_state.response_language = response_lang
+                        remember_response_language(response_lang)
                         st.rerun()
                     
                     # Voice Input Section
@@ -2117,6 +2224,8 @@ def main():
     st.markdown("---")
 
     # ============== Chat Display ==============
+    if st.session_state.current_session_id:
+        sync_answer_translations(st.session_state.current_session_id)
     messages = get_session_messages(st.session_state.current_session_id or "") if st.session_state.current_session_id else []
     
     # Show hero section only if no messages
@@ -18,6 +18,7 @@ from backend.multilingual import (
 )
 from backend.language_strings import (
     get_string,
+    get_strings,
     get_all_strings,
     LANGUAGE_STRINGS,
 )
@@ -371,7 +372,7 @@ class MultilingualUI:
         if target_code == 'en':
             return text, False
 
-        translated, success = self.processor.translate_text(
+        translated, success = self.processor.translate_markdown(
             text,
             source_lang='en',
             target_lang=target_code
@@ -447,11 +448,18 @@ class MultilingualUI:
         name = lang_info.get('name', lang_key)
         return f"{flag} {name}"
 
+    @staticmethod
+    def _current_language_code() -> str:
+        lang = st.session_state.user_language
+        return INDIAN_LANGUAGES.get(lang, {}).get('code', 'en')
+
     def get_localized_string(self, key: str, category: str = 'general') -> str:
         """Get localized string for current language"""
-        lang = st.session_state.user_language
-        lang_code = INDIAN_LANGUAGES.get(lang, {}).get('code', 'en')
-        return get_string(key, lang_code, category)
+        return get_string(key, self._current_language_code(), category)
+
+    def get_localized_strings(self, *keys: str, category: str = 'general') -> Dict[str, str]:
+        """Get several localized strings in one call, e.g. all labels a page renders"""
+        return get_strings(keys, self._current_language_code(), category)
 
     def render_voice_input_with_microphone(self):
         """
@@ -0,0 +1,34 @@
+#!/usr/bin/env python
+"""Test canonical query keys: spellings of one citation agree, different citations never do"""
+
+import pytest
+
+from backend.multilingual import canonicalize_query
+
+
+@pytest.mark.parametrize("query", [
+    "IPC 420", "420 IPC", "Section 420 of the IPC", "u/s 420 I.P.C.", "धारा 420 आईपीसी", "sec. 420 ipc",
+])
+def test_section_spellings_share_a_key(query):
+    assert canonicalize_query(query) == "section 420 ipc"
+
+
+@pytest.mark.parametrize("query, key", [
+    ("IPC 1860", "ipc 1860"),
+    ("1860 IPC", "1860 ipc"),
+    ("BNS 2023", "bns 2023"),
+    ("bsa 2023", "bsa 2023"),
+])
+def test_act_years_are_not_section_numbers(query, key):
+    assert canonicalize_query(query) == key
+
+
+def test_act_year_and_section_stay_distinct():
+    assert canonicalize_query("BNS 2023 theft") != canonicalize_query("section 2023 bns theft")
+    assert canonicalize_query("Section 302 IPC 1860") == "section 302 ipc 1860"
+
+
+def test_unicode_and_digit_forms_share_a_key():
+    # Decomposed nukta, a zero-width joiner and Devanagari digits
+    assert canonicalize_query("धारा ४२० आई‍पीसी") == canonicalize_query("धारा 420 आईपीसी")
+    assert canonicalize_query("क़") == canonicalize_query("क़")
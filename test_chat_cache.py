@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+"""Test the write-behind chat cache: journal replay, eviction and bounded memory"""
+
+import json
+
+import pytest
+
+from backend import config
+from backend import chat_cache
+from backend.chat_cache import WriteBehindChatStore, get_write_behind_store
+from backend.chat_store import SQLiteChatStore
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "CHAT_JOURNAL_DIR", str(tmp_path / "journal"))
+    monkeypatch.setattr(config, "CHAT_FLUSH_INTERVAL", 3600.0)
+    return SQLiteChatStore(str(tmp_path / "chat.db"))
+
+
+def _questions(cache, session_id):
+    return [q for q, _, _ in cache.get_messages(session_id)]
+
+
+def test_journal_is_replayed_after_a_crash(store):
+    crashed = WriteBehindChatStore(store, "zara")
+    sid = crashed.create_session()
+    crashed.append_message(sid, "Is theft bailable?", "Yes", [])
+    crashed.store_translations(sid, [(0, 'hi', "हाँ")])
+    # The process dies here: nothing was flushed, the journal file is all that is left
+    assert store.list_sessions("zara") == []
+
+    restarted = WriteBehindChatStore(store, "zara")
+    assert restarted.replayed_ops == 3
+    assert _questions(restarted, sid) == ["Is theft bailable?"]
+    assert restarted.get_messages(sid, language='hi')[0][1] == "हाँ"
+    assert store.get_session("zara", sid)["message_count"] == 1
+    restarted.close()
+    chat_cache._dirty.discard(crashed)
+
+
+def test_evicted_cache_passes_writes_to_the_current_one(store, monkeypatch):
+    monkeypatch.setattr(config, "CHAT_CACHE_MAX_USERS", 1)
+    held = get_write_behind_store(store, "alice")
+    sid = held.create_session()
+    get_write_behind_store(store, "bob")  # evicts and closes alice's cache
+
+    assert held.append_message(sid, "Is theft bailable?", "Yes", []) == 0
+    current = get_write_behind_store(store, "alice")
+    assert current is not held
+    assert _questions(current, sid) == ["Is theft bailable?"]
+
+
+def test_unreadable_journal_lines_are_skipped(store, tmp_path):
+    journal = tmp_path / "journal" / "carol.jsonl"
+    journal.parent.mkdir(parents=True)
+    ops = [
+        {"op": "create", "sid": "s1", "created": "2024-02-01T10:00:00"},
+        {"op": "append", "sid": "s1", "pos": 0, "q": "What is FIR?", "a": "A report", "lang": "en", "sources": []},
+    ]
+    journal.write_text(json.dumps(ops[0]) + "\nnot json\n[1, 2]\n" + json.dumps(ops[1]) + "\n{\"op\": \"app",
+                       encoding="utf-8")
+
+    cache = WriteBehindChatStore(store, "carol")
+    assert cache.replayed_ops == 2
+    assert _questions(cache, "s1") == ["What is FIR?"]
+    cache.close()
+
+
+def test_failed_replay_sets_the_journal_aside(store, tmp_path, monkeypatch):
+    journal = tmp_path / "journal" / "dave.jsonl"
+    journal.parent.mkdir(parents=True)
+    journal.write_text(json.dumps({"op": "create", "sid": "s1", "created": "2024-02-01T10:00:00"}) + "\n",
+                       encoding="utf-8")
+
+    def fail(user_id, ops):
+        raise RuntimeError("database is locked")
+    monkeypatch.setattr(store, "apply_ops", fail)
+
+    cache = WriteBehindChatStore(store, "dave")
+    assert cache.list_sessions() == []
+    assert journal.read_text(encoding="utf-8") == ""
+    assert len(list(journal.parent.glob("dave.jsonl.failed-*"))) == 1
+
+
+def test_loaded_sessions_are_capped(store, monkeypatch):
+    monkeypatch.setattr(config, "CHAT_CACHE_MAX_SESSIONS", 2)
+    cache = WriteBehindChatStore(store, "erin")
+    sids = [cache.create_session() for _ in range(4)]
+    cache.append_message(sids[0], "Old question", "Old answer", [])
+
+    assert cache.stats()["loaded_sessions"] == 2
+    assert _questions(cache, sids[0]) == ["Old question"]
+    assert cache.stats()["loaded_sessions"] == 2
+    cache.close()
+
+
+def teardown_module():
+    chat_cache.flush_all()
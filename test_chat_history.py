@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+"""Test chat_history.json handling: corrupt files, locking and merging concurrent writes"""
+
+import copy
+import threading
+from contextlib import contextmanager
+
+from backend import chat_history
+from backend.chat_history import load_chat_sessions, merge_chat_sessions, save_chat_sessions
+
+SESSIONS = [{"id": "s1", "title": "Bail", "created": "2024-02-01T10:00:00",
+             "messages": [{"q": "Is theft bailable?", "a": "Yes", "lang": "en", "sources": []}]}]
+
+
+def test_corrupt_file_is_moved_aside(tmp_path):
+    path = tmp_path / "chat_history.json"
+    path.write_text("[{\"id\": ", encoding="utf-8")
+    assert load_chat_sessions(path) == []
+    assert not path.exists()
+    assert len(list(tmp_path.glob("chat_history.json.corrupt-*"))) == 1
+
+
+def test_file_replaced_by_a_writer_is_read_not_moved(tmp_path, monkeypatch):
+    path = tmp_path / "chat_history.json"
+    path.write_text("[{\"id\": ", encoding="utf-8")
+    lock = chat_history.chat_history_lock
+
+    @contextmanager
+    def writer_gets_there_first(lock_path):
+        # A writer replaced the bad file between this reader's parse and its taking the lock
+        chat_history._write_atomic(SESSIONS, path)
+        with lock(lock_path):
+            yield
+    monkeypatch.setattr(chat_history, "chat_history_lock", writer_gets_there_first)
+
+    assert load_chat_sessions(path) == SESSIONS
+    assert not list(tmp_path.glob("chat_history.json.corrupt-*"))
+
+
+def _message(q):
+    return {"q": q, "a": "answer", "lang": "en", "sources": []}
+
+
+def test_merge_keeps_both_sides_appends():
+    base = copy.deepcopy(SESSIONS)
+    ours, theirs = copy.deepcopy(base), copy.deepcopy(base)
+    ours[0]["messages"].append(_message("ours"))
+    ours[0]["messages"][0]["translations"] = {"hi": "हाँ"}
+    theirs[0]["messages"].append(_message("theirs"))
+    theirs.insert(0, {"id": "s2", "title": "New Chat", "created": "2024-02-02T10:00:00", "messages": []})
+
+    merged = merge_chat_sessions(ours, theirs)
+    assert [s["id"] for s in merged] == ["s2", "s1"]
+    messages = merged[1]["messages"]
+    assert [m["q"] for m in messages] == ["Is theft bailable?", "theirs", "ours"]
+    assert messages[0]["translations"] == {"hi": "हाँ"}
+
+
+def test_concurrent_stale_saves_lose_no_message(tmp_path):
+    path = tmp_path / "chat_history.json"
+    save_chat_sessions(SESSIONS, path, merge=False)
+
+    def writer(t):
+        for i in range(5):
+            # Each save starts from a copy other writers have since changed
+            sessions = load_chat_sessions(path)
+            sessions[0]["messages"].append(_message(f"t{t}-{i}"))
+            assert save_chat_sessions(sessions, path)
+
+    threads = [threading.Thread(target=writer, args=(t,)) for t in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    questions = [m["q"] for m in load_chat_sessions(path)[0]["messages"]]
+    expected = {f"t{t}-{i}" for t in range(6) for i in range(5)}
+    assert set(questions) - {"Is theft bailable?"} == expected
+    assert len(questions) == len(expected) + 1
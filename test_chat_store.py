@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""Test the chat stores: concurrent writes, search and legacy history ownership"""
+
+import threading
+
+from backend import config
+from backend.chat_history import save_chat_sessions
+from backend.chat_store import JSONChatStore, SQLiteChatStore, assign_legacy_history
+from backend import chat_store
+
+LEGACY = [{"id": "old1", "title": "Bail", "created": "2023-11-02T09:00:00",
+           "messages": [{"q": "Is theft bailable?", "a": "Yes", "lang": "en", "sources": []}]}]
+
+
+def test_legacy_sessions_are_assigned_once_to_their_owner(tmp_path):
+    legacy_path = tmp_path / "chat_history.json"
+    save_chat_sessions(LEGACY, legacy_path, merge=False)
+    store = SQLiteChatStore(str(tmp_path / "chat.db"), json_path=legacy_path)
+    assert [s["id"] for s in store.list_sessions('')] == ["old1"]
+
+    assert store.assign_unowned_sessions("7") == 1
+    assert [s["id"] for s in store.list_sessions("7")] == ["old1"]
+    assert store.list_sessions('') == []
+    assert store.assign_unowned_sessions("8") == 0
+    assert store.search("7", "bailable")
+
+
+def test_json_store_moves_the_legacy_file(tmp_path):
+    legacy_path = tmp_path / "chat_history.json"
+    save_chat_sessions(LEGACY, legacy_path, merge=False)
+    store = JSONChatStore(tmp_path / "users", legacy_path=legacy_path)
+
+    assert store.assign_unowned_sessions("7") == 1
+    assert [s["id"] for s in store.list_sessions("7")] == ["old1"]
+    assert not legacy_path.exists()
+    assert store.assign_unowned_sessions("7") == 0
+
+
+def test_only_the_configured_owner_receives_the_legacy_history(tmp_path, monkeypatch):
+    legacy_path = tmp_path / "chat_history.json"
+    save_chat_sessions(LEGACY, legacy_path, merge=False)
+    monkeypatch.setattr(chat_store, "_store_instance", SQLiteChatStore(str(tmp_path / "chat.db"), json_path=legacy_path))
+    monkeypatch.setattr(config, "CHAT_WRITE_BEHIND", False)
+    monkeypatch.setattr(config, "CHAT_LEGACY_OWNER", "owner@example.com")
+
+    assert assign_legacy_history("someone@example.com", 5) == 0
+    assert assign_legacy_history("Owner@Example.com", 7) == 1
+    assert [s["id"] for s in chat_store.get_chat_store("7").list_sessions()] == ["old1"]
+
+
+def test_sqlite_store_uses_wal(tmp_path):
+    store = SQLiteChatStore(str(tmp_path / "chat.db"))
+    assert store._connection().execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_concurrent_appends_to_one_session_are_all_kept(tmp_path):
+    store = SQLiteChatStore(str(tmp_path / "chat.db"))
+    sid = store.create_session("7")
+    positions = []
+
+    def writer(t):
+        for i in range(10):
+            positions.append(store.append_message("7", sid, f"t{t}-q{i}", "answer", []))
+
+    threads = [threading.Thread(target=writer, args=(t,)) for t in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(positions) == list(range(80))
+    assert store.get_session("7", sid)["message_count"] == 80
+    assert len(store.get_messages("7", sid)) == 80
+
+
+def test_full_text_search_finds_devanagari_words(tmp_path):
+    store = SQLiteChatStore(str(tmp_path / "chat.db"))
+    assert store.fts
+    sid = store.create_session("7")
+    store.append_message("7", sid, "चोरी की सज़ा क्या है?", "धारा 303 के तहत चोरी के लिए तीन साल तक की सज़ा", [], language='hi')
+    store.append_message("7", sid, "What is bail?", "Release pending trial", [])
+    other = store.create_session("8")
+    store.append_message("8", other, "चोरी की शिकायत", "पुलिस में दर्ज करें", [], language='hi')
+
+    results = store.search("7", "चोरी")
+    assert [(r["session_id"], r["position"]) for r in results] == [(sid, 0)]
+    assert "**चोरी**" in results[0]["snippet"]
+    # Words with vowel signs are whole tokens, matched as prefixes
+    assert [r["position"] for r in store.search("7", "सज़")] == [0]
+    assert store.search("7", "शिकायत") == []
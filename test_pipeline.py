@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+"""Test the stage-graph pipeline: ordering, parallelism and failures"""
+
+import time
+
+import pytest
+
+from backend.pipeline import Pipeline, PipelineError, Stage, iter_complete_lines
+
+
+def _sleep_then(value, seconds=0.2):
+    def stage(**_):
+        time.sleep(seconds)
+        return value
+    return stage
+
+
+def _fail(**_):
+    raise RuntimeError("translation service down")
+
+
+def _graph(translate=None, optional=True):
+    return [
+        Stage("detect", lambda question: "hi", ("question",)),
+        Stage("translate", translate or (lambda question, detect: f"{question} ({detect}→en)"),
+              ("question", "detect"), optional=optional),
+        Stage("search", lambda question: [question], ("question",)),
+        Stage("answer", lambda translate, search: (translate, search), ("translate", "search")),
+    ]
+
+
+@pytest.mark.parametrize("parallel", [True, False])
+def test_stages_receive_their_dependencies_results(parallel):
+    pipeline = Pipeline(_graph(), parallel=parallel)
+    run = pipeline.run(question="चोरी")
+    pipeline.shutdown()
+    assert run.results["answer"] == ("चोरी (hi→en)", ["चोरी"])
+    assert set(run.timings) == {"detect", "translate", "search", "answer"}
+
+
+def test_independent_stages_overlap():
+    pipeline = Pipeline([
+        Stage("search_original", _sleep_then("a"), ("question",)),
+        Stage("search_translated", _sleep_then("b"), ("question",)),
+        Stage("sources", lambda search_original, search_translated: search_original + search_translated,
+              ("search_original", "search_translated")),
+    ])
+    run = pipeline.run(question="bail")
+    pipeline.shutdown()
+    assert run.results["sources"] == "ab"
+    assert run.total_ms < 350
+    assert run.timings["sources"]["start_ms"] >= max(run.timings["search_original"]["end_ms"],
+                                                     run.timings["search_translated"]["end_ms"]) - 1
+
+
+def test_optional_stage_failure_yields_none():
+    pipeline = Pipeline(_graph(translate=_fail))
+    run = pipeline.run(question="bail")
+    pipeline.shutdown()
+    assert run.results["answer"] == (None, ["bail"])
+
+
+def test_required_stage_failure_names_the_stage():
+    pipeline = Pipeline(_graph(translate=_fail, optional=False))
+    with pytest.raises(PipelineError) as error:
+        pipeline.run(question="bail")
+    pipeline.shutdown()
+    assert error.value.stage == "translate"
+    assert isinstance(error.value.error, RuntimeError)
+
+
+def test_unknown_dependency_is_rejected():
+    with pytest.raises(ValueError):
+        Pipeline([Stage("answer", lambda sources: sources, ("sources",))]).run(question="bail")
+
+
+def test_streamed_chunks_are_regrouped_into_lines():
+    chunks = ["**SUMMARY:**", "** Theft is\n- bail", "able\n- up to", " 3 years"]
+    assert list(iter_complete_lines(chunks)) == [
+        "**SUMMARY:**** Theft is\n", "- bailable\n", "- up to 3 years",
+    ]
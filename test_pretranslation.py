@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+"""Test background pre-translation: it yields to users' requests without starving"""
+
+import time
+
+from backend.pretranslation import Pretranslator
+
+
+def _translate(text, source_lang, target_lang):
+    return f"[{target_lang}] {text}", True
+
+
+def _wait_for(pretranslator, owner, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        ready = pretranslator.collect(owner)
+        if ready:
+            return ready
+        time.sleep(0.01)
+    return []
+
+
+def test_job_runs_while_other_users_requests_overlap():
+    pretranslator = Pretranslator(_translate, max_defer=0.1)
+    try:
+        with pretranslator.foreground("alice"), pretranslator.foreground("bob"):
+            pretranslator.submit("carol", 0, "Bail is granted", 'en', ['hi'])
+            assert _wait_for(pretranslator, "carol") == [(0, 'hi', "[hi] Bail is granted")]
+    finally:
+        pretranslator.shutdown()
+
+
+def test_job_waits_for_its_own_owners_request():
+    pretranslator = Pretranslator(_translate, max_defer=0.0)
+    try:
+        with pretranslator.foreground("alice"):
+            pretranslator.submit("alice", 0, "Bail is granted", 'en', ['hi'])
+            assert _wait_for(pretranslator, "alice", timeout=0.2) == []
+        assert _wait_for(pretranslator, "alice") == [(0, 'hi', "[hi] Bail is granted")]
+    finally:
+        pretranslator.shutdown()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+"""Test request profiling: work a request runs on pool threads must show up in its profile"""
+
+import time
+from pathlib import Path
+
+from backend import config
+from backend.pipeline import Pipeline, Stage
+from backend.profiling import profile_request
+
+
+def slow_search_stage(question):
+    time.sleep(0.2)
+    return [question]
+
+
+def slow_detect_stage(question):
+    time.sleep(0.2)
+    return 'en'
+
+
+def _profile(tmp_path, monkeypatch, pipeline: Pipeline) -> str:
+    monkeypatch.setattr(config, "PROFILE_DIR", str(tmp_path))
+    monkeypatch.setattr(config, "PROFILE_INTERVAL_MS", 2.0)
+    with profile_request("pipeline_test", force=True):
+        pipeline.run(question="theft")
+    pipeline.shutdown()
+    (profile,) = Path(tmp_path).glob("*.folded")
+    return profile.read_text(encoding="utf-8")
+
+
+def test_parallel_stages_are_sampled_on_pool_threads(tmp_path, monkeypatch):
+    pipeline = Pipeline([
+        Stage("detect", slow_detect_stage, ("question",)),
+        Stage("search", slow_search_stage, ("question",)),
+    ])
+    profile = _profile(tmp_path, monkeypatch, pipeline)
+    assert "slow_search_stage" in profile
+    assert "slow_detect_stage" in profile
+
+
+def test_sequential_stages_are_sampled_in_the_calling_thread(tmp_path, monkeypatch):
+    pipeline = Pipeline([Stage("search", slow_search_stage, ("question",))], parallel=False)
+    assert "slow_search_stage" in _profile(tmp_path, monkeypatch, pipeline)
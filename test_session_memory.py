@@ -0,0 +1,34 @@
+#!/usr/bin/env python
+"""Test the per-session memory budget"""
+
+from backend.session_memory import enforce_session_budget, measure_session_state, track_allocations
+
+
+def _state():
+    return {
+        "chat_sessions": [{"id": f"s{i}", "title": "Bail", "created": "2024-02-01", "message_count": 3}
+                          for i in range(8)],
+        "cc_response": {"query": "theft vs robbery", "answer": "x" * 200_000, "source_refs": []},
+        "current_session_id": "s1",
+    }
+
+
+def test_rebuildable_keys_are_dropped_before_answers():
+    state = _state()
+    budget = sum(measure_session_state(state).values()) - 1
+    assert enforce_session_budget(state, budget) == ["chat_sessions"]
+    assert "cc_response" in state
+
+
+def test_budget_is_met_by_dropping_the_case_companion_answer():
+    state = _state()
+    evicted = enforce_session_budget(state, 50_000)
+    assert evicted == ["chat_sessions", "cc_response"]
+    assert "cc_response" not in state and state["current_session_id"] == "s1"
+    assert sum(measure_session_state(state).values()) <= 50_000
+
+
+def test_track_allocations_reports_the_allocating_line():
+    with track_allocations(top=5) as allocations:
+        blob = [bytearray(1024) for _ in range(500)]
+    assert blob and any(__file__ in location and size > 0 for location, size, _ in allocations)
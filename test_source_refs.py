@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+"""Test stored source references: a renumbered chunk must never be shown as the citation"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from backend import source_refs
+from backend.source_refs import SourceRef, compact_sources, rehydrate_sources
+
+THEFT = "303. Theft. Whoever, intending to take dishonestly any movable property out of the possession of any person..."
+CHEATING = "318. Cheating. Whoever, by deceiving any person, fraudulently or dishonestly induces the person so deceived..."
+
+
+class ChunkStore:
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    def get_chunk(self, source, chunk_index):
+        text = self.chunks.get((source, chunk_index))
+        return SimpleNamespace(page_content=text) if text is not None else None
+
+
+@pytest.fixture(autouse=True)
+def restore_chunk_store():
+    yield
+    source_refs.set_chunk_store(None)
+
+
+def _stored_refs():
+    source_refs.set_chunk_store(ChunkStore({("BNS2023.pdf", 7): THEFT}))
+    doc = SimpleNamespace(page_content=THEFT, metadata={"source": "BNS2023.pdf", "chunk_index": 7, "score": 0.41})
+    return compact_sources([doc])
+
+
+def test_reference_resolves_to_its_chunk():
+    (ref,) = rehydrate_sources(_stored_refs())
+    assert ref.page_content == THEFT
+
+
+def test_renumbered_chunk_falls_back_to_the_preview():
+    refs = _stored_refs()
+    # Re-ingested with another chunk size: position 7 now holds a different section
+    source_refs.set_chunk_store(ChunkStore({("BNS2023.pdf", 7): CHEATING}))
+    (ref,) = rehydrate_sources(refs)
+    assert ref.page_content == THEFT[:source_refs.INDEXED_PREVIEW_CHARS]
+
+
+def test_reference_saved_before_digests_still_resolves():
+    source_refs.set_chunk_store(ChunkStore({("BNS2023.pdf", 7): THEFT}))
+    assert SourceRef.from_dict({"source": "BNS2023.pdf", "chunk": 7}).page_content == THEFT
@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+"""Test the translation HTTP client's retries against mocked responses"""
+
+import pytest
+
+pytest.importorskip("requests")
+
+from backend import translation_client
+from backend.translation_client import TranslationClient
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None, payload=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def get(self, url, params=None, timeout=None):
+        self.calls += 1
+        return self.responses.pop(0)
+
+
+def _client(responses, sleeps, monkeypatch) -> TranslationClient:
+    monkeypatch.setattr(translation_client.time, "sleep", sleeps.append)
+    client = TranslationClient(max_retries=2, backoff=0.5, rate_per_host=0)
+    client._session = FakeSession(responses)
+    return client
+
+
+def test_long_retry_after_gives_up_instead_of_sleeping(monkeypatch):
+    sleeps = []
+    client = _client([FakeResponse(429, {"Retry-After": "3600"})], sleeps, monkeypatch)
+    assert client.get_json("https://api.example/get") is None
+    assert sleeps == []
+    assert client._session.calls == 1
+
+
+def test_short_retry_after_is_honoured(monkeypatch):
+    sleeps = []
+    client = _client([
+        FakeResponse(429, {"Retry-After": "1"}),
+        FakeResponse(200, payload={"responseStatus": 200}),
+    ], sleeps, monkeypatch)
+    assert client.get_json("https://api.example/get") == {"responseStatus": 200}
+    assert sleeps == [1.0]
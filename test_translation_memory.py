@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+"""Test translation memory: fuzzy matches must never change a legal statement's meaning"""
+
+from backend.translation_memory import TranslationMemory
+
+BAILABLE = "The offence of theft is bailable in most cases under the law"
+BAILABLE_HI = "कानून के तहत अधिकांश मामलों में चोरी का अपराध जमानती है"
+
+
+def _memory() -> TranslationMemory:
+    memory = TranslationMemory(min_similarity=0.9)
+    memory.add(BAILABLE, BAILABLE_HI, 'en', 'hi')
+    return memory
+
+
+def test_negation_is_not_fuzzy_matched():
+    memory = _memory()
+    assert memory.lookup("The offence of theft is not bailable in most cases under the law", 'en', 'hi') is None
+
+
+def test_non_prefix_is_not_fuzzy_matched():
+    memory = _memory()
+    assert memory.lookup("The offence of theft is non-bailable in most cases under the law", 'en', 'hi') is None
+
+
+def test_qualifiers_are_not_fuzzy_matched():
+    memory = _memory()
+    for variant in (
+        "The offence of theft is bailable in no cases under the law",
+        "The offence of theft is bailable only in most cases under the law",
+        "The offence of theft is bailable in most cases except under the law",
+        "The offence of theft is bailable in most cases without the law",
+    ):
+        assert memory.lookup(variant, 'en', 'hi') is None, variant
+
+
+def test_hindi_negation_is_not_fuzzy_matched():
+    memory = TranslationMemory(min_similarity=0.9)
+    memory.add(BAILABLE_HI, BAILABLE, 'hi', 'en')
+    assert memory.lookup("कानून के तहत अधिकांश मामलों में चोरी का अपराध जमानती नहीं है", 'hi', 'en') is None
+
+
+def test_other_content_word_is_not_fuzzy_matched():
+    memory = _memory()
+    assert memory.lookup("The offence of cheating is bailable in most cases under the law", 'en', 'hi') is None
+
+
+def test_punctuation_and_filler_variants_still_fuzzy_match():
+    memory = _memory()
+    match = memory.lookup("The offence of theft is bailable, in most cases under the law.", 'en', 'hi')
+    assert match is not None and match[0] == BAILABLE_HI and match[1] < 1.0
+
+
+def test_readding_replaces_fuzzy_translation():
+    memory = _memory()
+    memory.add(BAILABLE, "UPDATED", 'en', 'hi')
+    assert memory.lookup(BAILABLE, 'en', 'hi') == ("UPDATED", 1.0)
+    assert memory.lookup(BAILABLE + ".", 'en', 'hi')[0] == "UPDATED"
+    assert len(memory) == 1
+
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("  ✓ Testing Translation Memory")
+    print("="*70 + "\n")
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"  ✓ {name}")
+    print()